@@ -0,0 +1,88 @@
+"""
+Memory benchmark for CollegeInfo records
+
+Builds 100k records with the previous @dataclass layout and with the
+current slotted CollegeInfo, and reports the memory held per 100k records.
+
+Usage:
+    python -m benchmarks.college_info_memory [count]
+"""
+
+import gc
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import List
+from data.college_data import CollegeInfo
+
+UNIVERSITIES = ['Anna University', 'Visvesvaraya Technological University', 'Mumbai University']
+TYPES = ['Government', 'Private', 'Unknown']
+BRANCHES = ['Computer Science Engineering', 'Mechanical Engineering', 'Civil Engineering',
+            'Electrical Engineering', 'Information Technology']
+
+
+@dataclass
+class LegacyCollegeInfo:
+    """CollegeInfo layout before it was slotted"""
+    name: str = ""
+    university: str = ""
+    email: str = ""
+    location: str = ""
+    branches: List[str] = field(default_factory=list)
+    hod_contact: str = ""
+    admin_contact: str = ""
+    other_contacts: List[str] = field(default_factory=list)
+    website: str = ""
+    college_type: str = ""
+    state: str = ""
+
+
+def _fresh(value: str) -> str:
+    """A new string object equal to value, as parsing each page would produce"""
+    return ''.join(list(value))
+
+
+def build(cls, count: int) -> list:
+    """Build count records of the given class"""
+    records = []
+    for i in range(count):
+        records.append(cls(
+            name=f"College of Engineering {i}",
+            university=_fresh(UNIVERSITIES[i % 3]),
+            email=f"info{i}@college{i}.ac.in",
+            location=f"City {i % 500}, Karnataka",
+            branches=[_fresh(b) for b in BRANCHES[:1 + i % 5]],
+            admin_contact=f"98{i:08d}",
+            other_contacts=[f"97{i:08d}", f"96{i:08d}"],
+            website=f"https://college{i}.ac.in",
+            college_type=_fresh(TYPES[i % 3]),
+            state=_fresh('Karnataka')
+        ))
+    return records
+
+
+def measure(cls, count: int) -> int:
+    """Bytes allocated and still held by count records"""
+    gc.collect()
+    tracemalloc.start()
+    records = build(cls, count)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return current
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    legacy = measure(LegacyCollegeInfo, count)
+    compact = measure(CollegeInfo, count)
+    scale = 100_000 / count
+
+    print(f"Records:              {count:,}")
+    print(f"Legacy dataclass:     {legacy * scale / 1024 / 1024:8.1f} MiB per 100k")
+    print(f"Slotted CollegeInfo:  {compact * scale / 1024 / 1024:8.1f} MiB per 100k")
+    print(f"Reduction:            {(1 - compact / legacy) * 100:8.1f} %")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Fixture corpus for the offline pipeline benchmark
+
+A corpus maps (host, path?query) to page HTML: college homepages, their
+contact and department pages, and DuckDuckGo/Google results pages listing
+the colleges. ``Corpus.generate`` builds a deterministic synthetic corpus;
+``save``/``load`` keep one on disk (gzipped JSON lines) so a recorded set
+of real pages can be benchmarked the same way.
+
+Links inside pages use PORT_TOKEN in place of the stand-in server's port.
+"""
+
+import gzip
+import json
+import random
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+from urllib.parse import urlsplit
+from scraper.query_expansion import build_query
+from scraper.search_engines import DuckDuckGoBackend, GoogleBackend
+
+PORT_TOKEN = '__PORT__'
+
+BENCH_STATE = 'Karnataka'
+BENCH_QUERY = build_query(BENCH_STATE, 'All Branches', 'All Types')
+
+CITIES = ['Bengaluru', 'Mysuru', 'Mangaluru', 'Belagavi', 'Hubballi', 'Davanagere',
+          'Tumakuru', 'Udupi', 'Hassan', 'Shivamogga']
+PREFIXES = ['Sri', 'National', 'Global', 'Dayananda', 'Siddaganga', 'Malnad', 'Bapuji',
+            'Nitte', 'Sahyadri', 'Acharya', 'Cambridge', 'Oxford', 'RNS', 'BMS', 'PES']
+SUFFIXES = ['Institute of Technology', 'College of Engineering', 'Engineering College',
+            'Institute of Engineering and Technology', 'Technological Institute']
+UNIVERSITIES = ['Visvesvaraya Technological University', 'Bangalore University', 'Mysore University']
+TYPES = ['government', 'private', 'autonomous']
+BRANCHES = ['Computer Science', 'Information Technology', 'Electronics and Communication',
+            'Electrical', 'Mechanical', 'Civil', 'Chemical', 'Biotechnology', 'Aerospace']
+FILLER = ('The institute offers undergraduate and postgraduate programmes with modern '
+          'laboratories, an active placement cell, hostels, a central library and sports '
+          'facilities. Faculty members publish research and collaborate with industry. ')
+
+
+def page_key(url: str) -> str:
+    """Corpus key for a URL: host (without port) followed by path and query"""
+    parts = urlsplit(url)
+    path = parts.path or '/'
+    return parts.hostname + path + (f'?{parts.query}' if parts.query else '')
+
+
+@dataclass
+class Corpus:
+    """Pages served by the stand-in server, plus the homepages the search pages list"""
+    pages: Dict[str, str] = field(default_factory=dict)
+    homepages: List[Tuple[str, str]] = field(default_factory=list)  # (college name, url)
+    query: str = BENCH_QUERY
+    state: str = BENCH_STATE
+
+    @property
+    def search_pages(self) -> Dict[str, int]:
+        """Results pages per engine, derived from the stored pages"""
+        counts = {}
+        for backend in (DuckDuckGoBackend(), GoogleBackend()):
+            page = 0
+            while page_key(backend.page_url(self.query, page)) in self.pages:
+                page += 1
+            counts[backend.name] = page
+        return counts
+
+    @classmethod
+    def generate(cls, colleges: int = 2000, duplicates: float = 0.1, seed: int = 7) -> 'Corpus':
+        """
+        Build a synthetic corpus
+
+        Args:
+            colleges: Distinct colleges (each gets homepage, contact and department pages)
+            duplicates: Share of colleges also listed under a second domain
+            seed: Random seed, so every run serves the same pages
+
+        Returns:
+            Corpus with about 3 pages per college plus the results pages
+        """
+        rng = random.Random(seed)
+        corpus = cls()
+        listings = []
+
+        for i in range(colleges):
+            name = f"{rng.choice(PREFIXES)} {rng.choice(SUFFIXES)} {CITIES[i % len(CITIES)]} {i}"
+            host = f"college{i}.ac.in"
+            details = {
+                'name': name,
+                'city': CITIES[i % len(CITIES)],
+                'university': rng.choice(UNIVERSITIES),
+                'type': rng.choice(TYPES),
+                'branches': rng.sample(BRANCHES, rng.randint(3, 7)),
+                'email': f"principal@{host}",
+                'phone': f"080{rng.randint(2000000, 9999999)}",
+                'hod_phone': f"98{rng.randint(10000000, 99999999)}",
+                'pin': f"5{rng.randint(60000, 99999)}",
+                'filler': rng.randint(20, 80),
+            }
+            corpus._add_site(host, details)
+            listings.append((name, host))
+
+            if rng.random() < duplicates:
+                alias = f"www.college{i}.edu.in"
+                corpus._add_site(alias, dict(details, name=name.replace(' and ', ' & ')))
+                listings.append((details['name'], alias))
+
+        rng.shuffle(listings)
+        corpus.homepages = [(name, f"http://{host}:{PORT_TOKEN}/") for name, host in listings]
+        corpus._add_results(DuckDuckGoBackend(), listings)
+        corpus._add_results(GoogleBackend(), listings)
+        return corpus
+
+    def _add_site(self, host: str, details: dict):
+        """Homepage, contact page and department page for one college"""
+        origin = f"http://{host}:{PORT_TOKEN}"
+        branches = ''.join(f"<li>{branch} Engineering</li>" for branch in details['branches'])
+        filler = ''.join(f"<p>{FILLER}</p>" for _ in range(details['filler']))
+        self.pages[page_key(origin + '/')] = (
+            f"<html><head><title>{details['name']} | Official Website</title>"
+            f"<style>body {{ font-family: sans-serif; }}</style>"
+            f"<script>var analytics = {{}};</script></head><body>"
+            f"<nav><a href=\"/\">Home</a> <a href=\"about/\">About Us</a> "
+            f"<a href=\"admissions/\">Admissions</a> <a href=\"departments/\">Departments</a> "
+            f"<a href=\"contact/\">Contact Us</a> <a href=\"brochure.pdf\">Brochure</a></nav>"
+            f"<h1>{details['name']}</h1>"
+            f"<p>A {details['type']} engineering college affiliated to {details['university']}, "
+            f"located in {details['city']}, {BENCH_STATE}.</p>"
+            f"<h2>Programmes</h2><ul>{branches}</ul>{filler}"
+            f"<address>{details['city']}, {BENCH_STATE} {details['pin']}</address>"
+            f"<footer>Phone: {details['phone']}</footer></body></html>"
+        )
+        self.pages[page_key(origin + '/contact/')] = (
+            f"<html><head><title>Contact - {details['name']}</title></head><body>"
+            f"<h1>Contact Us</h1><p>Email: {details['email']}</p>"
+            f"<p>Office: {details['phone']}</p></body></html>"
+        )
+        self.pages[page_key(origin + '/departments/')] = (
+            f"<html><head><title>Departments - {details['name']}</title></head><body>"
+            f"<h1>Departments</h1><p>Head of the Department, {details['branches'][0]}: "
+            f"Dr. A. Kumar, Phone {details['hod_phone']}</p></body></html>"
+        )
+
+    def _add_results(self, backend, listings: List[Tuple[str, str]]):
+        """Results pages in the engine's own markup, page_size listings each"""
+        for page, start in enumerate(range(0, len(listings), backend.page_size)):
+            chunk = listings[start:start + backend.page_size]
+            if backend.name == 'duckduckgo':
+                items = ''.join(
+                    f"<div class=\"result\"><a class=\"result__a\" href=\"//duckduckgo.com/l/?uddg="
+                    f"http%3A%2F%2F{host}%3A{PORT_TOKEN}%2F\">{name}</a></div>"
+                    for name, host in chunk
+                )
+            else:
+                items = ''.join(
+                    f"<div class=\"g\"><a href=\"/url?q=http://{host}:{PORT_TOKEN}/\">"
+                    f"<h3>{name}</h3></a></div>"
+                    for name, host in chunk
+                )
+            self.pages[page_key(backend.page_url(self.query, page))] = (
+                f"<html><head><title>{self.query}</title></head><body>{items}</body></html>"
+            )
+
+    def save(self, path: str):
+        """Write the corpus as gzipped JSON lines"""
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            f.write(json.dumps({'query': self.query, 'state': self.state,
+                                'homepages': self.homepages}) + '\n')
+            for key, html in self.pages.items():
+                f.write(json.dumps([key, html]) + '\n')
+
+    @classmethod
+    def load(cls, path: str) -> 'Corpus':
+        """Read a corpus written by save"""
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            header = json.loads(f.readline())
+            corpus = cls(query=header['query'], state=header['state'],
+                         homepages=[tuple(item) for item in header['homepages']])
+            for line in f:
+                key, html = json.loads(line)
+                corpus.pages[key] = html
+        return corpus
@@ -0,0 +1,234 @@
+"""
+Offline end-to-end pipeline benchmark
+
+Serves a fixture corpus from a local HTTP stand-in and runs every stage
+against it: search results parsing, CollegeScraper.scrape_college (with
+contact pages), page parsing, DataExtractor, CollegeDataManager dedupe and
+the Excel export. Reports items/sec, p50/p99 latency per stage and peak RSS.
+
+Usage:
+    python -m benchmarks.pipeline_bench [--colleges 2000] [--workers 8]
+    python -m benchmarks.pipeline_bench --save-corpus corpus.jsonl.gz
+    python -m benchmarks.pipeline_bench --corpus corpus.jsonl.gz --json run.json
+    python -m benchmarks.pipeline_bench --baseline run.json --tolerance 20
+
+With --baseline the exit code is 1 when a stage's throughput drops, or its
+p99 latency grows, by more than the tolerance.
+"""
+
+import argparse
+import json
+import logging
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+from benchmarks.corpus import Corpus
+from benchmarks.stand_in import StandInClient, StandInServer, local_backend
+from data.college_data import CollegeDataManager
+from data.excel_exporter import ExcelExporter
+from scraper.college_scraper import CollegeScraper
+from scraper.concurrent_engine import ThreadedScrapeEngine
+from scraper.data_extractor import DataExtractor
+from scraper.page_parser import parse_page
+from scraper.search_engines import DuckDuckGoBackend, GoogleBackend, MultiEngineSearcher
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of unsorted values"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+class Stage:
+    """Latencies of one stage's operations, plus its wall time and peak RSS"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.latencies: List[float] = []
+        self.wall = 0.0
+        self.rss_mb = 0.0
+        self._lock = threading.Lock()
+
+    def timed(self, func, *args, **kwargs):
+        """Call func, recording how long it took"""
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.latencies.append(elapsed)
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.wall = time.perf_counter() - self._start
+        self.rss_mb = peak_rss_mb()
+
+    def summary(self) -> Dict[str, float]:
+        count = len(self.latencies)
+        return {
+            'count': count,
+            'seconds': round(self.wall, 4),
+            'per_sec': round(count / self.wall, 2) if self.wall else 0.0,
+            'p50_ms': round(percentile(self.latencies, 50) * 1000, 3),
+            'p99_ms': round(percentile(self.latencies, 99) * 1000, 3),
+            'peak_rss_mb': round(self.rss_mb, 1),
+        }
+
+
+def run(corpus: Corpus, workers: int) -> Dict[str, Dict[str, float]]:
+    """Run every stage against the corpus and return the per-stage summaries"""
+    stages = []
+
+    with StandInServer(corpus) as server:
+        client = StandInClient(max_connections_per_host=workers)
+        backends = [local_backend(DuckDuckGoBackend, server), local_backend(GoogleBackend, server)]
+        searcher = MultiEngineSearcher(client, backends)
+        pages = corpus.search_pages
+
+        # Search: fetch and parse every results page
+        with Stage('search') as stage:
+            for backend in backends:
+                for page in range(pages[backend.name]):
+                    stage.timed(searcher._search_page, backend, corpus.query, page)
+        stages.append(stage)
+
+        # Scrape: homepage plus contact pages for every listed college
+        scraper = CollegeScraper(client)
+        engine = ThreadedScrapeEngine(scraper, max_workers=workers)
+        targets = [(name, server.url(url)) for name, url in corpus.homepages]
+        scrape = Stage('scrape')
+        original = scraper.scrape_college
+        scraper.scrape_college = lambda *args: scrape.timed(original, *args)
+        with scrape:
+            colleges = [result.college for result in engine.scrape_all(targets, corpus.state)
+                        if result.college]
+        engine.close()
+        scraper.close()
+        stages.append(scrape)
+
+        html = [server.page(key).decode('utf-8') for key in corpus.pages
+                if key.endswith('.ac.in/') or key.endswith('.edu.in/')]
+        client.close()
+
+    # Parse and extract: CPU-only passes over the homepages
+    with Stage('parse') as stage:
+        texts = [stage.timed(parse_page, page).text for page in html]
+    stages.append(stage)
+
+    with Stage('extract') as stage:
+        for text in texts:
+            stage.timed(DataExtractor.scan, text)
+    stages.append(stage)
+
+    # Dedupe: alias domains in the corpus merge into their colleges
+    data_manager = CollegeDataManager()
+    with Stage('dedupe') as stage:
+        for college in colleges:
+            stage.timed(data_manager.add_college, college)
+    stages.append(stage)
+
+    with Stage('export') as stage, tempfile.TemporaryDirectory() as tmp:
+        stage.timed(ExcelExporter.export_colleges, data_manager.get_all(),
+                    filepath=os.path.join(tmp, 'bench.xlsx'))
+    stages.append(stage)
+
+    results = {stage.name: stage.summary() for stage in stages}
+    results['totals'] = {
+        'scraped': len(colleges),
+        'unique': data_manager.count(),
+        'with_hod_contact': sum(1 for college in colleges if college.hod_contact),
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+    }
+    return results
+
+
+def regressions(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+                tolerance: float) -> List[str]:
+    """Stages whose throughput or p99 latency got worse than the tolerance (percent)"""
+    found = []
+    for name, stage in results.items():
+        before = baseline.get(name)
+        if name == 'totals' or not before:
+            continue
+        if before['per_sec'] and stage['per_sec'] < before['per_sec'] * (1 - tolerance / 100):
+            found.append(f"{name}: {stage['per_sec']}/s vs {before['per_sec']}/s")
+        if before['p99_ms'] and stage['p99_ms'] > before['p99_ms'] * (1 + tolerance / 100):
+            found.append(f"{name}: p99 {stage['p99_ms']} ms vs {before['p99_ms']} ms")
+    return found
+
+
+def report(results: Dict[str, Dict[str, float]]):
+    """Print the per-stage table"""
+    print(f"{'Stage':<10}{'Items':>8}{'Seconds':>10}{'Items/s':>11}{'p50 ms':>10}{'p99 ms':>10}{'RSS MiB':>10}")
+    for name, stage in results.items():
+        if name == 'totals':
+            continue
+        print(f"{name:<10}{stage['count']:>8}{stage['seconds']:>10.2f}{stage['per_sec']:>11.1f}"
+              f"{stage['p50_ms']:>10.2f}{stage['p99_ms']:>10.2f}{stage['peak_rss_mb']:>10.1f}")
+    totals = results['totals']
+    print(f"\nScraped {totals['scraped']} sites, {totals['unique']} unique colleges, "
+          f"{totals['with_hod_contact']} with an HOD contact; peak RSS {totals['peak_rss_mb']} MiB")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline pipeline benchmark")
+    parser.add_argument('--colleges', type=int, default=2000,
+                        help='Colleges in a generated corpus (default: 2000)')
+    parser.add_argument('--corpus', default=None, help='Load a saved corpus instead of generating one')
+    parser.add_argument('--save-corpus', default=None, help='Write the corpus to this file and exit')
+    parser.add_argument('--workers', type=int, default=8, help='Scraping threads (default: 8)')
+    parser.add_argument('--json', default=None, help='Write the results to this file')
+    parser.add_argument('--baseline', default=None, help='Results file to compare against')
+    parser.add_argument('--tolerance', type=float, default=20.0,
+                        help='Allowed slowdown against the baseline, in percent (default: 20)')
+    args = parser.parse_args(argv)
+
+    # Per-page INFO logging would dominate the timings
+    logging.disable(logging.INFO)
+
+    corpus = Corpus.load(args.corpus) if args.corpus else Corpus.generate(args.colleges)
+    if args.save_corpus:
+        corpus.save(args.save_corpus)
+        print(f"Saved {len(corpus.pages)} pages to {args.save_corpus}")
+        return 0
+
+    print(f"Corpus: {len(corpus.pages)} pages, {len(corpus.homepages)} listed sites\n")
+    results = run(corpus, args.workers)
+    report(results)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            found = regressions(results, json.load(f), args.tolerance)
+        if found:
+            print("\nRegressions:")
+            for line in found:
+                print(f"  {line}")
+            return 1
+        print("\nNo regressions against the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
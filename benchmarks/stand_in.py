@@ -0,0 +1,127 @@
+"""
+Local HTTP stand-in that serves a fixture corpus for any host name
+
+The server answers on 127.0.0.1 and routes by the Host header. StandInClient
+is an HttpClient whose DNS cache resolves every host to the loopback
+address, so the real session, adapters and limits are exercised without
+touching the network; LoopbackResolver does the same for the aiohttp engine.
+"""
+
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import urlsplit, urlunsplit
+from aiohttp.abc import AbstractResolver
+from benchmarks.corpus import PORT_TOKEN, Corpus
+from scraper.http_client import DnsCache, HttpClient
+
+
+class _CorpusHandler(BaseHTTPRequestHandler):
+    """Serve corpus pages with keep-alive"""
+
+    protocol_version = 'HTTP/1.1'
+    server: 'StandInServer'
+
+    def do_GET(self):
+        host = (self.headers.get('Host') or '').split(':')[0].lower()
+        body = self.server.page(host + self.path)
+        if body is None:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Threaded HTTP server over a Corpus, running in a background thread"""
+
+    daemon_threads = True
+
+    def __init__(self, corpus: Corpus):
+        super().__init__(('127.0.0.1', 0), _CorpusHandler)
+        self.corpus = corpus
+        self.token = PORT_TOKEN.encode()
+        self.port_bytes = str(self.server_address[1]).encode()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def page(self, key: str) -> Optional[bytes]:
+        """Page body with the real port substituted, or None if not in the corpus"""
+        html = self.corpus.pages.get(key)
+        if html is None:
+            return None
+        return html.encode('utf-8').replace(self.token, self.port_bytes)
+
+    def url(self, url: str) -> str:
+        """Corpus URL with the real port substituted"""
+        return url.replace(PORT_TOKEN, str(self.port))
+
+    def local_url(self, url: str) -> str:
+        """Point an https search URL at the stand-in (plain HTTP on its port)"""
+        parts = urlsplit(url)
+        return urlunsplit(('http', f"{parts.hostname}:{self.port}", parts.path, parts.query, ''))
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever, name='stand-in', daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+        if self._thread:
+            self._thread.join()
+
+
+class LoopbackDns(DnsCache):
+    """Resolve every host name to 127.0.0.1"""
+
+    def resolve(self, host: str, port: int) -> str:
+        return '127.0.0.1'
+
+
+class StandInClient(HttpClient):
+    """HttpClient whose connections all go to the local stand-in server"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Proxy settings from the environment would bypass the loopback DNS
+        self.session.trust_env = False
+
+    def _create_adapter(self):
+        self.dns_cache = LoopbackDns(stats=self.stats)
+        return super()._create_adapter()
+
+
+def local_backend(backend_cls, server: StandInServer):
+    """Instance of a search backend whose results page URLs point at the stand-in"""
+
+    class LocalBackend(backend_cls):
+        def page_url(self, query: str, page: int) -> str:
+            return server.local_url(super().page_url(query, page))
+
+    return LocalBackend()
+
+
+class LoopbackResolver(AbstractResolver):
+    """aiohttp resolver sending every host name to 127.0.0.1"""
+
+    async def resolve(self, host: str, port: int = 0, family: int = socket.AF_INET):
+        return [{'hostname': host, 'host': '127.0.0.1', 'port': port,
+                 'family': socket.AF_INET, 'proto': 0, 'flags': socket.AI_NUMERICHOST}]
+
+    async def close(self):
+        pass
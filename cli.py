@@ -0,0 +1,264 @@
+"""
+Headless batch runner: crawl a matrix of states, branches and college types
+
+Does not import tkinter, so it can run on servers and in containers:
+    
+    python cli.py --states Kerala,Goa --branches all --types Government
+"""
+
+import argparse
+import itertools
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Sequence
+
+from config.states import INDIAN_STATES, ENGINEERING_BRANCHES, COLLEGE_TYPES
+from scraper.search_engines import BACKENDS, MultiEngineSearcher
+from scraper.query_expansion import QueryExpander
+from scraper.search_memo import SearchMemo
+from scraper.college_scraper import CollegeScraper
+from scraper.concurrent_engine import ThreadedScrapeEngine
+from scraper.crawl_control import CrawlControl
+from scraper.http_cache import ResponseCache
+from scraper.download import DownloadLimits
+from scraper.http_client import HttpClient
+from scraper.rate_limiter import HostRateLimiter
+from scraper.retry import FetchGuard, RetryPolicy
+from scraper.pipeline import CrawlListener, CrawlPipeline
+from data.college_data import CollegeDataManager
+from data.incremental_sink import IncrementalSink
+from data.crawl_journal import CrawlJournal
+from utils.logger import setup_logger
+from utils.metrics import METRICS, MetricsServer
+
+logger = setup_logger('cli')
+
+
+class ConsoleListener(CrawlListener):
+    """Log pipeline progress for one job instead of writing to the GUI"""
+    
+    def __init__(self, label: str, verbose: bool = False):
+        self.label = label
+        self.verbose = verbose
+    
+    def append_result(self, text: str):
+        if self.verbose and text.strip():
+            logger.info("[%s] %s", self.label, text.strip())
+    
+    def update_progress(self, message: str):
+        logger.debug("[%s] %s", self.label, message)
+    
+    def update_status(self, message: str):
+        logger.info("[%s] %s", self.label, message)
+
+
+def parse_choices(value: str, choices: Sequence[str], option: str) -> List[str]:
+    """
+    Parse a comma-separated option value against the allowed choices
+    
+    Args:
+        value: Comma-separated names, or "all" for every specific name
+            (the "All Branches"/"All Types" catch-alls only when named)
+        choices: Allowed names
+        option: Option name for error messages
+    
+    Returns:
+        Selected names in the order given
+    """
+    if value.strip().lower() == 'all':
+        # A catch-all job would only repeat what the specific jobs find
+        return [choice for choice in choices if not choice.startswith('All ')]
+    
+    lookup = {choice.lower(): choice for choice in choices}
+    selected = []
+    for name in value.split(','):
+        name = name.strip()
+        if not name:
+            continue
+        if name.lower() not in lookup:
+            raise argparse.ArgumentTypeError(f"{option}: unknown value '{name}'")
+        if lookup[name.lower()] not in selected:
+            selected.append(lookup[name.lower()])
+    if not selected:
+        raise argparse.ArgumentTypeError(f"{option}: no values given")
+    return selected
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Command line options"""
+    parser = argparse.ArgumentParser(
+        description="Crawl engineering colleges for every combination of states, branches and types"
+    )
+    parser.add_argument('--states', default='all',
+                        help='Comma-separated states, or "all" (default: all)')
+    parser.add_argument('--branches', default='all',
+                        help='Comma-separated branches, or "all" for every specific branch (default: all)')
+    parser.add_argument('--types', default='All Types',
+                        help='Comma-separated college types, or "all" for every specific type (default: All Types)')
+    parser.add_argument('--max-results', type=int, default=20,
+                        help='Search results per combination (default: 20)')
+    parser.add_argument('--engines', default='all',
+                        help=f'Comma-separated search engines ({", ".join(BACKENDS)}), or "all" (default: all)')
+    parser.add_argument('--search-pages', type=int, default=2,
+                        help='Results pages requested from each search engine (default: 2)')
+    parser.add_argument('--max-queries', type=int, default=6,
+                        help='Queries per combination across cities, branch synonyms and type '
+                             'variants; 1 disables expansion (default: 6)')
+    parser.add_argument('--search-ttl-hours', type=float, default=168,
+                        help='Hours a search results page is reused before searching again (default: 168)')
+    parser.add_argument('--concurrency', type=int, default=2,
+                        help='Combinations crawled at the same time (default: 2)')
+    parser.add_argument('--workers', type=int, default=8,
+                        help='Scraping threads shared by all combinations, plus as many for contact '
+                             'pages; also the connections kept open to each host (default: 8)')
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help='Scrape on one asyncio event loop (aiohttp) instead of a thread pool')
+    parser.add_argument('--async-concurrency', type=int, default=100,
+                        help='Pages in flight at once with --async (default: 100)')
+    parser.add_argument('--max-hosts', type=int, default=100,
+                        help='Hosts whose connections are kept open at once (default: 100)')
+    parser.add_argument('--http2', action='store_true',
+                        help='Use HTTP/2 (requires httpx[http2])')
+    parser.add_argument('--max-page-kb', type=int, default=2048,
+                        help='Stop downloading a page after this many KB (default: 2048)')
+    parser.add_argument('--head-budget-kb', type=int, default=None,
+                        help='Stop reading a homepage this many KB after </head> (default: read it all)')
+    parser.add_argument('--contact-pages', type=int, default=3,
+                        help='Extra pages per site searched for contact details (default: 3)')
+    parser.add_argument('--per-host-delay', type=float, default=1.0,
+                        help='Minimum seconds between requests to one host (default: 1.0)')
+    parser.add_argument('--retries', type=int, default=2,
+                        help='Retries for timeouts, connection errors, 429 and 5xx (default: 2)')
+    parser.add_argument('--ignore-robots', action='store_true',
+                        help='Do not read Crawl-delay from robots.txt')
+    parser.add_argument('--output', default=None,
+                        help='Incremental output file, .jsonl or .csv (default: output/college_data_<time>.jsonl)')
+    parser.add_argument('--xlsx', default=None,
+                        help='Excel file written at the end (default: output file with .xlsx)')
+    parser.add_argument('--replay', action='store_true',
+                        help='Serve pages only from the HTTP cache')
+    parser.add_argument('--no-resume', action='store_true',
+                        help='Do not journal jobs or resume interrupted ones')
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help='Serve Prometheus metrics at http://127.0.0.1:PORT/metrics during the crawl')
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='Log every scraped college')
+    return parser
+
+
+def main(argv: Sequence[str] = None) -> int:
+    """Run the batch crawl; returns the process exit code"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    
+    try:
+        states = parse_choices(args.states, INDIAN_STATES, '--states')
+        branches = parse_choices(args.branches, ENGINEERING_BRANCHES, '--branches')
+        college_types = parse_choices(args.types, COLLEGE_TYPES, '--types')
+        engines = parse_choices(args.engines, list(BACKENDS), '--engines')
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+    
+    combos = list(itertools.product(states, branches, college_types))
+    logger.info("Batch crawl: %d states x %d branches x %d types = %d jobs",
+                len(states), len(branches), len(college_types), len(combos))
+    
+    # One cache, scraper, dedupe store and output shared by every job
+    cache = ResponseCache(replay=args.replay)
+    limiter = HostRateLimiter(min_interval=args.per_host_delay, respect_robots=not args.ignore_robots)
+    guard = FetchGuard(RetryPolicy(max_attempts=args.retries + 1))
+    control = CrawlControl()
+    client = HttpClient(cache, limiter, guard, max_hosts=args.max_hosts,
+                        max_connections_per_host=args.workers, http2=args.http2, control=control)
+    searcher = MultiEngineSearcher.from_names(
+        engines, client, pages=args.search_pages,
+        expander=QueryExpander(args.max_queries),
+        memo=SearchMemo(ttl=args.search_ttl_hours * 3600)
+    )
+    limits = DownloadLimits(
+        max_bytes=args.max_page_kb * 1024,
+        head_budget=args.head_budget_kb * 1024 if args.head_budget_kb is not None else None
+    )
+    scraper = CollegeScraper(client, limits=limits, contact_pages=args.contact_pages,
+                             contact_workers=args.workers)
+    if args.use_async:
+        # Imported here so the threaded default does not need aiohttp
+        from scraper.async_college_scraper import AsyncScrapeEngine
+        engine = AsyncScrapeEngine(args.async_concurrency, per_host_limit=args.workers,
+                                   cache=cache, limiter=limiter, guard=guard, limits=limits,
+                                   contact_pages=args.contact_pages)
+    else:
+        engine = ThreadedScrapeEngine(scraper, max_workers=args.workers)
+    sink = IncrementalSink.for_path(args.output or IncrementalSink.default_path())
+    data_manager = CollegeDataManager(sink=sink)
+    journal = None if args.no_resume else CrawlJournal()
+    pipeline = CrawlPipeline(searcher, engine, data_manager, journal)
+    
+    METRICS.add_collector('connections', client.stats.snapshot)
+    METRICS.add_collector('fetch', guard.stats.snapshot)
+    METRICS.add_collector('colleges', lambda: {'unique': data_manager.count(),
+                                               'merged': data_manager.merged_count})
+    metrics_server = None
+    if args.metrics_port is not None:
+        metrics_server = MetricsServer(METRICS, port=args.metrics_port).start()
+        logger.info("Serving metrics at %s", metrics_server.url)
+    
+    failed = 0
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as executor:
+            futures = {
+                executor.submit(pipeline.run_job, state, branch, college_type, args.max_results,
+                                ConsoleListener(f"{state} / {branch} / {college_type}", args.verbose),
+                                control=control):
+                (state, branch, college_type)
+                for state, branch, college_type in combos
+            }
+            try:
+                for done, future in enumerate(as_completed(futures), 1):
+                    label = ' / '.join(futures[future])
+                    try:
+                        job = future.result()
+                        logger.info("[%d/%d] %s: %d found, %d added (%d colleges total)", done, len(combos),
+                                    label, job.found, job.added, data_manager.count())
+                    except Exception as e:
+                        failed += 1
+                        logger.error("[%d/%d] %s failed: %s", done, len(combos), label, e)
+            except KeyboardInterrupt:
+                # Running jobs stop at their next request instead of finishing
+                control.cancel()
+                for future in futures:
+                    future.cancel()
+                raise
+    except KeyboardInterrupt:
+        logger.warning("Interrupted; unfinished jobs resume on the next run")
+        return 130
+    finally:
+        engine.close()
+        scraper.close()
+        sink.close()
+        client.close()
+        if metrics_server is not None:
+            metrics_server.close()
+        logger.info(METRICS.report())
+    
+    logger.info("Crawl finished: %d colleges, %d duplicates merged, %d jobs failed",
+                data_manager.count(), data_manager.merged_count, failed)
+    logger.info("Records written to %s", sink.path)
+    logger.info("Fetch stats: %s", guard.stats.summary())
+    logger.info("Connection stats: %s", client.stats.summary())
+    for host, count in limiter.throttled_hosts().items():
+        logger.info("Throttled by %s: %d times", host, count, extra={'host': host})
+    
+    if data_manager.count() > 0:
+        filepath = sink.finalize_to_excel(args.xlsx, summary={
+            'States': ', '.join(states) if len(states) <= 5 else f"{len(states)} states",
+            'Branches': ', '.join(branches) if len(branches) <= 5 else f"{len(branches)} branches",
+            'College Types': ', '.join(college_types),
+        })
+        logger.info("Excel file written to %s", filepath)
+    
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
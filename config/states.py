@@ -70,3 +70,67 @@ COLLEGE_TYPES = [
     "Private",
     "Autonomous"
 ]
+
+# Major cities and districts per state, used to widen search queries
+STATE_CITIES = {
+    "Andhra Pradesh": ["Visakhapatnam", "Vijayawada", "Guntur", "Tirupati", "Kakinada", "Anantapur"],
+    "Arunachal Pradesh": ["Itanagar", "Naharlagun", "Pasighat"],
+    "Assam": ["Guwahati", "Silchar", "Jorhat", "Dibrugarh", "Tezpur"],
+    "Bihar": ["Patna", "Gaya", "Bhagalpur", "Muzaffarpur", "Darbhanga"],
+    "Chhattisgarh": ["Raipur", "Bhilai", "Bilaspur", "Durg"],
+    "Goa": ["Panaji", "Margao", "Ponda"],
+    "Gujarat": ["Ahmedabad", "Surat", "Vadodara", "Rajkot", "Gandhinagar", "Bhavnagar"],
+    "Haryana": ["Gurugram", "Faridabad", "Kurukshetra", "Hisar", "Rohtak", "Sonipat"],
+    "Himachal Pradesh": ["Shimla", "Hamirpur", "Solan", "Mandi"],
+    "Jharkhand": ["Ranchi", "Jamshedpur", "Dhanbad", "Bokaro"],
+    "Karnataka": ["Bengaluru", "Mysuru", "Mangaluru", "Belagavi", "Hubballi", "Davanagere"],
+    "Kerala": ["Thiruvananthapuram", "Kochi", "Kozhikode", "Thrissur", "Kollam", "Kottayam"],
+    "Madhya Pradesh": ["Bhopal", "Indore", "Jabalpur", "Gwalior", "Ujjain"],
+    "Maharashtra": ["Mumbai", "Pune", "Nagpur", "Nashik", "Aurangabad", "Kolhapur"],
+    "Manipur": ["Imphal"],
+    "Meghalaya": ["Shillong", "Tura"],
+    "Mizoram": ["Aizawl"],
+    "Nagaland": ["Kohima", "Dimapur"],
+    "Odisha": ["Bhubaneswar", "Cuttack", "Rourkela", "Berhampur", "Sambalpur"],
+    "Punjab": ["Ludhiana", "Amritsar", "Jalandhar", "Patiala", "Mohali"],
+    "Rajasthan": ["Jaipur", "Jodhpur", "Kota", "Udaipur", "Ajmer", "Bikaner"],
+    "Sikkim": ["Gangtok", "Majitar"],
+    "Tamil Nadu": ["Chennai", "Coimbatore", "Madurai", "Tiruchirappalli", "Salem", "Tirunelveli"],
+    "Telangana": ["Hyderabad", "Warangal", "Karimnagar", "Nizamabad", "Khammam"],
+    "Tripura": ["Agartala"],
+    "Uttar Pradesh": ["Lucknow", "Kanpur", "Noida", "Ghaziabad", "Prayagraj", "Varanasi"],
+    "Uttarakhand": ["Dehradun", "Roorkee", "Haridwar", "Pantnagar"],
+    "West Bengal": ["Kolkata", "Durgapur", "Siliguri", "Howrah", "Kalyani"],
+    "Andaman and Nicobar Islands": ["Port Blair"],
+    "Chandigarh": ["Chandigarh"],
+    "Dadra and Nagar Haveli and Daman and Diu": ["Silvassa", "Daman"],
+    "Delhi": ["New Delhi", "Dwarka", "Rohini"],
+    "Jammu and Kashmir": ["Srinagar", "Jammu"],
+    "Ladakh": ["Leh", "Kargil"],
+    "Lakshadweep": ["Kavaratti"],
+    "Puducherry": ["Puducherry", "Karaikal"]
+}
+
+# Other names a branch is searched under
+BRANCH_SYNONYMS = {
+    "Computer Science Engineering": ["CSE", "computer engineering"],
+    "Information Technology": ["IT engineering"],
+    "Electronics and Communication Engineering": ["ECE", "electronics engineering"],
+    "Electrical Engineering": ["EEE", "electrical and electronics engineering"],
+    "Mechanical Engineering": ["mechanical"],
+    "Civil Engineering": ["civil"],
+    "Chemical Engineering": ["chemical technology"],
+    "Aerospace Engineering": ["aeronautical engineering"],
+    "Biotechnology": ["biotech engineering"],
+    "Automobile Engineering": ["automotive engineering"],
+    "Instrumentation Engineering": ["electronics and instrumentation"],
+    "Agricultural Engineering": ["agriculture engineering"],
+    "Metallurgical Engineering": ["metallurgy and materials engineering"]
+}
+
+# Other ways a college type is written in search queries
+COLLEGE_TYPE_VARIANTS = {
+    "Government": ["govt", "state government"],
+    "Private": ["self financing"],
+    "Autonomous": ["autonomous institute"]
+}
@@ -0,0 +1,3 @@
+"""
+pytest configuration: makes the top-level packages importable from tests/
+"""
@@ -2,66 +2,506 @@
 Data models for college information
 """
 
-from dataclasses import dataclass, field
-from typing import List, Optional
+import random
+import re
+import sys
+import threading
+import zlib
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+from config.states import ENGINEERING_BRANCHES
+from utils.metrics import METRICS
+
+# Abbreviations expanded before comparing college names
+NAME_ABBREVIATIONS = {
+    'inst': 'institute',
+    'instt': 'institute',
+    'tech': 'technology',
+    'technol': 'technology',
+    'engg': 'engineering',
+    'engr': 'engineering',
+    'eng': 'engineering',
+    'univ': 'university',
+    'coll': 'college',
+    'clg': 'college',
+    'govt': 'government',
+    'sci': 'science',
+    'mgmt': 'management',
+    'res': 'research',
+    'natl': 'national',
+    'intl': 'international',
+}
+
+# Words that carry no identity in a college name
+NAME_STOPWORDS = {'of', 'the', 'and', 'for', 'in', 'at'}
+
+# Words shared by most college names; left out when blocking candidates
+GENERIC_NAME_WORDS = {
+    'college', 'engineering', 'institute', 'technology', 'university',
+    'government', 'science', 'sciences', 'management', 'research',
+    'school', 'academy', 'polytechnic', 'technical', 'studies', 'campus',
+}
+
+
+def normalize_text(value: str) -> str:
+    """Lowercase and collapse whitespace for key comparisons"""
+    return ' '.join(value.lower().split()) if value else ""
+
+
+def website_domain(url: str) -> str:
+    """Get the normalized host of a website URL (without www.)"""
+    if not url:
+        return ""
+    if '://' not in url:
+        url = 'http://' + url
+    host = urlparse(url).netloc.lower().split('@')[-1].split(':')[0]
+    return host[4:] if host.startswith('www.') else host
+
+
+def normalize_college_name(name: str) -> str:
+    """Canonical form of a college name for fuzzy matching"""
+    if not name:
+        return ""
+    words = re.findall(r'[a-z0-9]+', name.lower().replace('&', ' and '))
+    words = [NAME_ABBREVIATIONS.get(word, word) for word in words]
+    return ' '.join(word for word in words if word not in NAME_STOPWORDS)
+
+
+def name_shingles(name: str, size: int = 3, distinctive: bool = False) -> Set[str]:
+    """Character n-grams of a normalized college name"""
+    compact = normalize_college_name(name)
+    if distinctive:
+        words = [word for word in compact.split() if word not in GENERIC_NAME_WORDS]
+        compact = ' '.join(words) or compact
+    if len(compact) <= size:
+        return {compact} if compact else set()
+    return {compact[i:i + size] for i in range(len(compact) - size + 1)}
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    """Jaccard similarity of two sets"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+# Column order used when exporting colleges
+EXPORT_COLUMNS = (
+    'College Name', 'University', 'Type', 'Location',
+    'Branches', 'Email', 'HOD Contact', 'Admin Contact',
+    'Other Contacts', 'Website'
+)
+
+# Placeholder in the branch choices; never stored on a college
+ALL_BRANCHES = "All Branches"
+
+# Bit assigned to each known branch in CollegeInfo's branch bitset
+BRANCH_BITS = {
+    branch: 1 << bit
+    for bit, branch in enumerate(b for b in ENGINEERING_BRANCHES if b != ALL_BRANCHES)
+}
+
 
-@dataclass
 class CollegeInfo:
-    """Data class to store college information"""
-    name: str = ""
-    university: str = ""
-    email: str = ""
-    location: str = ""
-    branches: List[str] = field(default_factory=list)
-    hod_contact: str = ""
-    admin_contact: str = ""
-    other_contacts: List[str] = field(default_factory=list)
-    website: str = ""
-    college_type: str = ""  # Government/Private/Autonomous
+    """
+    Compact record of college information
+    
+    Slotted (no per-instance __dict__); known branches are kept as a bitset
+    over ENGINEERING_BRANCHES and contact lists as tuples. Type, university
+    and state strings are interned since they repeat across records.
+    ``branches`` and ``other_contacts`` read as tuples, so changing them in
+    place fails loudly: assign a new list, or use add_branch/add_contact.
+    """
+    
+    __slots__ = ('name', 'email', 'location', 'hod_contact', 'admin_contact', 'website',
+                 '_university', '_college_type', '_state',
+                 '_branch_bits', '_extra_branches', '_other_contacts')
+    
+    def __init__(self, name: str = "", university: str = "", email: str = "",
+                 location: str = "", branches: List[str] = None, hod_contact: str = "",
+                 admin_contact: str = "", other_contacts: List[str] = None,
+                 website: str = "", college_type: str = "", state: str = ""):
+        self.name = name
+        self.university = university
+        self.email = email
+        self.location = location
+        self.branches = branches
+        self.hod_contact = hod_contact
+        self.admin_contact = admin_contact
+        self.other_contacts = other_contacts
+        self.website = website
+        self.college_type = college_type  # Government/Private/Autonomous
+        self.state = state  # State searched, used for indexing
+    
+    @property
+    def university(self) -> str:
+        return self._university
+    
+    @university.setter
+    def university(self, value: str):
+        self._university = sys.intern(value) if value else ""
+    
+    @property
+    def college_type(self) -> str:
+        return self._college_type
+    
+    @college_type.setter
+    def college_type(self, value: str):
+        self._college_type = sys.intern(value) if value else ""
+    
+    @property
+    def state(self) -> str:
+        return self._state
+    
+    @state.setter
+    def state(self, value: str):
+        self._state = sys.intern(value) if value else ""
+    
+    @property
+    def branches(self) -> Tuple[str, ...]:
+        """Branch names, known branches in ENGINEERING_BRANCHES order"""
+        bits = self._branch_bits
+        known = tuple(branch for branch, bit in BRANCH_BITS.items() if bits & bit) if bits else ()
+        return known + self._extra_branches
+    
+    @branches.setter
+    def branches(self, value: List[str]):
+        self._branch_bits = 0
+        self._extra_branches = ()
+        for branch in value or ():
+            self.add_branch(branch)
+    
+    def add_branch(self, branch: str):
+        """Record one more branch (duplicates and the "All Branches" placeholder are ignored)"""
+        bit = BRANCH_BITS.get(branch)
+        if bit:
+            self._branch_bits |= bit
+        elif branch and branch != ALL_BRANCHES and branch not in self._extra_branches:
+            self._extra_branches += (sys.intern(branch),)
+    
+    @property
+    def other_contacts(self) -> Tuple[str, ...]:
+        return self._other_contacts
+    
+    @other_contacts.setter
+    def other_contacts(self, value: List[str]):
+        self._other_contacts = tuple(value) if value else ()
+    
+    def add_contact(self, phone: str):
+        """Record one more contact number unless the college already has it"""
+        if phone and phone not in self.phones():
+            self._other_contacts += (phone,)
+    
+    def __repr__(self):
+        fields = ', '.join(f"{attr}={getattr(self, attr)!r}" for attr in (
+            'name', 'university', 'email', 'location', 'branches', 'hod_contact',
+            'admin_contact', 'other_contacts', 'website', 'college_type', 'state'))
+        return f"CollegeInfo({fields})"
     
     def to_dict(self):
         """Convert to dictionary for Excel export"""
-        return {
-            'College Name': self.name,
-            'University': self.university,
-            'Email': self.email,
-            'Location': self.location,
-            'Branches': ', '.join(self.branches) if self.branches else '',
-            'HOD Contact': self.hod_contact,
-            'Admin Contact': self.admin_contact,
-            'Other Contacts': ', '.join(self.other_contacts) if self.other_contacts else '',
-            'Website': self.website,
-            'Type': self.college_type
-        }
+        return dict(zip(EXPORT_COLUMNS, self.to_row()))
+    
+    def to_row(self) -> tuple:
+        """Export values in EXPORT_COLUMNS order"""
+        return (
+            self.name,
+            self._university,
+            self._college_type,
+            self.location,
+            ', '.join(self.branches) if self._branch_bits or self._extra_branches else '',
+            self.email,
+            self.hod_contact,
+            self.admin_contact,
+            ', '.join(self._other_contacts),
+            self.website
+        )
     
     def is_valid(self):
         """Check if college has minimum required information"""
         return bool(self.name and (self.email or self.website or self.admin_contact))
     
+    def phones(self) -> Set[str]:
+        """All phone numbers recorded for the college"""
+        return {phone for phone in (self.admin_contact, self.hod_contact) + self._other_contacts if phone}
+    
+    def merge(self, other: 'CollegeInfo'):
+        """
+        Fill in missing fields from a duplicate record
+        
+        Args:
+            other: Another record describing the same college
+        """
+        for attr in ('name', 'university', 'email', 'location', 'hod_contact',
+                     'admin_contact', 'website', 'state'):
+            if not getattr(self, attr) and getattr(other, attr):
+                setattr(self, attr, getattr(other, attr))
+        
+        if self.college_type in ('', 'Unknown') and other.college_type:
+            self.college_type = other.college_type
+        
+        self._branch_bits |= other._branch_bits
+        for branch in other._extra_branches:
+            self.add_branch(branch)
+        
+        for phone in (other.admin_contact,) + other._other_contacts:
+            self.add_contact(phone)
+    
+    def key(self) -> Tuple[str, str]:
+        """Normalized (name, location) key used for duplicate detection"""
+        return (normalize_text(self.name), normalize_text(self.location))
+    
+    def domain(self) -> str:
+        """Normalized website domain"""
+        return website_domain(self.website)
+    
     def __hash__(self):
         """Make hashable for duplicate detection"""
-        return hash((self.name.lower(), self.location.lower()))
+        return hash(self.key())
     
     def __eq__(self, other):
         """Check equality based on name and location"""
         if not isinstance(other, CollegeInfo):
             return False
-        return (self.name.lower() == other.name.lower() and 
-                self.location.lower() == other.location.lower())
+        return self.key() == other.key()
+
+
+class NearDuplicateIndex:
+    """
+    Find near-duplicate colleges without comparing every pair
+    
+    Names are blocked with MinHash/LSH over character trigrams of the
+    distinctive words of the normalized name; website domains and phone
+    numbers are blocked exactly. Only records sharing a block are compared,
+    on trigrams of the full normalized name.
+    """
+    
+    _PRIME = (1 << 31) - 1
+    
+    def __init__(self, num_perm: int = 16, bands: int = 4,
+                 name_threshold: float = 0.85, shared_contact_threshold: float = 0.5):
+        """
+        Args:
+            num_perm: Number of MinHash permutations
+            bands: Number of LSH bands (num_perm must divide evenly)
+            name_threshold: Name similarity needed on its own
+            shared_contact_threshold: Name similarity needed when domain or phone match
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        rng = random.Random(1)
+        self._perms = [(rng.randrange(1, self._PRIME), rng.randrange(0, self._PRIME))
+                       for _ in range(num_perm)]
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.name_threshold = name_threshold
+        self.shared_contact_threshold = shared_contact_threshold
+        self._buckets: Dict[Tuple[int, tuple], List[int]] = defaultdict(list)
+        self._by_domain: Dict[str, List[int]] = defaultdict(list)
+        self._by_phone: Dict[str, List[int]] = defaultdict(list)
+        self._records: List[CollegeInfo] = []
+        self._shingles: List[Set[str]] = []
+        self._domains: List[str] = []
+        self._positions: Dict[int, int] = {}
+        self._last_bands = (None, None)  # (name, band keys) from the last find()
+    
+    def _signature(self, shingles: Set[str]) -> List[int]:
+        """MinHash signature of a shingle set"""
+        hashes = [zlib.crc32(s.encode('utf-8')) for s in shingles]
+        prime = self._PRIME
+        return [min((a * h + b) % prime for h in hashes) for a, b in self._perms]
+    
+    def _name_bands(self, name: str):
+        """LSH band keys of a college name, reusing the result of the previous call"""
+        if self._last_bands[0] != name:
+            self._last_bands = (name, self._bands(name_shingles(name, distinctive=True)))
+        return self._last_bands[1]
+    
+    def _bands(self, shingles: Set[str]):
+        """LSH band keys of a shingle set"""
+        if not shingles:
+            return []
+        signature = self._signature(shingles)
+        return [(band, tuple(signature[band * self.rows:(band + 1) * self.rows]))
+                for band in range(self.bands)]
+    
+    def find(self, college: CollegeInfo) -> Optional[CollegeInfo]:
+        """
+        Find a stored record that is a near duplicate of a college
+        
+        Args:
+            college: Candidate record
+            
+        Returns:
+            Best matching stored CollegeInfo or None
+        """
+        shingles = name_shingles(college.name)
+        domain = college.domain()
+        phones = college.phones()
+        
+        by_name = set()
+        for band_key in self._name_bands(college.name):
+            by_name.update(self._buckets.get(band_key, ()))
+        by_contact = set(self._by_domain.get(domain, ())) if domain else set()
+        for phone in phones:
+            by_contact.update(self._by_phone.get(phone, ()))
+        
+        best, best_score = None, 0.0
+        for idx in by_name | by_contact:
+            other_domain = self._domains[idx]
+            if domain and other_domain and domain != other_domain:
+                continue  # Different websites are different colleges
+            
+            score = jaccard(shingles, self._shingles[idx])
+            threshold = self.shared_contact_threshold if idx in by_contact else self.name_threshold
+            if score >= threshold and score > best_score:
+                best, best_score = self._records[idx], score
+        
+        return best
+    
+    def add(self, college: CollegeInfo):
+        """Index a stored record"""
+        idx = len(self._records)
+        shingles = name_shingles(college.name)
+        self._records.append(college)
+        self._shingles.append(shingles)
+        self._domains.append(college.domain())
+        self._positions[id(college)] = idx
+        for band_key in self._name_bands(college.name):
+            self._buckets[band_key].append(idx)
+        self.update_contacts(college, idx)
+    
+    def update_contacts(self, college: CollegeInfo, idx: int = None):
+        """Index the domain and phones of a record (again, after a merge)"""
+        if idx is None:
+            idx = self._positions[id(college)]
+        domain = college.domain()
+        self._domains[idx] = domain
+        if domain and idx not in self._by_domain[domain]:
+            self._by_domain[domain].append(idx)
+        for phone in college.phones():
+            if idx not in self._by_phone[phone]:
+                self._by_phone[phone].append(idx)
+    
+    def clear(self):
+        """Remove every record"""
+        self._buckets.clear()
+        self._by_domain.clear()
+        self._by_phone.clear()
+        self._records.clear()
+        self._shingles.clear()
+        self._domains.clear()
+        self._positions.clear()
+        self._last_bands = (None, None)
 
 
 class CollegeDataManager:
     """Manage collection of college data"""
     
-    def __init__(self):
+    def __init__(self, fuzzy: bool = True, sink=None):
+        """
+        Args:
+            fuzzy: Merge near-duplicate records (e.g. abbreviated names) as well as exact ones
+            sink: Optional IncrementalSink that receives each accepted or updated college
+        """
         self.colleges: List[CollegeInfo] = []
+        self.sink = sink
+        self._lock = threading.RLock()
+        self.merged_count = 0
+        self._near_duplicates = NearDuplicateIndex() if fuzzy else None
+        self._by_key: Dict[Tuple[str, str], CollegeInfo] = {}
+        # Secondary index buckets map id(college) -> college, in insertion order,
+        # so a merge can drop a record without scanning its bucket
+        self._by_domain: Dict[str, Dict[int, CollegeInfo]] = defaultdict(dict)
+        self._by_state: Dict[str, Dict[int, CollegeInfo]] = defaultdict(dict)
+        self._by_type: Dict[str, Dict[int, CollegeInfo]] = defaultdict(dict)
+        self._by_branch: Dict[str, Dict[int, CollegeInfo]] = defaultdict(dict)
     
+    @METRICS.timed('dedupe')
     def add_college(self, college: CollegeInfo):
-        """Add college if valid and not duplicate"""
-        if college.is_valid() and college not in self.colleges:
-            self.colleges.append(college)
-            return True
-        return False
+        """Add college if valid and not duplicate (safe to call from several threads)"""
+        if not college.is_valid():
+            return False
+        
+        with self._lock:
+            return self._add_locked(college)
+    
+    def _add_locked(self, college: CollegeInfo) -> bool:
+        key = college.key()
+        existing = self._by_key.get(key)
+        if existing is None and self._near_duplicates is not None:
+            existing = self._near_duplicates.find(college)
+        
+        if existing is not None:
+            if existing is not college:
+                self._merge(existing, college)
+            return False
+        
+        self.colleges.append(college)
+        self._by_key[key] = college
+        self._index(college)
+        if self._near_duplicates is not None:
+            self._near_duplicates.add(college)
+        if self.sink is not None:
+            self.sink.append(college)
+        return True
+    
+    def _merge(self, existing: CollegeInfo, duplicate: CollegeInfo):
+        """Merge a duplicate into a stored record and refresh its index entries"""
+        self._unindex(existing)
+        existing.merge(duplicate)
+        self._by_key.setdefault(existing.key(), existing)
+        self._index(existing)
+        if self._near_duplicates is not None:
+            self._near_duplicates.update_contacts(existing)
+        if self.sink is not None:
+            self.sink.append(existing)
+        self.merged_count += 1
+    
+    def _unindex(self, college: CollegeInfo):
+        """Remove a college from the secondary indexes"""
+        entries = [(self._by_domain, college.domain()),
+                   (self._by_state, normalize_text(college.state)),
+                   (self._by_type, normalize_text(college.college_type))]
+        entries += [(self._by_branch, normalize_text(branch)) for branch in college.branches]
+        for index, value in entries:
+            bucket = index.get(value)
+            if bucket:
+                bucket.pop(id(college), None)
+    
+    def _index(self, college: CollegeInfo):
+        """Add a college to the secondary indexes"""
+        domain = college.domain()
+        if domain:
+            self._by_domain[domain][id(college)] = college
+        self._by_state[normalize_text(college.state)][id(college)] = college
+        self._by_type[normalize_text(college.college_type)][id(college)] = college
+        for branch in college.branches:
+            self._by_branch[normalize_text(branch)][id(college)] = college
+    
+    def contains(self, college: CollegeInfo) -> bool:
+        """Check whether a college with the same name and location is stored"""
+        return college.key() in self._by_key
+    
+    def get(self, name: str, location: str) -> Optional[CollegeInfo]:
+        """Get the college stored under a name and location"""
+        return self._by_key.get((normalize_text(name), normalize_text(location)))
+    
+    def get_by_domain(self, url_or_domain: str) -> List[CollegeInfo]:
+        """Get colleges whose website is on the given domain"""
+        return list(self._by_domain.get(website_domain(url_or_domain), {}).values())
+    
+    def get_by_state(self, state: str) -> List[CollegeInfo]:
+        """Get colleges found for a state"""
+        return list(self._by_state.get(normalize_text(state), {}).values())
+    
+    def get_by_type(self, college_type: str) -> List[CollegeInfo]:
+        """Get colleges of a type (Government/Private/...)"""
+        return list(self._by_type.get(normalize_text(college_type), {}).values())
+    
+    def get_by_branch(self, branch: str) -> List[CollegeInfo]:
+        """Get colleges offering a branch"""
+        return list(self._by_branch.get(normalize_text(branch), {}).values())
     
     def get_all(self) -> List[CollegeInfo]:
         """Get all colleges"""
@@ -69,7 +509,19 @@ class CollegeDataManager:
     
     def clear(self):
         """Clear all data"""
+        with self._lock:
+            self._clear_locked()
+    
+    def _clear_locked(self):
         self.colleges.clear()
+        self._by_key.clear()
+        self._by_domain.clear()
+        self._by_state.clear()
+        self._by_type.clear()
+        self._by_branch.clear()
+        self.merged_count = 0
+        if self._near_duplicates is not None:
+            self._near_duplicates.clear()
     
     def count(self) -> int:
         """Get count of colleges"""
@@ -0,0 +1,191 @@
+"""
+SQLite job journal so interrupted crawls can resume where they stopped
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Optional, Set, Tuple
+from data.college_data import CollegeInfo
+from data.incremental_sink import college_from_record, college_to_record
+from utils.logger import setup_logger
+
+logger = setup_logger('crawl_journal')
+
+
+class CrawlJournal:
+    """
+    Record each crawl job's search results, finished URLs and extracted colleges
+    
+    A job is identified by its search parameters. Starting a job whose
+    previous run never completed resumes it: URLs already done are skipped,
+    and the saved search results are reused if the search ran to the end.
+    """
+    
+    RUNNING = 'running'
+    COMPLETED = 'completed'
+    
+    def __init__(self, path: str = os.path.join('jobs', 'crawl_journal.sqlite')):
+        """
+        Args:
+            path: SQLite file holding the journal
+        """
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY, state TEXT, branch TEXT, college_type TEXT,
+                max_results INTEGER, status TEXT, created_at REAL, updated_at REAL);
+            CREATE TABLE IF NOT EXISTS search_results (
+                job_id TEXT, position INTEGER, college_name TEXT, url TEXT,
+                PRIMARY KEY (job_id, position));
+            CREATE TABLE IF NOT EXISTS searches (
+                job_id TEXT PRIMARY KEY, completed_at REAL);
+            CREATE TABLE IF NOT EXISTS urls (
+                job_id TEXT, url TEXT, status TEXT, error TEXT, record TEXT, finished_at REAL,
+                PRIMARY KEY (job_id, url));
+        ''')
+        self._conn.commit()
+    
+    @staticmethod
+    def job_id_for(state: str, branch: str, college_type: str, max_results: int) -> str:
+        """Stable id for a set of search parameters"""
+        return '|'.join([state, branch, college_type, str(max_results)])
+    
+    def start_job(self, state: str, branch: str, college_type: str, max_results: int) -> Tuple[str, bool]:
+        """
+        Start a job, resuming the previous run with the same parameters if it did not complete
+        
+        Args:
+            state: State searched
+            branch: Branch searched
+            college_type: College type searched
+            max_results: Maximum number of results
+        
+        Returns:
+            Tuple of (job_id, resumed)
+        """
+        job_id = self.job_id_for(state, branch, college_type, max_results)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT status FROM jobs WHERE job_id = ?', (job_id,)
+            ).fetchone()
+            resumed = row is not None and row[0] == self.RUNNING
+            
+            if not resumed:
+                # Fresh run: forget anything from an earlier completed run
+                self._conn.execute('DELETE FROM search_results WHERE job_id = ?', (job_id,))
+                self._conn.execute('DELETE FROM searches WHERE job_id = ?', (job_id,))
+                self._conn.execute('DELETE FROM urls WHERE job_id = ?', (job_id,))
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    (job_id, state, branch, college_type, max_results, self.RUNNING, now, now)
+                )
+            self._conn.commit()
+        
+        if resumed:
+            logger.info("Resuming job: %s", job_id)
+        return job_id, resumed
+    
+    def save_search_results(self, job_id: str, results: List[Tuple[str, str]]):
+        """Replace the search results a job will scrape; the search counts as unfinished"""
+        with self._lock:
+            self._conn.execute('DELETE FROM search_results WHERE job_id = ?', (job_id,))
+            self._conn.execute('DELETE FROM searches WHERE job_id = ?', (job_id,))
+            self._conn.executemany(
+                'INSERT INTO search_results VALUES (?, ?, ?, ?)',
+                [(job_id, idx, name, url) for idx, (name, url) in enumerate(results)]
+            )
+            self._conn.commit()
+    
+    def add_search_result(self, job_id: str, index: int, name: str, url: str):
+        """Record one search result as it streams in"""
+        with self._lock:
+            self._conn.execute(
+                'INSERT INTO search_results VALUES (?, ?, ?, ?)', (job_id, index, name, url)
+            )
+            self._conn.commit()
+    
+    def finish_search(self, job_id: str):
+        """Record that every search result of a job has been saved"""
+        with self._lock:
+            self._conn.execute('INSERT OR REPLACE INTO searches VALUES (?, ?)', (job_id, time.time()))
+            self._conn.commit()
+    
+    def search_complete(self, job_id: str) -> bool:
+        """Whether the job's saved search results are the full list, not a crash's partial one"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT 1 FROM searches WHERE job_id = ?', (job_id,)
+            ).fetchone()
+        return row is not None
+    
+    def load_search_results(self, job_id: str) -> List[Tuple[str, str]]:
+        """Search results saved for a job, in their original order"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT college_name, url FROM search_results WHERE job_id = ? ORDER BY position',
+                (job_id,)
+            ).fetchall()
+        return [(name, url) for name, url in rows]
+    
+    def mark_done(self, job_id: str, url: str, college: Optional[CollegeInfo]):
+        """
+        Record a scraped URL and the college extracted from it
+        
+        Args:
+            job_id: Job id
+            url: URL scraped
+            college: Extracted college (None if nothing usable was found)
+        """
+        record = json.dumps(college_to_record(college, 0)) if college else None
+        self._mark(job_id, url, 'done', None, record)
+    
+    def mark_failed(self, job_id: str, url: str, error: str):
+        """Record a URL that failed; it is retried when the job resumes"""
+        self._mark(job_id, url, 'failed', error, None)
+    
+    def _mark(self, job_id: str, url: str, status: str, error: Optional[str], record: Optional[str]):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO urls VALUES (?, ?, ?, ?, ?, ?)',
+                (job_id, url, status, error, record, now)
+            )
+            self._conn.execute('UPDATE jobs SET updated_at = ? WHERE job_id = ?', (now, job_id))
+            self._conn.commit()
+    
+    def completed_urls(self, job_id: str) -> Set[str]:
+        """URLs already scraped successfully for a job"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url FROM urls WHERE job_id = ? AND status = 'done'", (job_id,)
+            ).fetchall()
+        return {url for (url,) in rows}
+    
+    def load_records(self, job_id: str) -> List[CollegeInfo]:
+        """Colleges extracted so far for a job, in the order they finished"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT record FROM urls WHERE job_id = ? AND status = 'done' "
+                "AND record IS NOT NULL ORDER BY finished_at",
+                (job_id,)
+            ).fetchall()
+        return [college_from_record(json.loads(record)) for (record,) in rows]
+    
+    def finish_job(self, job_id: str):
+        """Mark a job as completed so the next run starts fresh"""
+        with self._lock:
+            self._conn.execute(
+                'UPDATE jobs SET status = ?, updated_at = ? WHERE job_id = ?',
+                (self.COMPLETED, time.time(), job_id)
+            )
+            self._conn.commit()
@@ -2,31 +2,81 @@
 Excel export functionality for college data
 """
 
-import pandas as pd
-from openpyxl import load_workbook
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment
-from typing import List
+from openpyxl.utils import get_column_letter
+from typing import Dict, Iterable, List, Optional, Sequence
 from datetime import datetime
 import os
+from data.college_data import CollegeInfo, EXPORT_COLUMNS
+from utils.metrics import METRICS
 
 class ExcelExporter:
     """Export college data to formatted Excel file"""
     
+    HEADER_FILL = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    HEADER_FONT = Font(bold=True, color="FFFFFF", size=12)
+    HEADER_ALIGNMENT = Alignment(horizontal="center", vertical="center")
+    MAX_COLUMN_WIDTH = 50
+    
     @staticmethod
-    def export_to_excel(data: List[dict], filename: str = None) -> str:
+    def export_to_excel(data: List[dict], filename: str = None, filepath: str = None,
+                        summary: Optional[Dict[str, str]] = None) -> str:
         """
         Export college data to Excel file
         
         Args:
             data: List of college dictionaries
-            filename: Output filename (optional)
-            
+            filename: Output filename inside output/ (optional)
+            filepath: Full output path, overrides filename (optional)
+            summary: Search parameters for a Summary sheet, e.g. {'State': ..., 'Branch': ...}
+        
         Returns:
             Path to created Excel file
         """
         if not data:
             raise ValueError("No data to export")
         
+        if not filepath:
+            filepath = ExcelExporter._default_path(filename)
+        
+        # Only include columns that exist
+        columns = [col for col in EXPORT_COLUMNS if col in data[0]]
+        rows = [tuple(record.get(col, '') for col in columns) for record in data]
+        widths = ExcelExporter.column_widths(columns, rows)
+        
+        return ExcelExporter.write_rows(filepath, columns, rows, widths, summary)
+    
+    @staticmethod
+    def export_colleges(colleges: Sequence[CollegeInfo], filename: str = None, filepath: str = None,
+                        summary: Optional[Dict[str, str]] = None) -> str:
+        """
+        Export CollegeInfo records without building a dict per record
+        
+        Args:
+            colleges: Colleges to export
+            filename: Output filename inside output/ (optional)
+            filepath: Full output path, overrides filename (optional)
+            summary: Search parameters for a Summary sheet (optional)
+        
+        Returns:
+            Path to created Excel file
+        """
+        if not colleges:
+            raise ValueError("No data to export")
+        
+        if not filepath:
+            filepath = ExcelExporter._default_path(filename)
+        
+        # Rows are generated twice (widths, then write) instead of being held in memory
+        widths = ExcelExporter.column_widths(EXPORT_COLUMNS, (c.to_row() for c in colleges))
+        rows = (college.to_row() for college in colleges)
+        return ExcelExporter.write_rows(filepath, EXPORT_COLUMNS, rows, widths, summary)
+    
+    @staticmethod
+    def _default_path(filename: str = None) -> str:
+        """Build a path inside the output directory"""
         # Generate filename if not provided
         if not filename:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -41,89 +91,116 @@ class ExcelExporter:
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
         
-        filepath = os.path.join(output_dir, filename)
+        return os.path.join(output_dir, filename)
+    
+    @staticmethod
+    def column_widths(columns: Sequence[str], rows: Iterable[Sequence]) -> List[int]:
+        """
+        Track the longest value per column
         
-        # Create DataFrame
-        df = pd.DataFrame(data)
+        Args:
+            columns: Header names
+            rows: Row values in column order
         
-        # Reorder columns
-        column_order = [
-            'College Name', 'University', 'Type', 'Location', 
-            'Branches', 'Email', 'HOD Contact', 'Admin Contact', 
-            'Other Contacts', 'Website'
-        ]
+        Returns:
+            Maximum text length per column (header included)
+        """
+        widths = [len(col) for col in columns]
+        for row in rows:
+            for idx, value in enumerate(row):
+                if value:
+                    length = len(str(value))
+                    if length > widths[idx]:
+                        widths[idx] = length
+        return widths
+    
+    @staticmethod
+    @METRICS.timed('export')
+    def write_rows(filepath: str, columns: Sequence[str], rows: Iterable[Sequence],
+                   widths: Sequence[int], summary: Optional[Dict[str, str]] = None) -> str:
+        """
+        Stream rows into a formatted workbook in a single pass
         
-        # Only include columns that exist
-        columns = [col for col in column_order if col in df.columns]
-        df = df[columns]
+        Uses openpyxl's write-only mode, so rows can come from a generator and
+        are never all held as cells. Column widths must be known up front
+        (see column_widths) because write-only sheets emit them before the rows.
         
-        # Export to Excel
-        df.to_excel(filepath, index=False, sheet_name='Colleges')
+        Args:
+            filepath: Path to Excel file
+            columns: Header names
+            rows: Row values in column order
+            widths: Maximum text length per column
+            summary: Search parameters for a Summary sheet (optional)
+        
+        Returns:
+            Path to created Excel file
+        """
+        wb = Workbook(write_only=True)
+        
+        # Sheets are written in creation order, so the summary comes first
+        ws_summary = wb.create_sheet('Summary') if summary is not None else None
+        ws = wb.create_sheet('Colleges')
+        
+        # Column widths and frozen header must be set before the first row
+        for idx, width in enumerate(widths, 1):
+            ws.column_dimensions[get_column_letter(idx)].width = min(width + 2, ExcelExporter.MAX_COLUMN_WIDTH)
+        ws.freeze_panes = 'A2'
         
-        # Format the Excel file
-        ExcelExporter._format_excel(filepath)
+        header = []
+        for col in columns:
+            cell = WriteOnlyCell(ws, value=col)
+            cell.fill = ExcelExporter.HEADER_FILL
+            cell.font = ExcelExporter.HEADER_FONT
+            cell.alignment = ExcelExporter.HEADER_ALIGNMENT
+            header.append(cell)
+        ws.append(header)
         
+        total = 0
+        for row in rows:
+            ws.append(row)
+            total += 1
+        
+        if ws_summary is not None:
+            ExcelExporter._write_summary(ws_summary, total, summary)
+        
+        wb.save(filepath)
         return filepath
     
     @staticmethod
-    def _format_excel(filepath: str):
-        """
-        Apply formatting to Excel file
+    def _write_summary(ws, total_colleges: int, parameters: Dict[str, str]):
+        """Fill a write-only Summary sheet"""
+        ws.column_dimensions['A'].width = 25
+        ws.column_dimensions['B'].width = 40
         
-        Args:
-            filepath: Path to Excel file
-        """
-        try:
-            # Load workbook
-            wb = load_workbook(filepath)
-            ws = wb.active
-            
-            # Header formatting
-            header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            header_font = Font(bold=True, color="FFFFFF", size=12)
-            
-            for cell in ws[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-            
-            # Auto-adjust column widths
-            for column in ws.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                
-                for cell in column:
-                    try:
-                        if cell.value:
-                            max_length = max(max_length, len(str(cell.value)))
-                    except:
-                        pass
-                
-                # Set width with some padding
-                adjusted_width = min(max_length + 2, 50)
-                ws.column_dimensions[column_letter].width = adjusted_width
-            
-            # Freeze header row
-            ws.freeze_panes = 'A2'
-            
-            # Save formatted workbook
-            wb.save(filepath)
-            
-        except Exception as e:
-            # If formatting fails, at least we have the data
-            print(f"Warning: Could not format Excel file: {e}")
+        def bold(text, size):
+            cell = WriteOnlyCell(ws, value=text)
+            cell.font = Font(bold=True, size=size)
+            return cell
+        
+        ws.append([bold('College Scraper Report', 16)])
+        ws.append([''])
+        ws.append([bold('Search Parameters:', 12)])
+        for label, value in parameters.items():
+            ws.append([label, value])
+        ws.append(['Date', datetime.now().strftime("%Y-%m-%d %H:%M:%S")])
+        ws.append([''])
+        ws.append([bold('Results:', 12)])
+        ws.append(['Total Colleges Found', total_colleges])
     
     @staticmethod
     def export_summary(total_colleges: int, state: str, branch: str, filepath: str) -> str:
         """
-        Create a summary sheet in the Excel file
+        Create a summary sheet in an existing Excel file
+        
+        Prefer passing summary= to export_to_excel, which writes the sheet in
+        the same pass instead of reloading the workbook.
         
         Args:
             total_colleges: Number of colleges found
             state: State searched
             branch: Branch searched
             filepath: Path to Excel file
-            
+        
         Returns:
             Path to updated Excel file
         """
@@ -161,7 +238,7 @@ class ExcelExporter:
             ws_summary.column_dimensions['B'].width = 40
             
             wb.save(filepath)
-            
+        
         except Exception as e:
             print(f"Warning: Could not create summary sheet: {e}")
         
@@ -0,0 +1,233 @@
+"""
+Append-only sinks that write colleges to disk while a crawl is running
+"""
+
+import csv
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+from data.college_data import CollegeInfo, EXPORT_COLUMNS
+from data.excel_exporter import ExcelExporter
+from utils.logger import setup_logger
+
+logger = setup_logger('incremental_sink')
+
+# CollegeInfo attributes stored per record
+RECORD_FIELDS = (
+    'name', 'university', 'email', 'location', 'branches', 'hod_contact',
+    'admin_contact', 'other_contacts', 'website', 'college_type', 'state'
+)
+LIST_FIELDS = ('branches', 'other_contacts')
+
+
+def college_to_record(college: CollegeInfo, record_id: int) -> dict:
+    """Serialize a college for a sink"""
+    record = {'id': record_id}
+    for attr in RECORD_FIELDS:
+        record[attr] = getattr(college, attr)
+    return record
+
+
+def college_from_record(record: dict) -> CollegeInfo:
+    """Rebuild a college from a sink record"""
+    return CollegeInfo(**{attr: record.get(attr) or ([] if attr in LIST_FIELDS else "")
+                          for attr in RECORD_FIELDS})
+
+
+class IncrementalSink:
+    """
+    Base class for append-only college sinks
+    
+    Every accepted college is buffered and written in batches. When a stored
+    college is later updated (e.g. a duplicate was merged into it) a new
+    version of the record is appended; readers keep the last version per id.
+    """
+    
+    def __init__(self, path: str, batch_size: int = 25):
+        """
+        Args:
+            path: Output file; existing records are kept and appended to
+            batch_size: Number of records buffered before they are written
+        """
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self._buffer: List[dict] = []
+        self._ids: Dict[int, int] = {}  # id(college) -> record id
+        self._next_id = 1
+        self._lock = threading.Lock()
+        
+        if os.path.exists(path):
+            ids = [record['id'] for record in self._read_records()]
+            self._next_id = max(ids, default=0) + 1
+            logger.info("Appending to %s (%d existing records)", path, len(set(ids)))
+    
+    @staticmethod
+    def for_path(path: str, batch_size: int = 25) -> 'IncrementalSink':
+        """
+        Create a sink for a path, choosing the format from its extension
+        
+        Args:
+            path: Output file ending in .csv or .jsonl
+            batch_size: Number of records buffered before they are written
+        
+        Returns:
+            Sink instance
+        """
+        if path.lower().endswith('.csv'):
+            return CsvSink(path, batch_size)
+        return JsonlSink(path, batch_size)
+    
+    @staticmethod
+    def default_path(extension: str = 'jsonl') -> str:
+        """Timestamped sink path inside the output directory"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return os.path.join('output', f"college_data_{timestamp}.{extension}")
+    
+    def append(self, college: CollegeInfo):
+        """
+        Queue a college (or a new version of it) for writing
+        
+        Args:
+            college: College to write
+        """
+        with self._lock:
+            record_id = self._ids.get(id(college))
+            if record_id is None:
+                record_id = self._ids[id(college)] = self._next_id
+                self._next_id += 1
+            self._buffer.append(college_to_record(college, record_id))
+            if len(self._buffer) >= self.batch_size:
+                self._flush_locked()
+    
+    def flush(self):
+        """Write buffered records to disk"""
+        with self._lock:
+            self._flush_locked()
+    
+    def _flush_locked(self):
+        if self._buffer:
+            self._write_batch(self._buffer)
+            logger.debug("Flushed %d records to %s", len(self._buffer), self.path,
+                         extra={'stage': 'export'})
+            self._buffer = []
+    
+    def close(self):
+        """Flush and release the sink"""
+        self.flush()
+    
+    def _write_batch(self, records: List[dict]):
+        raise NotImplementedError
+    
+    def _read_records(self) -> Iterator[dict]:
+        raise NotImplementedError
+    
+    def read_colleges(self) -> List[CollegeInfo]:
+        """Latest version of every college written so far"""
+        self.flush()
+        latest: Dict[int, dict] = {}
+        for record in self._read_records():
+            latest[record['id']] = record
+        return [college_from_record(record) for record in latest.values()]
+    
+    def finalize_to_excel(self, filepath: str = None, summary: Optional[Dict[str, str]] = None) -> str:
+        """
+        Write the latest version of every record into a formatted workbook
+        
+        Reads the sink file twice (latest version per id and column widths,
+        then the rows themselves) so only ids are held in memory.
+        
+        Args:
+            filepath: Output .xlsx path (defaults to the sink path with .xlsx)
+            summary: Search parameters for a Summary sheet (optional)
+        
+        Returns:
+            Path to created Excel file
+        """
+        self.flush()
+        if not filepath:
+            filepath = os.path.splitext(self.path)[0] + '.xlsx'
+        
+        last_line: Dict[int, int] = {}
+        for line_no, record in enumerate(self._read_records()):
+            last_line[record['id']] = line_no
+        if not last_line:
+            raise ValueError("No data to export")
+        keep = set(last_line.values())
+        
+        def rows():
+            for line_no, record in enumerate(self._read_records()):
+                if line_no in keep:
+                    yield college_from_record(record).to_row()
+        
+        widths = ExcelExporter.column_widths(EXPORT_COLUMNS, rows())
+        ExcelExporter.write_rows(filepath, EXPORT_COLUMNS, rows(), widths, summary)
+        logger.info("Finalized %d records into %s", len(keep), filepath)
+        return filepath
+
+
+class JsonlSink(IncrementalSink):
+    """Write one JSON object per line"""
+    
+    def _write_batch(self, records: List[dict]):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+    
+    def _read_records(self) -> Iterator[dict]:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash can leave a partial last line
+                    logger.warning("Skipping unreadable line in %s", self.path)
+
+
+class CsvSink(IncrementalSink):
+    """Write CSV rows; list fields are joined with ' | '"""
+    
+    COLUMNS = ('id',) + RECORD_FIELDS
+    LIST_SEPARATOR = ' | '
+    
+    def _write_batch(self, records: List[dict]):
+        new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        with open(self.path, 'a', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            if new_file:
+                writer.writerow(self.COLUMNS)
+            for record in records:
+                writer.writerow([
+                    self.LIST_SEPARATOR.join(record[col]) if col in LIST_FIELDS else record[col]
+                    for col in self.COLUMNS
+                ])
+            f.flush()
+            os.fsync(f.fileno())
+    
+    def _read_records(self) -> Iterator[dict]:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                try:
+                    record = dict(row)
+                    record['id'] = int(record['id'])
+                except (KeyError, TypeError, ValueError):
+                    logger.warning("Skipping unreadable row in %s", self.path)
+                    continue
+                for col in LIST_FIELDS:
+                    value = record.get(col) or ''
+                    record[col] = value.split(self.LIST_SEPARATOR) if value else []
+                yield record
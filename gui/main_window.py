@@ -4,13 +4,42 @@ Main GUI window for College Scraper application
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from tkinter.scrolledtext import ScrolledText
-import threading
-from typing import Callable
-import os
+from typing import Callable, Optional
+from gui.ring_buffer_text import RingBufferText
+from gui.ui_queue import UiEventQueue
+from scraper.progress import CrawlProgress, ProgressSnapshot
+
+
+def format_bytes(count: float) -> str:
+    """Human-readable byte count"""
+    for unit in ('B', 'KB', 'MB'):
+        if count < 1024:
+            return f"{count:.0f} {unit}" if unit == 'B' else f"{count:.1f} {unit}"
+        count /= 1024
+    return f"{count:.1f} GB"
+
+
+def format_duration(seconds: float) -> str:
+    """Seconds as 1h02m, 3m05s or 42s"""
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
 
 class MainWindow:
-    """Main application window"""
+    """
+    Main application window
+    
+    append_result, update_progress, update_status, start_search, end_search,
+    show_error and show_info may be called from worker threads; they are
+    queued and applied on the Tk thread in batches.
+    """
+    
+    MAX_RESULT_LINES = 5000
+    PROGRESS_INTERVAL_MS = 500
     
     def __init__(self, root: tk.Tk):
         self.root = root
@@ -21,6 +50,8 @@ class MainWindow:
         # Callbacks (to be set by main app)
         self.on_search_callback: Callable = None
         self.on_export_callback: Callable = None
+        self.on_pause_callback: Callable = None   # called with True to pause, False to resume
+        self.on_cancel_callback: Callable = None
         
         # Variables
         self.state_var = tk.StringVar()
@@ -30,9 +61,19 @@ class MainWindow:
         
         # Status
         self.is_searching = False
+        self.is_paused = False
+        self._progress: Optional[CrawlProgress] = None
+        self._progress_after = None
         
         # Setup UI
         self._setup_ui()
+        
+        # Updates from worker threads, drained on the Tk timer
+        self.ui_queue = UiEventQueue(self.root)
+        self.ui_queue.on_lines(self.results_text.append_lines)
+        self.ui_queue.on_latest('progress', lambda message: self.progress_label.config(text=message))
+        self.ui_queue.on_latest('status', lambda message: self.status_bar.config(text=message))
+        self.ui_queue.start()
     
     def _setup_ui(self):
         """Setup the user interface"""
@@ -151,6 +192,30 @@ class MainWindow:
         )
         self.search_btn.pack(side=tk.LEFT, padx=5)
         
+        self.pause_btn = tk.Button(
+            button_frame,
+            text="⏸ Pause",
+            font=("Arial", 11),
+            padx=20,
+            pady=10,
+            command=self._on_pause_clicked,
+            cursor="hand2",
+            state=tk.DISABLED
+        )
+        self.pause_btn.pack(side=tk.LEFT, padx=5)
+        
+        self.stop_btn = tk.Button(
+            button_frame,
+            text="⏹ Stop",
+            font=("Arial", 11),
+            padx=20,
+            pady=10,
+            command=self._on_stop_clicked,
+            cursor="hand2",
+            state=tk.DISABLED
+        )
+        self.stop_btn.pack(side=tk.LEFT, padx=5)
+        
         self.export_btn = tk.Button(
             button_frame,
             text="📊 Export to Excel",
@@ -197,6 +262,13 @@ class MainWindow:
             length=300
         )
         self.progress_bar.pack(fill=tk.X, pady=5)
+        
+        # Counts, rates and ETA, then the hosts that have been in flight longest
+        self.stats_label = tk.Label(progress_frame, text="", font=("Arial", 9), anchor='w')
+        self.stats_label.pack(fill=tk.X)
+        self.slowest_label = tk.Label(progress_frame, text="", font=("Arial", 9),
+                                      fg="#666666", anchor='w')
+        self.slowest_label.pack(fill=tk.X)
     
     def _create_results_section(self, parent):
         """Create results display section"""
@@ -209,9 +281,10 @@ class MainWindow:
         )
         results_frame.pack(fill=tk.BOTH, expand=True)
         
-        # Results text area
-        self.results_text = ScrolledText(
+        # Results text area, keeping only the most recent lines
+        self.results_text = RingBufferText(
             results_frame,
+            max_lines=self.MAX_RESULT_LINES,
             font=("Courier New", 9),
             wrap=tk.WORD,
             height=20
@@ -268,6 +341,26 @@ class MainWindow:
         if self.on_search_callback:
             self.on_search_callback(state, branch, college_type, max_results)
     
+    def _on_pause_clicked(self):
+        """Handle pause/resume button click"""
+        if not self.is_searching:
+            return
+        self.is_paused = not self.is_paused
+        self.pause_btn.config(text="▶ Resume" if self.is_paused else "⏸ Pause")
+        self.update_status("Paused" if self.is_paused else "Resumed")
+        if self.on_pause_callback:
+            self.on_pause_callback(self.is_paused)
+    
+    def _on_stop_clicked(self):
+        """Handle stop button click"""
+        if not self.is_searching:
+            return
+        self.pause_btn.config(state=tk.DISABLED)
+        self.stop_btn.config(state=tk.DISABLED)
+        self.update_status("Stopping...")
+        if self.on_cancel_callback:
+            self.on_cancel_callback()
+    
     def _on_export_clicked(self):
         """Handle export button click"""
         if self.on_export_callback:
@@ -275,6 +368,8 @@ class MainWindow:
     
     def _on_clear_clicked(self):
         """Handle clear button click"""
+        # Apply lines already queued so they do not reappear after clearing
+        self.ui_queue.drain()
         self.results_text.delete(1.0, tk.END)
         self.update_status("Results cleared")
         self.export_btn.config(state=tk.DISABLED)
@@ -282,43 +377,93 @@ class MainWindow:
     def start_search(self):
         """Indicate search has started"""
         self.is_searching = True
+        self.ui_queue.call(self._show_search_started)
+    
+    def _show_search_started(self):
         self.search_btn.config(state=tk.DISABLED, bg="#cccccc")
+        self.is_paused = False
+        self.pause_btn.config(state=tk.NORMAL, text="⏸ Pause")
+        self.stop_btn.config(state=tk.NORMAL)
         self.export_btn.config(state=tk.DISABLED)
+        self.progress_bar.config(mode='indeterminate', value=0)
         self.progress_bar.start(10)
+        self.stats_label.config(text="")
+        self.slowest_label.config(text="")
         self.results_text.delete(1.0, tk.END)
     
     def end_search(self, success: bool = True):
         """Indicate search has ended"""
         self.is_searching = False
+        self.ui_queue.call(self._show_search_ended, success)
+    
+    def _show_search_ended(self, success: bool):
         self.search_btn.config(state=tk.NORMAL, bg="#4CAF50")
+        self.is_paused = False
+        self.pause_btn.config(state=tk.DISABLED, text="⏸ Pause")
+        self.stop_btn.config(state=tk.DISABLED)
         self.progress_bar.stop()
+        if self._progress_after is not None:
+            self.root.after_cancel(self._progress_after)
+            self._progress_after = None
+        if self._progress is not None:
+            self._show_progress(self._progress.snapshot())
+            self.slowest_label.config(text="")
         
         if success:
             self.export_btn.config(state=tk.NORMAL)
     
+    def track_progress(self, progress: CrawlProgress):
+        """Show a crawl's progress on the bar and stats line until the search ends"""
+        self._progress = progress
+        self.ui_queue.call(self._poll_progress)
+    
+    def _poll_progress(self):
+        if self._progress_after is not None:
+            self.root.after_cancel(self._progress_after)
+        self._show_progress(self._progress.snapshot())
+        self._progress_after = self.root.after(self.PROGRESS_INTERVAL_MS, self._poll_progress)
+    
+    def _show_progress(self, snapshot: ProgressSnapshot):
+        """Draw one progress snapshot"""
+        if not snapshot.queued:
+            return  # still searching; keep the indeterminate bar
+        
+        if str(self.progress_bar['mode']) != 'determinate':
+            self.progress_bar.stop()
+            self.progress_bar.config(mode='determinate')
+        self.progress_bar.config(maximum=snapshot.queued, value=snapshot.finished)
+        
+        eta = format_duration(snapshot.eta_seconds) if snapshot.eta_seconds is not None else "--"
+        self.stats_label.config(text=(
+            f"{snapshot.finished}/{snapshot.queued} done ({snapshot.failed} failed), "
+            f"{snapshot.in_flight} in flight  |  {snapshot.pages_per_sec:.1f} pages/s, "
+            f"{format_bytes(snapshot.bytes_per_sec)}/s  |  ETA {eta}"
+        ))
+        self.slowest_label.config(text=(
+            "Slowest: " + ", ".join(f"{host} ({format_duration(seconds)})"
+                                     for host, seconds in snapshot.slowest)
+            if snapshot.slowest else ""
+        ))
+    
     def update_progress(self, message: str):
-        """Update progress message"""
-        self.progress_label.config(text=message)
-        self.root.update_idletasks()
+        """Update progress message (only the latest message per batch is drawn)"""
+        self.ui_queue.set_latest('progress', message)
     
     def update_status(self, message: str):
-        """Update status bar"""
-        self.status_bar.config(text=message)
-        self.root.update_idletasks()
+        """Update status bar (only the latest message per batch is drawn)"""
+        self.ui_queue.set_latest('status', message)
     
     def append_result(self, text: str):
         """Append text to results area"""
-        self.results_text.insert(tk.END, text + "\n")
-        self.results_text.see(tk.END)
-        self.root.update_idletasks()
+        self.ui_queue.append(text)
     
     def show_error(self, title: str, message: str):
         """Show error dialog"""
-        messagebox.showerror(title, message)
+        self.ui_queue.call(messagebox.showerror, title, message)
     
     def show_info(self, title: str, message: str):
         """Show info dialog"""
-        messagebox.showinfo(title, message)
+        self.ui_queue.call(messagebox.showinfo, title, message)
     
     def ask_save_location(self, default_filename: str) -> str:
         """Ask user for save location"""
@@ -0,0 +1,38 @@
+"""
+Scrolled text area that keeps only the most recent lines
+"""
+
+import tkinter as tk
+from tkinter.scrolledtext import ScrolledText
+from typing import List
+
+
+class RingBufferText(ScrolledText):
+    """
+    ScrolledText capped at max_lines; the oldest lines are dropped as new ones arrive
+
+    Lines are inserted in batches, and the view only follows the end when the
+    user has not scrolled up to read older output.
+    """
+
+    def __init__(self, master=None, max_lines: int = 5000, **kwargs):
+        super().__init__(master, **kwargs)
+        self.max_lines = max(1, max_lines)
+
+    def append_lines(self, lines: List[str]):
+        """Insert lines at the end in one call and trim the oldest beyond max_lines"""
+        if not lines:
+            return
+
+        # Only follow the output if the view was already at the bottom
+        follow = self.yview()[1] >= 1.0
+        self.insert(tk.END, '\n'.join(lines) + '\n')
+
+        # The widget always ends with an empty line after the last newline
+        line_count = int(self.index('end-1c').split('.')[0]) - 1
+        excess = line_count - self.max_lines
+        if excess > 0:
+            self.delete('1.0', f'{excess + 1}.0')
+
+        if follow:
+            self.see(tk.END)
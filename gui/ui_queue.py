@@ -0,0 +1,111 @@
+"""
+Thread-safe, batched delivery of GUI updates to the Tk event loop
+"""
+
+import threading
+from collections import deque
+from typing import Callable, Dict, List
+
+
+class UiEventQueue:
+    """
+    Collect GUI updates from any thread and apply them on the Tk thread
+
+    Worker threads only append to a deque; a ``root.after`` timer drains it.
+    Each drain inserts all queued result lines in one call and applies only
+    the latest progress and status text, so a burst of updates costs one
+    redraw instead of one per update.
+    """
+
+    def __init__(self, root, interval_ms: int = 50, max_batch: int = 5000):
+        """
+        Args:
+            root: Tk root window
+            interval_ms: Milliseconds between drains
+            max_batch: Events applied per drain; the rest wait for the next one
+        """
+        self.root = root
+        self.interval_ms = interval_ms
+        self.max_batch = max_batch
+        self._events = deque()
+        self._latest_handlers: Dict[str, Callable[[str], None]] = {}
+        self._lines_handler: Callable[[List[str]], None] = None
+        self._ui_thread = threading.current_thread()
+        self._after_id = None
+
+    def on_lines(self, handler: Callable[[List[str]], None]):
+        """Set the handler that receives every batch of appended lines"""
+        self._lines_handler = handler
+
+    def on_latest(self, kind: str, handler: Callable[[str], None]):
+        """Set the handler for a kind of update where only the newest value matters"""
+        self._latest_handlers[kind] = handler
+
+    def start(self):
+        """Begin draining on the Tk timer"""
+        if self._after_id is None:
+            self._after_id = self.root.after(self.interval_ms, self._tick)
+
+    def stop(self):
+        """Stop the timer; queued events stay queued"""
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def append(self, line: str):
+        """Queue a line for the results area"""
+        self._events.append(('lines', line))
+
+    def set_latest(self, kind: str, value: str):
+        """Queue a value for an on_latest handler"""
+        self._events.append((kind, value))
+
+    def call(self, func: Callable, *args):
+        """
+        Run func on the Tk thread
+
+        Called on the Tk thread it runs immediately; from any other thread it
+        runs on the next drain, after the updates queued before it.
+        """
+        if self.on_ui_thread():
+            func(*args)
+        else:
+            self._events.append(('call', (func, args)))
+
+    def on_ui_thread(self) -> bool:
+        """Whether the caller is on the Tk thread"""
+        return threading.current_thread() is self._ui_thread
+
+    def _tick(self):
+        try:
+            self.drain()
+        finally:
+            self._after_id = self.root.after(self.interval_ms, self._tick)
+
+    def drain(self):
+        """Apply up to max_batch queued events now; must run on the Tk thread"""
+        lines: List[str] = []
+        latest: Dict[str, str] = {}
+
+        for _ in range(min(self.max_batch, len(self._events))):
+            kind, value = self._events.popleft()
+            if kind == 'lines':
+                lines.append(value)
+            elif kind == 'call':
+                # Calls see every update queued before them
+                self._flush(lines, latest)
+                lines, latest = [], {}
+                func, args = value
+                func(*args)
+            else:
+                latest[kind] = value
+
+        self._flush(lines, latest)
+
+    def _flush(self, lines: List[str], latest: Dict[str, str]):
+        if lines and self._lines_handler:
+            self._lines_handler(lines)
+        for kind, value in latest.items():
+            handler = self._latest_handlers.get(kind)
+            if handler:
+                handler(value)
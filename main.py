@@ -11,11 +11,24 @@ import os
 # Import modules
 from gui.main_window import MainWindow
 from config.states import INDIAN_STATES, ENGINEERING_BRANCHES, COLLEGE_TYPES
-from scraper.google_search import GoogleSearcher
+from scraper.search_engines import MultiEngineSearcher
+from scraper.query_expansion import QueryExpander
+from scraper.search_memo import SearchMemo
 from scraper.college_scraper import CollegeScraper
+from scraper.concurrent_engine import ThreadedScrapeEngine
+from scraper.crawl_control import CrawlControl
+from scraper.http_cache import ResponseCache
+from scraper.http_client import HttpClient
+from scraper.rate_limiter import HostRateLimiter
+from scraper.retry import FetchGuard
+from scraper.pipeline import CrawlPipeline
+from scraper.progress import CrawlProgress
 from data.college_data import CollegeDataManager
 from data.excel_exporter import ExcelExporter
+from data.incremental_sink import IncrementalSink
+from data.crawl_journal import CrawlJournal
 from utils.logger import setup_logger
+from utils.metrics import METRICS
 
 logger = setup_logger('main')
 
@@ -29,11 +42,24 @@ class CollegeScraperApp:
         # Set up callbacks
         self.window.on_search_callback = self.start_search
         self.window.on_export_callback = self.export_to_excel
+        self.window.on_pause_callback = self.pause_search
+        self.window.on_cancel_callback = self.cancel_search
         
         # Initialize components
-        self.searcher = GoogleSearcher()
-        self.scraper = CollegeScraper()
+        self.cache = ResponseCache()
+        self.limiter = HostRateLimiter(min_interval=1.0)
+        self.guard = FetchGuard()
+        # Checked before every request, so Stop and Pause reach searches and scrapes alike
+        self.control = CrawlControl()
+        self.client = HttpClient(self.cache, self.limiter, self.guard, max_connections_per_host=8,
+                                 control=self.control)
+        self.searcher = MultiEngineSearcher(self.client, expander=QueryExpander(),
+                                            memo=SearchMemo())
+        self.scraper = CollegeScraper(self.client)
+        self.engine = ThreadedScrapeEngine(self.scraper, max_workers=8)
         self.data_manager = CollegeDataManager()
+        self.journal = CrawlJournal()
+        self.pipeline = CrawlPipeline(self.searcher, self.engine, self.data_manager, self.journal)
         
         # Populate dropdowns
         self.window.set_states(INDIAN_STATES)
@@ -60,6 +86,19 @@ class CollegeScraperApp:
         )
         search_thread.start()
     
+    def pause_search(self, paused: bool):
+        """Pause or resume the running search"""
+        if paused:
+            self.control.pause()
+            self.window.update_progress("Paused")
+        else:
+            self.control.resume()
+    
+    def cancel_search(self):
+        """Stop the running search, keeping the colleges collected so far"""
+        logger.info("Search cancelled by user")
+        self.control.cancel()
+    
     def _perform_search(self, state: str, branch: str, college_type: str, max_results: int):
         """
         Perform the actual search and scraping
@@ -70,103 +109,80 @@ class CollegeScraperApp:
             college_type: Selected college type
             max_results: Maximum number of results
         """
+        self.control.reset()
+        METRICS.reset()
         try:
             # Update UI
             self.window.start_search()
             self.window.update_status(f"Searching for colleges in {state}...")
             self.window.update_progress("Searching Google...")
             
-            logger.info(f"Starting search: {state}, {branch}, {college_type}")
+            logger.info("Starting search: %s, %s, %s", state, branch, college_type)
             
-            # Clear previous data
+            # Clear previous data and stream accepted colleges to disk as they arrive
             self.data_manager.clear()
+            self.data_manager.sink = IncrementalSink.for_path(IncrementalSink.default_path())
+            logger.info("Writing results incrementally to %s", self.data_manager.sink.path)
             
-            # Step 1: Search for college websites
-            self.window.append_result(f"{'='*80}")
-            self.window.append_result(f"Searching for {branch} colleges in {state}")
-            self.window.append_result(f"College Type: {college_type}")
-            self.window.append_result(f"{'='*80}\n")
-            
-            # Try DuckDuckGo first (more scraping-friendly)
-            search_results = self.searcher.search_with_duckduckgo(
-                state, branch, college_type, max_results
-            )
+            progress = CrawlProgress(byte_counter=lambda: self.client.stats.bytes_read)
+            self.window.track_progress(progress)
             
-            # Fallback to Google if DuckDuckGo returns no results
-            if not search_results:
-                self.window.update_progress("Trying Google search...")
-                search_results = self.searcher.search_colleges(
-                    state, branch, college_type, max_results
-                )
+            job = self.pipeline.run_job(state, branch, college_type, max_results,
+                                        listener=self.window, progress=progress,
+                                        control=self.control)
             
-            if not search_results:
-                self.window.append_result("❌ No college websites found. Try different search parameters.")
+            if not job.found and not job.cancelled:
                 self.window.update_status("Search completed - No results found")
                 self.window.end_search(success=False)
                 return
             
-            self.window.append_result(f"✓ Found {len(search_results)} potential college websites\n")
-            
-            # Step 2: Scrape each college website
-            self.window.update_progress("Scraping college websites...")
-            
-            for idx, (college_name, url) in enumerate(search_results, 1):
-                try:
-                    self.window.update_progress(f"Scraping {idx}/{len(search_results)}: {college_name}")
-                    self.window.append_result(f"[{idx}/{len(search_results)}] Scraping: {college_name}")
-                    
-                    # Scrape college website
-                    college_info = self.scraper.scrape_college(url, college_name, state)
-                    
-                    if college_info and self.data_manager.add_college(college_info):
-                        self.window.append_result(f"  ✓ Name: {college_info.name}")
-                        self.window.append_result(f"  ✓ Email: {college_info.email or 'Not found'}")
-                        self.window.append_result(f"  ✓ Contact: {college_info.admin_contact or 'Not found'}")
-                        self.window.append_result(f"  ✓ Location: {college_info.location}")
-                        self.window.append_result(f"  ✓ Type: {college_info.college_type}")
-                        if college_info.branches:
-                            self.window.append_result(f"  ✓ Branches: {', '.join(college_info.branches[:3])}")
-                        self.window.append_result("")
-                    else:
-                        self.window.append_result(f"  ⚠ Could not extract sufficient information\n")
-                    
-                    # Small delay to avoid overwhelming servers
-                    import time
-                    time.sleep(1)
-                    
-                except Exception as e:
-                    logger.error(f"Error scraping {url}: {e}")
-                    self.window.append_result(f"  ❌ Error: {str(e)}\n")
-                    continue
-            
             # Summary
             total_colleges = self.data_manager.count()
             self.window.append_result(f"\n{'='*80}")
-            self.window.append_result(f"Search Complete!")
+            self.window.append_result("Search Stopped" if job.cancelled else "Search Complete!")
             self.window.append_result(f"Total colleges found: {total_colleges}")
+            if total_colleges > 0:
+                workbook = self.data_manager.sink.finalize_to_excel(
+                    summary={'State': state, 'Branch': branch}
+                )
+                self.window.append_result(f"Saved to: {workbook}")
             self.window.append_result(f"{'='*80}")
             
-            self.window.update_status(f"Search completed - Found {total_colleges} colleges")
-            self.window.update_progress("Search completed")
+            if job.cancelled:
+                self.window.update_status(f"Search stopped - Kept {total_colleges} colleges")
+                self.window.update_progress("Search stopped")
+            else:
+                self.window.update_status(f"Search completed - Found {total_colleges} colleges")
+                self.window.update_progress("Search completed")
             
-            logger.info(f"Search completed: {total_colleges} colleges found")
+            logger.info("Search completed: %d colleges found", total_colleges)
+            logger.info("Fetch stats: %s", self.guard.stats.summary())
+            logger.info("Connection stats: %s", self.client.stats.summary())
+            logger.info(METRICS.report())
             
             # Enable export if we have data
             if total_colleges > 0:
                 self.window.end_search(success=True)
             else:
                 self.window.end_search(success=False)
+                if job.cancelled:
+                    return
                 self.window.show_info(
                     "No Data",
                     "No college information could be extracted. Try different search parameters."
                 )
         
         except Exception as e:
-            logger.error(f"Search error: {e}", exc_info=True)
+            logger.error("Search error: %s", e, exc_info=True)
             self.window.append_result(f"\n❌ Error: {str(e)}")
             self.window.update_status("Search failed")
-            self.window.end_search(success=False)
+            self.window.end_search(success=self.data_manager.count() > 0)
             self.window.show_error("Search Error", f"An error occurred: {str(e)}")
+        
+        finally:
+            # Whatever was collected is on disk even if the search failed
+            if self.data_manager.sink is not None:
+                self.data_manager.sink.close()
     
     def export_to_excel(self):
         """Export collected data to Excel"""
@@ -188,52 +204,14 @@ class CollegeScraperApp:
                 self.window.update_status("Export cancelled")
                 return
             
-            # Get data
-            data = self.data_manager.to_list_of_dicts()
-            
-            # Export to Excel
-            exporter = ExcelExporter()
-            
-            # Use the user-selected path directly
-            import os
-            output_dir = os.path.dirname(save_path)
-            filename = os.path.basename(save_path)
-            
-            # Temporarily change the export directory
-            original_export = exporter.export_to_excel
-            
-            def custom_export(data, fname):
-                # Create DataFrame and export
-                import pandas as pd
-                df = pd.DataFrame(data)
-                
-                # Reorder columns
-                column_order = [
-                    'College Name', 'University', 'Type', 'Location',
-                    'Branches', 'Email', 'HOD Contact', 'Admin Contact',
-                    'Other Contacts', 'Website'
-                ]
-                columns = [col for col in column_order if col in df.columns]
-                df = df[columns]
-                
-                # Export
-                df.to_excel(save_path, index=False, sheet_name='Colleges')
-                
-                # Format
-                exporter._format_excel(save_path)
-                
-                return save_path
-            
-            filepath = custom_export(data, filename)
-            
-            # Add summary sheet
-            state = self.window.state_var.get()
-            branch = self.window.branch_var.get()
-            exporter.export_summary(
-                self.data_manager.count(),
-                state,
-                branch,
-                filepath
+            # Write colleges, formatting and summary sheet in one pass
+            filepath = ExcelExporter.export_colleges(
+                self.data_manager.get_all(),
+                filepath=save_path,
+                summary={
+                    'State': self.window.state_var.get(),
+                    'Branch': self.window.branch_var.get()
+                }
             )
             
             self.window.update_status(f"Exported to: {filepath}")
@@ -242,21 +220,26 @@ class CollegeScraperApp:
                 f"Data exported successfully!\n\nFile: {filepath}\nTotal colleges: {self.data_manager.count()}"
             )
             
-            logger.info(f"Data exported to: {filepath}")
+            logger.info("Data exported to: %s", filepath)
             
             # Open the file location
             if os.name == 'nt':  # Windows
                 os.startfile(os.path.dirname(filepath))
         
         except Exception as e:
-            logger.error(f"Export error: {e}", exc_info=True)
+            logger.error("Export error: %s", e, exc_info=True)
             self.window.show_error("Export Error", f"Failed to export data: {str(e)}")
             self.window.update_status("Export failed")
     
     def run(self):
         """Run the application"""
         logger.info("Starting application")
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            self.engine.close()
+            self.scraper.close()
+            self.client.close()
 
 
 def main():
@@ -265,7 +248,7 @@ def main():
         app = CollegeScraperApp()
         app.run()
     except Exception as e:
-        logger.error(f"Application error: {e}", exc_info=True)
+        logger.error("Application error: %s", e, exc_info=True)
         messagebox.showerror("Application Error", f"An error occurred: {str(e)}")
 
 
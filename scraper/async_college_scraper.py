@@ -0,0 +1,360 @@
+"""
+Asynchronous college website scraper built on aiohttp
+"""
+
+import asyncio
+import time
+import queue
+import threading
+from typing import AsyncIterator, Callable, Iterable, Iterator, List, Optional, Tuple
+import aiohttp
+from aiohttp.abc import AbstractResolver
+from requests.structures import CaseInsensitiveDict
+from data.college_data import CollegeInfo
+from scraper.college_scraper import CollegePageParser
+from scraper.concurrent_engine import ScrapeEngine, ScrapeResult
+from scraper.contact_frontier import missing_contact_fields
+from scraper.crawl_control import CrawlCancelled, CrawlControl
+from scraper.download import (CHUNK_SIZE, BoundedReader, DownloadLimits, UnsupportedContentError,
+                              check_content_type, decode_html)
+from scraper.http_cache import CacheMissError, CachedEntry, ResponseCache
+from scraper.page_parser import ParsedPage
+from scraper.progress import CrawlProgress
+from scraper.rate_limiter import HostRateLimiter
+from scraper.retry import FetchGuard, classify_failure
+from utils.logger import setup_logger
+from utils.metrics import METRICS
+
+logger = setup_logger('async_college_scraper')
+
+
+class AsyncCollegeScraper(CollegePageParser):
+    """Scrape college websites with many fetches in flight on one event loop"""
+
+    def __init__(self, max_concurrency: int = 100, per_host_limit: int = 4,
+                 per_host_delay: float = 0.0, cache: Optional[ResponseCache] = None,
+                 fast_parse: bool = True, limiter: Optional[HostRateLimiter] = None,
+                 guard: Optional[FetchGuard] = None, limits: Optional[DownloadLimits] = None,
+                 contact_pages: int = 3, control: Optional[CrawlControl] = None,
+                 resolver: Optional[AbstractResolver] = None):
+        super().__init__(fast_parse, contact_pages)
+        self.cache = cache
+        self.limits = limits or DownloadLimits()
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        }
+        self.max_concurrency = max(1, max_concurrency)
+        self.per_host_limit = max(0, per_host_limit)
+        self.limiter = limiter or HostRateLimiter(per_host_delay)
+        self.guard = guard
+        # Pause and cancel are checked before every request
+        self.control = control
+        # Custom DNS resolver for the connector (aiohttp's default when None)
+        self.resolver = resolver
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def open(self):
+        """Create the HTTP session; must be called from the running event loop"""
+        if self.session is None:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_concurrency,
+                limit_per_host=self.per_host_limit,
+                ttl_dns_cache=300,
+                resolver=self.resolver
+            )
+            self.session = aiohttp.ClientSession(headers=self.headers, connector=connector)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def close(self):
+        """Close the HTTP session"""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+            self._semaphore = None
+
+    async def _fetch(self, url: str, timeout: int, check_status: bool = True,
+                     limits: Optional[DownloadLimits] = None) -> str:
+        """Fetch a page politely (or from the cache) and return its decoded text"""
+        limits = limits or self.limits
+        # SQLite calls block, so they run on the default executor
+        entry = await self._in_executor(self.cache.get, url) if self.cache else None
+        request_headers = {}
+        if self.cache:
+            if self.cache.replay:
+                if entry is None:
+                    raise CacheMissError(f"Not in cache (replay mode): {url}")
+                return self._cached_text(entry, limits)
+            if entry is not None:
+                if self.cache.is_fresh(entry):
+                    return self._cached_text(entry, limits)
+                if entry.etag:
+                    request_headers['If-None-Match'] = entry.etag
+                if entry.last_modified:
+                    request_headers['If-Modified-Since'] = entry.last_modified
+
+        async def send():
+            return await self._fetch_once(url, timeout, check_status, entry, request_headers, limits)
+
+        if self.guard is None:
+            return await send()
+        return await self.guard.call_async(url, send)
+
+    @staticmethod
+    async def _in_executor(func, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    @staticmethod
+    def _cached_text(entry: CachedEntry, limits: DownloadLimits) -> str:
+        """A cached body, checked and capped like a downloaded one"""
+        content_type = CaseInsensitiveDict(entry.headers).get('Content-Type')
+        check_content_type(content_type, entry.url)
+        reader = BoundedReader(limits, entry.url)
+        reader.feed(entry.body)
+        return decode_html(reader.body(), content_type)
+
+    async def _fetch_once(self, url: str, timeout: int, check_status: bool,
+                          entry: Optional[CachedEntry], request_headers: dict,
+                          limits: DownloadLimits) -> str:
+        """One rate-limited network attempt for _fetch"""
+        if self.control is not None:
+            await self.control.checkpoint_async()
+        if self.limiter.respect_robots:
+            await asyncio.get_running_loop().run_in_executor(None, self.limiter.load_robots, url)
+        delay = self.limiter.reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        async with self._semaphore:
+            client_timeout = aiohttp.ClientTimeout(total=timeout, sock_connect=5)
+            async with self.session.get(url, headers=request_headers,
+                                        timeout=client_timeout) as response:
+                self.limiter.feedback(url, response.status, response.headers)
+                if response.status == 304 and entry is not None:
+                    await self._in_executor(self.cache.refresh, url, dict(response.headers))
+                    return self._cached_text(entry, limits)
+                if check_status:
+                    response.raise_for_status()
+                content_type = response.headers.get('Content-Type')
+                check_content_type(content_type, url)
+
+                # Stream the body so oversized pages stop at the download limits
+                reader = BoundedReader(limits, url)
+                async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                    if reader.feed(chunk):
+                        break
+                body = reader.body()
+                if self.cache and response.status == 200 and not reader.truncated:
+                    await self._in_executor(self.cache.store, url, response.status,
+                                            dict(response.headers), body)
+                return decode_html(body, content_type)
+
+    async def scrape_college(self, url: str, college_name: str = "", state: str = "") -> Optional[CollegeInfo]:
+        """
+        Scrape a college website for information
+
+        Args:
+            url: College website URL
+            college_name: College name from search (optional)
+            state: State name for location context
+
+        Returns:
+            CollegeInfo object or None if scraping fails
+        """
+        if self.session is None:
+            await self.open()
+
+        start = time.perf_counter()
+        try:
+            logger.info("Scraping: %s", url, extra={'url': url, 'stage': 'scrape'})
+
+            with METRICS.timer('scrape.fetch'):
+                html = await self._fetch(url, timeout=15)
+            college, page = self._build_college(html, url, college_name, state)
+
+            # Look for specific contact pages
+            with METRICS.timer('scrape.contact'):
+                await self._scrape_contact_page(page, url, college)
+
+            duration = time.perf_counter() - start
+            METRICS.observe('scrape', duration)
+            METRICS.inc('scrape_ok')
+            logger.info("Successfully scraped: %s", college.name,
+                        extra={'url': url, 'stage': 'scrape', 'duration': duration})
+            return college
+
+        except CrawlCancelled:
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError, CacheMissError, UnsupportedContentError) as e:
+            METRICS.inc('scrape_failed')
+            logger.error("Failed to fetch %s (%s): %s", url, classify_failure(e), e,
+                         extra={'url': url, 'stage': 'scrape', 'status': getattr(e, 'status', None),
+                                'duration': time.perf_counter() - start})
+            return None
+        except Exception as e:
+            METRICS.inc('scrape_failed')
+            logger.error("Error scraping %s: %s", url, e,
+                         extra={'url': url, 'stage': 'scrape', 'duration': time.perf_counter() - start})
+            return None
+
+    async def _fetch_contact_page(self, url: str) -> str:
+        """Fetch one candidate contact page"""
+        logger.debug("Fetching contact page: %s", url, extra={'url': url, 'stage': 'contact'})
+        return await self._fetch(url, timeout=10, check_status=False,
+                                 limits=self.limits.body_only())
+
+    async def _scrape_contact_page(self, page: ParsedPage, base_url: str, college: CollegeInfo):
+        """Fetch the best-ranked contact pages concurrently until every contact field is filled"""
+        if not missing_contact_fields(college):
+            return
+
+        urls = self._contact_urls(page, base_url)
+        if not urls:
+            return
+
+        tasks = {asyncio.ensure_future(self._fetch_contact_page(url)): url for url in urls}
+        try:
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    try:
+                        self._apply_contact_page(task.result(), college)
+                    except Exception as e:
+                        logger.debug("Could not scrape contact page %s: %s", tasks[task], e,
+                                     extra={'url': tasks[task], 'stage': 'contact'})
+
+                if not missing_contact_fields(college):
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def scrape_many(self, targets: List[Tuple[str, str]], state: str = "",
+                          progress: Optional[CrawlProgress] = None) -> AsyncIterator[ScrapeResult]:
+        """
+        Scrape many (college_name, url) targets concurrently
+
+        Args:
+            targets: List of tuples (college_name, url)
+            state: State name for location context
+            progress: Told when each target starts and finishes (optional)
+
+        Returns:
+            Async iterator of ScrapeResult objects in completion order
+        """
+        async def scrape_one(index: int, college_name: str, url: str) -> ScrapeResult:
+            result = ScrapeResult(index=index, college_name=college_name, url=url)
+            if progress:
+                progress.started(url)
+            try:
+                result.college = await self.scrape_college(url, college_name, state)
+            except CrawlCancelled:
+                raise
+            except Exception as e:
+                logger.error("Error scraping %s: %s", url, e, extra={'url': url, 'stage': 'scrape'})
+                result.error = e
+            finally:
+                if progress:
+                    progress.finished(url, ok=result.college is not None)
+            return result
+
+        tasks = [
+            asyncio.ensure_future(scrape_one(idx, college_name, url))
+            for idx, (college_name, url) in enumerate(targets, 1)
+        ]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+class AsyncScrapeEngine(ScrapeEngine):
+    """Run AsyncCollegeScraper on a background event loop behind the ScrapeEngine interface"""
+
+    def __init__(self, max_concurrency: int = 100, per_host_limit: int = 4,
+                 per_host_delay: float = 1.0, cache: Optional[ResponseCache] = None,
+                 limiter: Optional[HostRateLimiter] = None, guard: Optional[FetchGuard] = None,
+                 limits: Optional[DownloadLimits] = None, contact_pages: int = 3,
+                 resolver: Optional[AbstractResolver] = None):
+        self.cache = cache
+        self.resolver = resolver
+        self.limiter = limiter
+        self.contact_pages = contact_pages
+        self.guard = guard
+        self.limits = limits
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+        self.per_host_delay = per_host_delay
+
+    @staticmethod
+    async def _cancel_on(control: CrawlControl, task: asyncio.Task, poll: float = 0.1):
+        """Cancel task, aborting its open requests, once the crawl is cancelled"""
+        while not control.cancelled:
+            await asyncio.sleep(poll)
+        task.cancel()
+
+    async def _run(self, targets: List[Tuple[str, str]], state: str, results: queue.Queue,
+                   progress: Optional[CrawlProgress] = None,
+                   control: Optional[CrawlControl] = None):
+        scraper = AsyncCollegeScraper(self.max_concurrency, self.per_host_limit,
+                                      self.per_host_delay, cache=self.cache,
+                                      limiter=self.limiter, guard=self.guard, limits=self.limits,
+                                      contact_pages=self.contact_pages, control=control,
+                                      resolver=self.resolver)
+        watcher = None
+        if control is not None:
+            watcher = asyncio.ensure_future(self._cancel_on(control, asyncio.current_task()))
+        try:
+            async with scraper:
+                async for result in scraper.scrape_many(targets, state, progress):
+                    results.put(result)
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+
+    def scrape_all(self, targets: Iterable[Tuple[str, str]], state: str = "",
+                   on_result: Callable[[ScrapeResult], None] = None,
+                   progress: Optional[CrawlProgress] = None,
+                   control: Optional[CrawlControl] = None) -> Iterator[ScrapeResult]:
+        # The event loop schedules every target up front, so a streaming source is drained first
+        targets = list(targets)
+        if not targets:
+            return
+
+        logger.info("Scraping %d websites on one event loop", len(targets), extra={'stage': 'scrape'})
+
+        results: queue.Queue = queue.Queue()
+        done = object()
+
+        def run_loop():
+            try:
+                asyncio.run(self._run(targets, state, results, progress, control))
+            except (asyncio.CancelledError, CrawlCancelled):
+                logger.info("Async scrape cancelled")
+            except Exception as e:
+                logger.error("Async scrape failed: %s", e, extra={'stage': 'scrape'})
+            finally:
+                results.put(done)
+
+        thread = threading.Thread(target=run_loop, name='async-scraper', daemon=True)
+        thread.start()
+
+        while True:
+            result = results.get()
+            if result is done:
+                break
+            if on_result:
+                on_result(result)
+            yield result
+
+        thread.join()
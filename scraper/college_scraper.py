@@ -2,121 +2,106 @@
 College website scraper to extract information
 """
 
-import requests
-from bs4 import BeautifulSoup
-from typing import Optional
 import time
+import requests
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import List, Optional
 from data.college_data import CollegeInfo
+from scraper.crawl_control import CrawlCancelled
+from scraper.contact_frontier import ContactFrontier, missing_contact_fields
 from scraper.data_extractor import DataExtractor
+from scraper.download import DownloadLimits
+from scraper.http_client import HttpClient
+from scraper.retry import classify_failure
+from scraper.page_parser import ParsedPage, parse_page
 from utils.logger import setup_logger
+from utils.metrics import METRICS
 
 logger = setup_logger('college_scraper')
 
-class CollegeScraper:
-    """Scrape college websites for information"""
+class CollegePageParser:
+    """Turn fetched college pages into CollegeInfo objects"""
     
-    def __init__(self):
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        self.session = requests.Session()
+    def __init__(self, fast_parse: bool = True, contact_pages: int = 3):
         self.extractor = DataExtractor()
+        self.fast_parse = fast_parse
+        # Extra pages per site searched for missing contact details
+        self.contact_pages = max(0, contact_pages)
     
-    def scrape_college(self, url: str, college_name: str = "", state: str = "") -> Optional[CollegeInfo]:
+    def _build_college(self, html: str, url: str, college_name: str, state: str):
         """
-        Scrape a college website for information
+        Parse a college homepage into a CollegeInfo object
         
         Args:
+            html: Homepage HTML
             url: College website URL
             college_name: College name from search (optional)
             state: State name for location context
             
         Returns:
-            CollegeInfo object or None if scraping fails
+            Tuple of (CollegeInfo, parsed page)
         """
-        try:
-            logger.info(f"Scraping: {url}")
-            
-            # Fetch webpage
-            response = self.session.get(url, headers=self.headers, timeout=15)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Extract text content
-            text_content = soup.get_text(separator=' ', strip=True)
-            
-            # Create college info object
-            college = CollegeInfo()
-            college.website = url
-            
-            # Extract college name
-            college.name = self._extract_college_name(soup, college_name)
-            
-            # Extract emails
-            emails = self.extractor.extract_emails(text_content)
-            if emails:
-                college.email = emails[0]  # Primary email
-            
-            # Extract phone numbers
-            phones = self.extractor.extract_phone_numbers(text_content)
-            if phones:
-                college.admin_contact = phones[0]  # Primary contact
-                if len(phones) > 1:
-                    college.other_contacts = phones[1:5]  # Additional contacts
-            
-            # Extract branches
-            college.branches = self.extractor.extract_branches(text_content)
-            
-            # Extract location
-            college.location = self._extract_location(soup, text_content, state)
-            
-            # Try to determine college type
-            college.college_type = self._determine_college_type(text_content)
-            
-            # Try to find university affiliation
-            college.university = self._extract_university(text_content)
-            
-            # Look for specific contact pages
-            self._scrape_contact_page(soup, url, college)
-            
-            logger.info(f"Successfully scraped: {college.name}")
-            return college
-            
-        except requests.RequestException as e:
-            logger.error(f"Failed to fetch {url}: {e}")
-            return None
-        except Exception as e:
-            logger.error(f"Error scraping {url}: {e}")
-            return None
+        # Collect text, title, h1, address and links in one parse
+        with METRICS.timer('scrape.parse'):
+            page = parse_page(html, fast=self.fast_parse)
+        text_content = page.text
+        extract_start = time.perf_counter()
+        
+        # Create college info object
+        college = CollegeInfo()
+        college.website = url
+        college.state = state
+        
+        # Extract college name
+        college.name = self._extract_college_name(page, college_name)
+        
+        # Emails, phones, branches, type and affiliation in one scan
+        extracted = self.extractor.scan(text_content)
+        
+        if extracted.emails:
+            college.email = extracted.emails[0]  # Primary email
+        
+        phones = extracted.phones
+        if phones:
+            college.admin_contact = phones[0]  # Primary contact
+            if len(phones) > 1:
+                college.other_contacts = phones[1:5]  # Additional contacts
+        
+        college.hod_contact = self.extractor.extract_hod_contact(text_content)
+        
+        college.branches = extracted.branches
+        
+        # Extract location
+        college.location = self._extract_location(page, text_content, state)
+        
+        college.college_type = extracted.college_type
+        college.university = extracted.university
+        
+        METRICS.observe('scrape.extract', time.perf_counter() - extract_start)
+        return college, page
     
-    def _extract_college_name(self, soup: BeautifulSoup, fallback_name: str) -> str:
+    def _extract_college_name(self, page: ParsedPage, fallback_name: str) -> str:
         """Extract college name from webpage"""
         # Try title tag
-        title = soup.find('title')
-        if title:
-            title_text = title.get_text().strip()
+        if page.title:
+            title_text = page.title
             # Clean up title
             title_text = title_text.split('|')[0].split('-')[0].strip()
             if len(title_text) > 5:
                 return self.extractor.clean_college_name(title_text)
         
         # Try h1 tag
-        h1 = soup.find('h1')
-        if h1:
-            h1_text = h1.get_text().strip()
-            if len(h1_text) > 5:
-                return self.extractor.clean_college_name(h1_text)
+        if len(page.h1) > 5:
+            return self.extractor.clean_college_name(page.h1)
         
         # Fallback to search result name
         return self.extractor.clean_college_name(fallback_name) if fallback_name else "Unknown College"
     
-    def _extract_location(self, soup: BeautifulSoup, text: str, state: str) -> str:
+    def _extract_location(self, page: ParsedPage, text: str, state: str) -> str:
         """Extract location information"""
         # Look for address tags
-        address = soup.find('address')
-        if address:
-            return address.get_text(strip=True)
+        if page.address:
+            return page.address
         
         # Look for common location patterns
         location = self.extractor.extract_location(text, state)
@@ -125,77 +110,134 @@ class CollegeScraper:
         
         return state  # Fallback to state name
     
-    def _determine_college_type(self, text: str) -> str:
-        """Determine if college is Government or Private"""
-        text_lower = text.lower()
+    def _contact_urls(self, page: ParsedPage, base_url: str) -> List[str]:
+        """Rank the homepage's contact, admissions, department and about links"""
+        return ContactFrontier(base_url, self.contact_pages).rank(page.links)
+    
+    def _apply_contact_page(self, html: str, college: CollegeInfo):
+        """Fill missing contact details from a contact page"""
+        contact_text = parse_page(html, fast=self.fast_parse).text
         
-        gov_keywords = ['government', 'govt', 'state government', 'central government', 'public college']
-        private_keywords = ['private', 'autonomous', 'self-financed']
+        # Extract additional emails and phones
+        extracted = self.extractor.scan(contact_text)
+        additional_emails = extracted.emails
+        additional_phones = extracted.phones
         
-        # Check for government keywords
-        if any(keyword in text_lower for keyword in gov_keywords):
-            return "Government"
+        # Update college info if we found more data
+        if not college.email and additional_emails:
+            college.email = additional_emails[0]
         
-        # Check for private keywords
-        if any(keyword in text_lower for keyword in private_keywords):
-            return "Private"
+        if not college.admin_contact and additional_phones:
+            college.admin_contact = additional_phones[0]
         
-        return "Unknown"
+        if not college.hod_contact:
+            college.hod_contact = self.extractor.extract_hod_contact(contact_text)
+
+
+class CollegeScraper(CollegePageParser):
+    """Scrape college websites for information"""
+    
+    def __init__(self, client: Optional[HttpClient] = None, fast_parse: bool = True,
+                 limits: Optional[DownloadLimits] = None, contact_pages: int = 3,
+                 contact_workers: int = 8):
+        super().__init__(fast_parse, contact_pages)
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        }
+        # Pooled session shared with the searcher when a client is passed in
+        self.client = client or HttpClient()
+        self.session = self.client.session
+        # Pages are streamed and cut off at these limits
+        self.limits = limits or DownloadLimits()
+        # Contact pages of every site being scraped share one pool
+        self._contact_executor = ThreadPoolExecutor(max_workers=max(1, contact_workers),
+                                                    thread_name_prefix='contact')
     
-    def _extract_university(self, text: str) -> str:
-        """Extract university affiliation"""
-        # Look for university mentions
-        import re
-        university_pattern = r'affiliated (?:to|with) ([^.,]+university[^.,]*)'
-        match = re.search(university_pattern, text, re.IGNORECASE)
+    def close(self):
+        """Stop the contact page workers (the client is closed by its owner)"""
+        self._contact_executor.shutdown(wait=False)
+    
+    def scrape_college(self, url: str, college_name: str = "", state: str = "") -> Optional[CollegeInfo]:
+        """
+        Scrape a college website for information
         
-        if match:
-            return match.group(1).strip()
+        Args:
+            url: College website URL
+            college_name: College name from search (optional)
+            state: State name for location context
+            
+        Returns:
+            CollegeInfo object or None if scraping fails
+        """
+        start = time.perf_counter()
+        try:
+            logger.info("Scraping: %s", url, extra={'url': url, 'stage': 'scrape'})
+            
+            # Fetch webpage (short connect timeout so unreachable hosts fail fast)
+            with METRICS.timer('scrape.fetch'):
+                html = self.client.get_html(url, self.limits, headers=self.headers, timeout=(5, 15))
+            
+            college, page = self._build_college(html, url, college_name, state)
+            
+            # Look for specific contact pages
+            with METRICS.timer('scrape.contact'):
+                self._scrape_contact_page(page, url, college)
+            
+            duration = time.perf_counter() - start
+            METRICS.observe('scrape', duration)
+            METRICS.inc('scrape_ok')
+            logger.info("Successfully scraped: %s", college.name,
+                        extra={'url': url, 'stage': 'scrape', 'duration': duration})
+            return college
+            
+        except CrawlCancelled:
+            raise
+        except requests.RequestException as e:
+            METRICS.inc('scrape_failed')
+            status = e.response.status_code if e.response is not None else None
+            logger.error("Failed to fetch %s (%s): %s", url, classify_failure(e), e,
+                         extra={'url': url, 'stage': 'scrape', 'status': status,
+                                'duration': time.perf_counter() - start})
+            return None
+        except Exception as e:
+            METRICS.inc('scrape_failed')
+            logger.error("Error scraping %s: %s", url, e,
+                         extra={'url': url, 'stage': 'scrape', 'duration': time.perf_counter() - start})
+            return None
+    
+    def _fetch_contact_page(self, url: str) -> str:
+        """Fetch one candidate contact page"""
+        logger.debug("Fetching contact page: %s", url, extra={'url': url, 'stage': 'contact'})
+        return self.client.get_html(url, self.limits.body_only(), check_status=False,
+                                    headers=self.headers, timeout=(5, 10))
+    
+    def _scrape_contact_page(self, page: ParsedPage, base_url: str, college: CollegeInfo):
+        """Fetch the best-ranked contact pages concurrently until every contact field is filled"""
+        if not missing_contact_fields(college):
+            return
         
-        # Look for autonomous university
-        if 'autonomous' in text.lower():
-            return "Autonomous"
+        urls = self._contact_urls(page, base_url)
+        if not urls:
+            return
         
-        return ""
-    
-    def _scrape_contact_page(self, soup: BeautifulSoup, base_url: str, college: CollegeInfo):
-        """Try to find and scrape contact page for more details"""
+        pending = {self._contact_executor.submit(self._fetch_contact_page, url): url for url in urls}
         try:
-            # Look for contact page link
-            contact_links = soup.find_all('a', href=True)
-            
-            for link in contact_links:
-                link_text = link.get_text().lower()
-                href = link['href']
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url = pending.pop(future)
+                    try:
+                        self._apply_contact_page(future.result(), college)
+                    except CrawlCancelled:
+                        # The site must stay unfinished so a resumed crawl fetches these pages
+                        raise
+                    except Exception as e:
+                        logger.debug("Could not scrape contact page %s: %s", url, e,
+                                     extra={'url': url, 'stage': 'contact'})
                 
-                if 'contact' in link_text or 'contact-us' in href.lower():
-                    # Build full URL
-                    if href.startswith('http'):
-                        contact_url = href
-                    elif href.startswith('/'):
-                        from urllib.parse import urljoin
-                        contact_url = urljoin(base_url, href)
-                    else:
-                        continue
-                    
-                    # Scrape contact page
-                    logger.debug(f"Found contact page: {contact_url}")
-                    response = self.session.get(contact_url, headers=self.headers, timeout=10)
-                    contact_soup = BeautifulSoup(response.text, 'html.parser')
-                    contact_text = contact_soup.get_text(separator=' ', strip=True)
-                    
-                    # Extract additional emails and phones
-                    additional_emails = self.extractor.extract_emails(contact_text)
-                    additional_phones = self.extractor.extract_phone_numbers(contact_text)
-                    
-                    # Update college info if we found more data
-                    if not college.email and additional_emails:
-                        college.email = additional_emails[0]
-                    
-                    if not college.admin_contact and additional_phones:
-                        college.admin_contact = additional_phones[0]
-                    
-                    break  # Only scrape first contact page found
-                    
-        except Exception as e:
-            logger.debug(f"Could not scrape contact page: {e}")
+                if not missing_contact_fields(college):
+                    break
+        finally:
+            # Pages not yet started are dropped once every field is filled
+            for future in pending:
+                future.cancel()
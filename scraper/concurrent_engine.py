@@ -0,0 +1,169 @@
+"""
+Concurrent scraping engine for fetching many college websites at once
+"""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+from data.college_data import CollegeInfo
+from scraper.crawl_control import CrawlCancelled, CrawlControl
+from scraper.progress import CrawlProgress
+from utils.logger import setup_logger
+
+logger = setup_logger('concurrent_engine')
+
+
+@dataclass
+class ScrapeResult:
+    """Outcome of scraping a single search result"""
+    index: int
+    college_name: str
+    url: str
+    college: Optional[CollegeInfo] = None
+    error: Optional[Exception] = None
+
+
+class ScrapeEngine:
+    """Base class for engines that scrape many college websites"""
+
+    def scrape_all(self, targets: Iterable[Tuple[str, str]], state: str = "",
+                   on_result: Callable[[ScrapeResult], None] = None,
+                   progress: Optional[CrawlProgress] = None,
+                   control: Optional[CrawlControl] = None) -> Iterator[ScrapeResult]:
+        """
+        Scrape every (college_name, url) target, yielding results as they finish
+
+        Args:
+            targets: Tuples (college_name, url); may be a generator still producing
+                search results
+            state: State name for location context
+            on_result: Optional callback invoked with each finished result
+            progress: Told when each target starts and finishes (optional)
+            control: Pause and cancel flags; after a cancel the iterator stops
+                promptly, leaving in-flight targets unreported (optional)
+
+        Returns:
+            Iterator of ScrapeResult objects in completion order
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Release workers held between scrape_all calls"""
+
+
+class ThreadedScrapeEngine(ScrapeEngine):
+    """
+    Drive CollegeScraper.scrape_college from a bounded thread pool
+
+    Per-host politeness is applied by the scraper's rate limiter, so workers
+    only wait when they hit the same host, not between unrelated sites.
+    The pool lives as long as the engine and is shared by concurrent
+    scrape_all calls, so max_workers bounds the threads of a whole run.
+    """
+
+    def __init__(self, scraper, max_workers: int = 8):
+        self.scraper = scraper
+        self.max_workers = max(1, max_workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix='scraper')
+            return self._executor
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            # Workers still blocked on a request finish in the background
+            executor.shutdown(wait=False)
+
+    def _scrape_one(self, index: int, college_name: str, url: str, state: str,
+                    progress: Optional[CrawlProgress] = None) -> ScrapeResult:
+        """Scrape one target, capturing any error in the result"""
+        result = ScrapeResult(index=index, college_name=college_name, url=url)
+        if progress:
+            progress.started(url)
+        try:
+            result.college = self.scraper.scrape_college(url, college_name, state)
+        except CrawlCancelled as e:
+            result.error = e
+        except Exception as e:
+            logger.error("Error scraping %s: %s", url, e, extra={'url': url, 'stage': 'scrape'})
+            result.error = e
+        finally:
+            if progress:
+                progress.finished(url, ok=result.college is not None)
+        return result
+
+    def scrape_all(self, targets: Iterable[Tuple[str, str]], state: str = "",
+                   on_result: Callable[[ScrapeResult], None] = None,
+                   progress: Optional[CrawlProgress] = None,
+                   control: Optional[CrawlControl] = None) -> Iterator[ScrapeResult]:
+        logger.info("Scraping websites with %d workers", self.max_workers, extra={'stage': 'scrape'})
+
+        # Finished ScrapeResults, then the number of targets once the source is exhausted
+        results: queue.Queue = queue.Queue()
+        executor = self._pool()
+        pending = set()
+
+        def cancelled() -> bool:
+            return control is not None and control.cancelled
+
+        def done(future):
+            pending.discard(future)
+            if not future.cancelled():
+                results.put(future.result())
+
+        def feed():
+            # Submit targets as the (possibly streaming) source produces them
+            count = 0
+            try:
+                for idx, (college_name, url) in enumerate(targets, 1):
+                    if cancelled():
+                        break
+                    future = executor.submit(self._scrape_one, idx, college_name, url, state, progress)
+                    pending.add(future)
+                    future.add_done_callback(done)
+                    count = idx
+            except CrawlCancelled:
+                pass
+            except Exception as e:
+                # Submitting after close() shut the pool down is expected
+                if not cancelled():
+                    logger.error("Target source failed: %s", e, extra={'stage': 'search'})
+            finally:
+                results.put(count)
+
+        feeder = threading.Thread(target=feed, name='scraper-feed', daemon=True)
+        feeder.start()
+
+        try:
+            finished, total = 0, None
+            while total is None or finished < total:
+                if cancelled():
+                    logger.info("Scrape cancelled after %d websites", finished, extra={'stage': 'scrape'})
+                    return
+                try:
+                    # Short waits so a cancel is noticed even while every worker is blocked
+                    result = results.get(timeout=0.2)
+                except queue.Empty:
+                    continue
+                if isinstance(result, int):
+                    total = result
+                    continue
+                finished += 1
+                if on_result:
+                    on_result(result)
+                yield result
+
+            feeder.join()
+        finally:
+            # Drop this call's queued targets; the pool stays up for other jobs
+            for future in list(pending):
+                future.cancel()
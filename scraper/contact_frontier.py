@@ -0,0 +1,122 @@
+"""
+Per-site crawl frontier that ranks links likely to hold contact details
+"""
+
+import re
+from typing import Iterable, List, Tuple
+from urllib.parse import urldefrag, urljoin, urlparse
+from data.college_data import CollegeInfo
+
+# Link keyword -> score; a link scores the best keyword found in its text or URL path
+LINK_KEYWORDS = (
+    ('contact', 10),
+    ('reach us', 9),
+    ('hod', 8),
+    ('head of department', 8),
+    ('department', 7),
+    ('dept', 7),
+    ('admission', 6),
+    ('directory', 6),
+    ('faculty', 5),
+    ('administration', 5),
+    ('office', 4),
+    ('about', 3),
+)
+# Whole words only, so 'hod' skips "Methodology"; plurals and "contactus"-style paths still match
+KEYWORD_PATTERNS = tuple(
+    (re.compile(rf'\b{re.escape(keyword)}(?:s|us)?\b'), weight) for keyword, weight in LINK_KEYWORDS
+)
+# Text matches count more than URL path matches
+TEXT_WEIGHT = 2
+PATH_WEIGHT = 1
+
+SKIPPED_SCHEMES = ('mailto:', 'tel:', 'javascript:', 'whatsapp:')
+SKIPPED_EXTENSIONS = re.compile(
+    r'\.(?:pdf|docx?|xlsx?|pptx?|zip|rar|jpe?g|png|gif|svg|webp|mp4|mp3|avi)$', re.IGNORECASE
+)
+
+# CollegeInfo fields the contact crawl tries to fill
+CONTACT_FIELDS = ('email', 'admin_contact', 'hod_contact')
+
+
+def missing_contact_fields(college: CollegeInfo) -> List[str]:
+    """Contact fields still empty on a college"""
+    return [attr for attr in CONTACT_FIELDS if not getattr(college, attr)]
+
+
+def _site_host(url: str) -> str:
+    """Host without a leading www. for same-site checks"""
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+class ContactFrontier:
+    """
+    Choose which pages of a college site to visit for contact details
+
+    Links from the homepage are resolved against the page URL (so relative
+    links count), kept only if they stay on the same site, scored by keyword
+    and the best ``max_pages`` are returned.
+    """
+
+    def __init__(self, base_url: str, max_pages: int = 3):
+        """
+        Args:
+            base_url: URL of the page the links came from
+            max_pages: Page budget for the site
+        """
+        self.base_url = base_url
+        self.max_pages = max(0, max_pages)
+        self.site = _site_host(base_url)
+
+    @staticmethod
+    def score(href: str, text: str) -> int:
+        """
+        Score a link by how likely it leads to contact details
+
+        Args:
+            href: Link target
+            text: Link text
+
+        Returns:
+            Score (0 if the link looks irrelevant)
+        """
+        text = ' '.join(text.lower().split())
+        path = urlparse(href).path.lower().replace('-', ' ').replace('_', ' ')
+        best = 0
+        for pattern, weight in KEYWORD_PATTERNS:
+            if pattern.search(text):
+                best = max(best, weight * TEXT_WEIGHT)
+            elif pattern.search(path):
+                best = max(best, weight * PATH_WEIGHT)
+        return best
+
+    def rank(self, links: Iterable[Tuple[str, str]]) -> List[str]:
+        """
+        Pick the pages to fetch, best first
+
+        Args:
+            links: (href, link text) pairs from the homepage
+
+        Returns:
+            Up to max_pages absolute URLs
+        """
+        base = urldefrag(self.base_url)[0]
+        best = {}  # url -> (score, first position)
+        for position, (href, text) in enumerate(links):
+            href = (href or '').strip()
+            if not href or href.startswith('#') or href.lower().startswith(SKIPPED_SCHEMES):
+                continue
+
+            url = urldefrag(urljoin(self.base_url, href))[0]
+            if urlparse(url).scheme not in ('http', 'https'):
+                continue
+            if url == base or _site_host(url) != self.site or SKIPPED_EXTENSIONS.search(urlparse(url).path):
+                continue
+
+            score = self.score(url, text or '')
+            if score and (url not in best or score > best[url][0]):
+                best[url] = (score, best[url][1] if url in best else position)
+
+        ranked = sorted(best, key=lambda url: (-best[url][0], best[url][1]))
+        return ranked[:self.max_pages]
@@ -0,0 +1,118 @@
+"""
+Cooperative cancel and pause/resume shared by the search and scrape components
+"""
+
+import asyncio
+import threading
+from typing import Set
+
+
+class CrawlCancelled(Exception):
+    """
+    Raised inside workers once the crawl has been cancelled
+
+    Deliberately not a requests exception, so retry logic never retries it
+    and it is not counted as a fetch failure.
+    """
+
+
+class CrawlControl:
+    """
+    Cancel and pause flags checked by every request of a crawl
+
+    Workers call checkpoint() before each request and sleep() instead of
+    time.sleep(): a pause blocks them there, a cancel makes both raise
+    CrawlCancelled. Responses being read are tracked so cancel() can close
+    them and abort the download.
+    """
+
+    def __init__(self):
+        self._cancelled = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+        self._responses: Set = set()
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def paused(self) -> bool:
+        return not self._running.is_set() and not self.cancelled
+
+    def cancel(self):
+        """Stop the crawl: wake paused workers, abort open downloads"""
+        self._cancelled.set()
+        self._running.set()
+        with self._lock:
+            responses, self._responses = self._responses, set()
+        for response in responses:
+            try:
+                response.close()
+            except Exception:
+                pass
+
+    def pause(self):
+        """Hold workers at their next checkpoint"""
+        if not self.cancelled:
+            self._running.clear()
+
+    def resume(self):
+        """Release paused workers"""
+        self._running.set()
+
+    def reset(self):
+        """Clear cancel and pause for a new crawl"""
+        with self._lock:
+            self._responses.clear()
+        self._cancelled.clear()
+        self._running.set()
+
+    def checkpoint(self):
+        """
+        Block while paused
+
+        Raises:
+            CrawlCancelled: The crawl has been cancelled
+        """
+        self._running.wait()
+        if self._cancelled.is_set():
+            raise CrawlCancelled("Crawl cancelled")
+
+    def sleep(self, seconds: float):
+        """
+        Sleep that ends early on cancel and extends while paused
+
+        Raises:
+            CrawlCancelled: The crawl was cancelled before or during the sleep
+        """
+        if seconds > 0 and self._cancelled.wait(seconds):
+            raise CrawlCancelled("Crawl cancelled")
+        self.checkpoint()
+
+    async def checkpoint_async(self, poll: float = 0.1):
+        """
+        checkpoint() for coroutines: waits while paused without blocking the event loop
+
+        Raises:
+            CrawlCancelled: The crawl has been cancelled
+        """
+        while not self._running.is_set():
+            await asyncio.sleep(poll)
+        if self._cancelled.is_set():
+            raise CrawlCancelled("Crawl cancelled")
+
+    def track(self, response):
+        """Close this response if the crawl is cancelled while it is being read"""
+        with self._lock:
+            self._responses.add(response)
+        if self.cancelled:
+            self.untrack(response)
+            response.close()
+            raise CrawlCancelled("Crawl cancelled")
+
+    def untrack(self, response):
+        """Stop tracking a response that has been read"""
+        with self._lock:
+            self._responses.discard(response)
@@ -3,7 +3,26 @@ Utilities for extracting specific data patterns from text
 """
 
 import re
-from typing import List, Set
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import List
+
+
+@dataclass
+class ExtractionResult:
+    """Everything DataExtractor.scan finds in one pass over page text"""
+    emails: List[str] = field(default_factory=list)
+    phones: List[str] = field(default_factory=list)
+    branches: List[str] = field(default_factory=list)
+    college_type: str = "Unknown"
+    university: str = ""
+
+
+def _keyword_pattern(keyword: str) -> str:
+    """Word-boundary pattern for a keyword, tolerant of repeated whitespace"""
+    words = [re.escape(word) for word in keyword.split()]
+    return r'\b' + r'\s+'.join(words) + r'\b'
+
 
 class DataExtractor:
     """Extract emails, phone numbers, and other data from text"""
@@ -11,6 +30,159 @@ class DataExtractor:
     # Regex patterns
     EMAIL_PATTERN = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
     PHONE_PATTERN = r'(?:\+91|91)?[-.\s]?(?:\d{5}[-.\s]?\d{5}|\d{4}[-.\s]?\d{6}|\d{3}[-.\s]?\d{7}|\d{10})'
+    AFFILIATION_PATTERN = r'affiliated (?:to|with) ([^.,]+university[^.,]*)'
+    
+    IGNORED_EMAIL_DOMAINS = ('example.com', 'test.com', 'domain.com')
+    
+    # Branch keywords, in the order branches are reported
+    BRANCH_KEYWORDS = {
+        'computer science': 'Computer Science Engineering',
+        'CSE': 'Computer Science Engineering',
+        'information technology': 'Information Technology',
+        'IT': 'Information Technology',
+        'electronics and communication': 'Electronics and Communication Engineering',
+        'ECE': 'Electronics and Communication Engineering',
+        'electrical': 'Electrical Engineering',
+        'EEE': 'Electrical Engineering',
+        'mechanical': 'Mechanical Engineering',
+        'civil': 'Civil Engineering',
+        'chemical': 'Chemical Engineering',
+        'biotechnology': 'Biotechnology',
+        'automobile': 'Automobile Engineering',
+        'aerospace': 'Aerospace Engineering',
+        'instrumentation': 'Instrumentation Engineering',
+        'production': 'Production Engineering',
+        'industrial': 'Industrial Engineering',
+        'mining': 'Mining Engineering',
+        'petroleum': 'Petroleum Engineering',
+        'textile': 'Textile Engineering',
+        'metallurgical': 'Metallurgical Engineering',
+        'marine': 'Marine Engineering'
+    }
+    # Upper-case acronyms only match as upper-case words ("IT", not "it")
+    BRANCH_ACRONYMS = {'CSE', 'IT', 'ECE', 'EEE'}
+    
+    GOV_KEYWORDS = ['government', 'govt', 'state government', 'central government', 'public college']
+    PRIVATE_KEYWORDS = ['private', 'autonomous', 'self-financed']
+    
+    # Phrases that introduce a head of department's details
+    HOD_PATTERN = r'\b(?:H\.?\s?O\.?\s?D\b\.?|Head\s+of\s+(?:the\s+)?Department|Head\s*[,-]\s*Department|Dept\.?\s+Head)'
+    HOD_WINDOW = 200  # characters after the phrase searched for a contact
+    
+    EMAIL_RE = re.compile(EMAIL_PATTERN)
+    AFFILIATION_RE = re.compile(AFFILIATION_PATTERN, re.IGNORECASE)
+    # Contact details (an address may be cut short at its first period) and their label,
+    # removed from the end of a university name
+    TRAILING_CONTACT_RE = re.compile(
+        rf'\s*(?:(?:e-?mail|phone|ph|tel|mobile|contact|fax)\s*[:\-]?\s*)?(?:\S+@|{PHONE_PATTERN}).*$',
+        re.IGNORECASE | re.DOTALL
+    )
+    HOD_RE = re.compile(HOD_PATTERN, re.IGNORECASE)
+    PHONE_RE = re.compile(PHONE_PATTERN)
+    PHONE_SEPARATORS_RE = re.compile(r'[-.\s]')
+    PHONE_PREFIX_RE = re.compile(r'^(\+91|91)')
+    
+    # Keyword alternation: group name -> keyword
+    _KEYWORD_GROUPS = {}
+    _keyword_parts = []
+    for _index, _keyword in enumerate(list(BRANCH_KEYWORDS) + GOV_KEYWORDS + PRIVATE_KEYWORDS):
+        _name = f'k{_index}'
+        _KEYWORD_GROUPS[_name] = _keyword
+        _pattern = _keyword_pattern(_keyword)
+        if _keyword in BRANCH_ACRONYMS:
+            _pattern = f'(?-i:{_pattern})'
+        _keyword_parts.append(f'(?P<{_name}>{_pattern})')
+    KEYWORD_RE = re.compile('|'.join(_keyword_parts), re.IGNORECASE)
+    
+    # One combined scanner for emails, phones and keywords; affiliation phrases
+    # are matched separately so their text is still scanned for contacts
+    SCAN_RE = re.compile(
+        f'(?P<email>{EMAIL_PATTERN})'
+        f'|{KEYWORD_RE.pattern}'
+        f'|(?P<phone>{PHONE_PATTERN})',
+        re.IGNORECASE
+    )
+    del _index, _keyword, _name, _pattern, _keyword_parts
+    
+    @staticmethod
+    def _clean_emails(emails) -> List[str]:
+        """Drop placeholder addresses and duplicates, keeping first-seen order"""
+        filtered = [
+            email for email in emails
+            if not any(x in email.lower() for x in DataExtractor.IGNORED_EMAIL_DOMAINS)
+        ]
+        return list(dict.fromkeys(filtered))
+    
+    @staticmethod
+    def _clean_phones(phones) -> List[str]:
+        """Normalize phone numbers to unique 10-digit strings, keeping first-seen order"""
+        cleaned = []
+        for phone in phones:
+            # Remove spaces, dots, hyphens
+            clean = DataExtractor.PHONE_SEPARATORS_RE.sub('', phone)
+            # Remove +91 or 91 prefix if present
+            clean = DataExtractor.PHONE_PREFIX_RE.sub('', clean)
+            # Only keep 10-digit numbers
+            if len(clean) == 10 and clean.isdigit():
+                cleaned.append(clean)
+        return list(dict.fromkeys(cleaned))
+    
+    @staticmethod
+    def _branches_for(keywords) -> List[str]:
+        """Map matched keywords to branch names in BRANCH_KEYWORDS order"""
+        found = {DataExtractor.BRANCH_KEYWORDS[k] for k in keywords if k in DataExtractor.BRANCH_KEYWORDS}
+        return [
+            branch for branch in dict.fromkeys(DataExtractor.BRANCH_KEYWORDS.values())
+            if branch in found
+        ]
+    
+    @staticmethod
+    def scan(text: str) -> ExtractionResult:
+        """
+        Extract emails, phones, branches, college type and university in one pass
+        
+        Args:
+            text: Text to search
+            
+        Returns:
+            ExtractionResult with everything found
+        """
+        result = ExtractionResult()
+        if not text:
+            return result
+        
+        emails = []
+        phones = []
+        keywords = set()
+        
+        for match in DataExtractor.SCAN_RE.finditer(text):
+            kind = match.lastgroup
+            if kind == 'email':
+                emails.append(match.group())
+            elif kind == 'phone':
+                phones.append(match.group())
+            else:
+                keywords.add(DataExtractor._KEYWORD_GROUPS[kind])
+        
+        affiliation = DataExtractor.AFFILIATION_RE.search(text)
+        if affiliation:
+            # The phrase runs to the next period, so drop any contact details it swallowed
+            university = DataExtractor.TRAILING_CONTACT_RE.sub('', affiliation.group(1))
+            result.university = university.strip()
+        
+        result.emails = DataExtractor._clean_emails(emails)
+        result.phones = DataExtractor._clean_phones(phones)
+        result.branches = DataExtractor._branches_for(keywords)
+        
+        if keywords.intersection(DataExtractor.GOV_KEYWORDS):
+            result.college_type = "Government"
+        elif keywords.intersection(DataExtractor.PRIVATE_KEYWORDS):
+            result.college_type = "Private"
+        
+        if not result.university and 'autonomous' in keywords:
+            result.university = "Autonomous"
+        
+        return result
     
     @staticmethod
     def extract_emails(text: str) -> List[str]:
@@ -26,13 +198,7 @@ class DataExtractor:
         if not text:
             return []
         
-        emails = re.findall(DataExtractor.EMAIL_PATTERN, text)
-        # Filter out common non-contact emails
-        filtered = [
-            email for email in emails 
-            if not any(x in email.lower() for x in ['example.com', 'test.com', 'domain.com'])
-        ]
-        return list(set(filtered))
+        return DataExtractor._clean_emails(DataExtractor.EMAIL_RE.findall(text))
     
     @staticmethod
     def extract_phone_numbers(text: str) -> List[str]:
@@ -48,19 +214,33 @@ class DataExtractor:
         if not text:
             return []
         
-        phones = re.findall(DataExtractor.PHONE_PATTERN, text)
-        # Clean and format phone numbers
-        cleaned = []
-        for phone in phones:
-            # Remove spaces, dots, hyphens
-            clean = re.sub(r'[-.\s]', '', phone)
-            # Remove +91 or 91 prefix if present
-            clean = re.sub(r'^(\+91|91)', '', clean)
-            # Only keep 10-digit numbers
-            if len(clean) == 10 and clean.isdigit():
-                cleaned.append(clean)
+        return DataExtractor._clean_phones(DataExtractor.PHONE_RE.findall(text))
+    
+    @staticmethod
+    def extract_hod_contact(text: str) -> str:
+        """
+        Extract the contact listed next to a head of department
+        
+        Args:
+            text: Text to search
+            
+        Returns:
+            First phone number (or else email) shortly after an "HOD" /
+            "Head of Department" mention, or an empty string
+        """
+        if not text:
+            return ""
         
-        return list(set(cleaned))
+        for match in DataExtractor.HOD_RE.finditer(text):
+            window = text[match.end():match.end() + DataExtractor.HOD_WINDOW]
+            phones = DataExtractor._clean_phones(DataExtractor.PHONE_RE.findall(window))
+            if phones:
+                return phones[0]
+            emails = DataExtractor._clean_emails(DataExtractor.EMAIL_RE.findall(window))
+            if emails:
+                return emails[0]
+        
+        return ""
     
     @staticmethod
     def extract_branches(text: str) -> List[str]:
@@ -76,40 +256,11 @@ class DataExtractor:
         if not text:
             return []
         
-        text_lower = text.lower()
-        branches = []
-        
-        # Common branch keywords
-        branch_keywords = {
-            'computer science': 'Computer Science Engineering',
-            'cse': 'Computer Science Engineering',
-            'information technology': 'Information Technology',
-            'it': 'Information Technology',
-            'electronics and communication': 'Electronics and Communication Engineering',
-            'ece': 'Electronics and Communication Engineering',
-            'electrical': 'Electrical Engineering',
-            'eee': 'Electrical Engineering',
-            'mechanical': 'Mechanical Engineering',
-            'civil': 'Civil Engineering',
-            'chemical': 'Chemical Engineering',
-            'biotechnology': 'Biotechnology',
-            'automobile': 'Automobile Engineering',
-            'aerospace': 'Aerospace Engineering',
-            'instrumentation': 'Instrumentation Engineering',
-            'production': 'Production Engineering',
-            'industrial': 'Industrial Engineering',
-            'mining': 'Mining Engineering',
-            'petroleum': 'Petroleum Engineering',
-            'textile': 'Textile Engineering',
-            'metallurgical': 'Metallurgical Engineering',
-            'marine': 'Marine Engineering'
+        keywords = {
+            DataExtractor._KEYWORD_GROUPS[match.lastgroup]
+            for match in DataExtractor.KEYWORD_RE.finditer(text)
         }
-        
-        for keyword, branch_name in branch_keywords.items():
-            if keyword in text_lower and branch_name not in branches:
-                branches.append(branch_name)
-        
-        return branches
+        return DataExtractor._branches_for(keywords)
     
     @staticmethod
     def clean_college_name(name: str) -> str:
@@ -148,16 +299,21 @@ class DataExtractor:
         if not text:
             return ""
         
+        for pattern in DataExtractor._location_patterns(state):
+            match = pattern.search(text)
+            if match:
+                return match.group(1).strip()
+        
+        return ""
+    
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _location_patterns(state: str) -> tuple:
+        """Compiled address patterns for a state"""
         # Look for common address patterns
         # This is a simplified version - could be enhanced
         location_patterns = [
             r'(?:located in|address:|location:)\s*([^.]+)',
             r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*,\s*' + re.escape(state) + r')',
         ]
-        
-        for pattern in location_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(1).strip()
-        
-        return ""
+        return tuple(re.compile(pattern, re.IGNORECASE) for pattern in location_patterns)
@@ -0,0 +1,195 @@
+"""
+Bounded, streamed page downloads with content-type sniffing
+"""
+
+import codecs
+import re
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+import requests
+from utils.logger import setup_logger
+
+logger = setup_logger('download')
+
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml', 'text/plain')
+
+# Leading bytes of common files that are never college pages
+BINARY_SIGNATURES = (
+    b'%PDF', b'\x89PNG', b'\xff\xd8\xff', b'GIF8', b'PK\x03\x04', b'\xd0\xcf\x11\xe0',
+    b'\x1f\x8b', b'RIFF', b'ID3',
+)
+
+HEAD_END_RE = re.compile(rb'</head\s*>', re.IGNORECASE)
+META_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([\w-]+)', re.IGNORECASE)
+CHARSET_RE = re.compile(r'charset\s*=\s*["\']?([\w-]+)', re.IGNORECASE)
+
+CHUNK_SIZE = 16 * 1024
+
+
+class UnsupportedContentError(requests.RequestException):
+    """Raised when a URL serves something other than an HTML page"""
+
+
+@dataclass
+class DownloadLimits:
+    """How much of a page to download"""
+    max_bytes: int = 2 * 1024 * 1024  # stop reading after this many (decoded) bytes
+    head_budget: Optional[int] = None  # if set, stop this many bytes after </head>
+    
+    def body_only(self) -> 'DownloadLimits':
+        """Same byte cap without the early stop after </head>"""
+        return DownloadLimits(self.max_bytes)
+
+
+def check_content_type(content_type: Optional[str], url: str = ""):
+    """
+    Reject responses whose declared type is not HTML
+    
+    Args:
+        content_type: Content-Type header (missing headers are allowed)
+        url: URL for the error message
+    
+    Raises:
+        UnsupportedContentError: The type is declared and is not HTML
+    """
+    if not content_type:
+        return
+    media_type = content_type.split(';', 1)[0].strip().lower()
+    if media_type and media_type not in HTML_CONTENT_TYPES:
+        raise UnsupportedContentError(f"Not an HTML page ({media_type}): {url}")
+
+
+def sniff_content(prefix: bytes, url: str = ""):
+    """
+    Reject bodies that start like a binary file, whatever the headers claim
+    
+    Args:
+        prefix: First bytes of the body
+        url: URL for the error message
+    
+    Raises:
+        UnsupportedContentError: The body looks like a PDF, image, archive, ...
+    """
+    start = prefix.lstrip()[:8]
+    if any(start.startswith(signature) for signature in BINARY_SIGNATURES):
+        raise UnsupportedContentError(f"Not an HTML page (binary content): {url}")
+
+
+def decode_html(body: bytes, content_type: Optional[str]) -> str:
+    """
+    Decode a page using the header charset, a <meta> charset, a UTF-16 BOM, then UTF-8
+    
+    Args:
+        body: Raw page bytes (may be truncated)
+        content_type: Content-Type header
+    
+    Returns:
+        Page text
+    """
+    encoding = None
+    if content_type:
+        match = CHARSET_RE.search(content_type)
+        if match:
+            encoding = match.group(1)
+    if not encoding:
+        match = META_CHARSET_RE.search(body[:4096])
+        if match:
+            encoding = match.group(1).decode('ascii', errors='ignore')
+    if not encoding and body[:2] in (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE):
+        encoding = 'utf-16'
+    try:
+        return body.decode(encoding or 'utf-8', errors='replace')
+    except LookupError:
+        return body.decode('utf-8', errors='replace')
+
+
+class BoundedReader:
+    """Collect body chunks until the byte cap or the </head> budget is reached"""
+    
+    def __init__(self, limits: DownloadLimits, url: str = ""):
+        self.limits = limits
+        self.url = url
+        self.parts = []
+        self.size = 0
+        self.stop_at = limits.max_bytes
+        self.truncated = False
+        self._sniffed = False
+        self._head_found = limits.head_budget is None
+        self._tail = b''
+    
+    def feed(self, chunk: bytes) -> bool:
+        """
+        Add a chunk
+        
+        Returns:
+            True once bytes beyond the limit have been read and the download should stop
+        """
+        if not chunk:
+            return False
+        if not self._sniffed:
+            sniff_content(chunk, self.url)
+            self._sniffed = True
+        
+        if not self._head_found:
+            # Keep the end of the previous chunk so a tag split across chunks is found
+            window = self._tail + chunk
+            match = HEAD_END_RE.search(window)
+            if match:
+                self._head_found = True
+                head_end = self.size - len(self._tail) + match.end()
+                self.stop_at = min(self.stop_at, head_end + self.limits.head_budget)
+            self._tail = window[-16:]
+        
+        self.parts.append(chunk)
+        self.size += len(chunk)
+        # A body ending exactly at the limit is complete; only a byte past it proves otherwise
+        if self.size > self.stop_at:
+            self.truncated = True
+            return True
+        return False
+    
+    def body(self) -> bytes:
+        """Bytes read so far, cut at the limit"""
+        return b''.join(self.parts)[:self.stop_at]
+
+
+def read_html(response: requests.Response, limits: DownloadLimits,
+              on_bytes: Optional[Callable[[int], None]] = None) -> Tuple[str, bool]:
+    """
+    Read a streamed response within the download limits
+    
+    Args:
+        response: Response from a request made with stream=True
+        limits: Byte cap and optional </head> budget
+        on_bytes: Called with the number of bytes read (optional)
+    
+    Returns:
+        Tuple of (page text, complete) where complete is False if reading stopped early
+    
+    Raises:
+        UnsupportedContentError: The response is not an HTML page
+    """
+    url = response.url
+    try:
+        content_type = response.headers.get('Content-Type')
+        check_content_type(content_type, url)
+        
+        reader = BoundedReader(limits, url)
+        for chunk in response.iter_content(CHUNK_SIZE):
+            if reader.feed(chunk):
+                break
+        body = reader.body()
+    finally:
+        response.close()
+    if on_bytes:
+        on_bytes(reader.size)
+    
+    if reader.truncated:
+        logger.debug("Stopped reading %s after %d bytes", url, len(body),
+                     extra={'url': url, 'stage': 'download', 'bytes': len(body)})
+    else:
+        # Only complete bodies go into the response cache
+        store = getattr(response, 'store_in_cache', None)
+        if store:
+            store(body)
+    return decode_html(body, content_type), not reader.truncated
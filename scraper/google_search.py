@@ -2,22 +2,27 @@
 Google search functionality for finding college websites
 """
 
+import time
 import requests
 from bs4 import BeautifulSoup
-from typing import List, Tuple
-import time
+from typing import Iterator, List, Optional, Tuple
+from scraper.http_client import HttpClient
+from scraper.query_expansion import build_query
 from utils.logger import setup_logger
+from utils.metrics import METRICS
 
 logger = setup_logger('google_search')
 
 class GoogleSearcher:
     """Search Google for college websites"""
     
-    def __init__(self):
+    def __init__(self, client: Optional[HttpClient] = None):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
-        self.session = requests.Session()
+        # Pooled session shared with the scraper when a client is passed in
+        self.client = client or HttpClient()
+        self.session = self.client.session
     
     def search_colleges(self, state: str, branch: str, college_type: str = "All Types", max_results: int = 20) -> List[Tuple[str, str]]:
         """
@@ -37,16 +42,19 @@ class GoogleSearcher:
         try:
             # Construct search query
             query = self._build_query(state, branch, college_type)
-            logger.info(f"Searching for: {query}")
+            logger.info("Searching for: %s", query, extra={'stage': 'search'})
             
             # Perform search
             search_url = f"https://www.google.com/search?q={requests.utils.quote(query)}&num={max_results}"
             
-            response = self.session.get(search_url, headers=self.headers, timeout=10)
-            response.raise_for_status()
+            with METRICS.timer('search.fetch'):
+                response = self.session.get(search_url, headers=self.headers, timeout=(5, 10))
+                response.raise_for_status()
+                html = response.text
             
             # Parse results
-            soup = BeautifulSoup(response.text, 'html.parser')
+            parse_start = time.perf_counter()
+            soup = BeautifulSoup(html, 'html.parser')
             
             # Find search result links
             search_results = soup.find_all('div', class_='g')
@@ -65,39 +73,44 @@ class GoogleSearcher:
                         # Filter out non-college URLs
                         if self._is_valid_college_url(url, title):
                             results.append((title, url))
-                            logger.debug(f"Found: {title} - {url}")
+                            logger.debug("Found: %s - %s", title, url, extra={'url': url, 'stage': 'search'})
                 
                 except Exception as e:
-                    logger.debug(f"Error parsing result: {e}")
+                    logger.debug("Error parsing result: %s", e, extra={'stage': 'search'})
                     continue
             
-            logger.info(f"Found {len(results)} potential college websites")
+            METRICS.observe('search.parse', time.perf_counter() - parse_start)
+            logger.info("Found %d potential college websites", len(results), extra={'stage': 'search'})
             
         except requests.RequestException as e:
-            logger.error(f"Search request failed: {e}")
+            logger.error("Search request failed: %s", e, extra={'url': search_url, 'stage': 'search'})
         except Exception as e:
-            logger.error(f"Search error: {e}")
+            logger.error("Search error: %s", e, extra={'stage': 'search'})
         
         return results
     
+    def iter_results(self, state: str, branch: str, college_type: str = "All Types",
+                     max_results: int = 20) -> Iterator[Tuple[str, str]]:
+        """
+        Yield search results, trying DuckDuckGo first and Google if it finds nothing
+        
+        Args:
+            state: State name
+            branch: Engineering branch
+            college_type: Type of college
+            max_results: Maximum results
+            
+        Returns:
+            Iterator of tuples (college_name, url)
+        """
+        results = self.search_with_duckduckgo(state, branch, college_type, max_results)
+        if not results:
+            results = self.search_colleges(state, branch, college_type, max_results)
+        yield from results
+    
     def _build_query(self, state: str, branch: str, college_type: str) -> str:
         """Build Google search query"""
-        query_parts = []
-        
-        # Add college type if specified
-        if college_type and college_type != "All Types":
-            query_parts.append(college_type.lower())
-        
-        query_parts.append("engineering college")
-        
-        # Add branch if not "All Branches"
-        if branch and branch != "All Branches":
-            query_parts.append(branch)
-        
-        query_parts.append(state)
-        query_parts.append("contact")
-        
-        return " ".join(query_parts)
+        return build_query(state, branch, college_type)
     
     def _is_valid_college_url(self, url: str, title: str) -> bool:
         """Check if URL is likely a college website"""
@@ -139,15 +152,18 @@ class GoogleSearcher:
         
         try:
             query = self._build_query(state, branch, college_type)
-            logger.info(f"Searching DuckDuckGo for: {query}")
+            logger.info("Searching DuckDuckGo for: %s", query, extra={'stage': 'search'})
             
             # DuckDuckGo HTML search
             search_url = f"https://html.duckduckgo.com/html/?q={requests.utils.quote(query)}"
             
-            response = self.session.get(search_url, headers=self.headers, timeout=10)
-            response.raise_for_status()
+            with METRICS.timer('search.fetch'):
+                response = self.session.get(search_url, headers=self.headers, timeout=(5, 10))
+                response.raise_for_status()
+                html = response.text
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            parse_start = time.perf_counter()
+            soup = BeautifulSoup(html, 'html.parser')
             
             # Find result links
             result_links = soup.find_all('a', class_='result__a')
@@ -159,15 +175,16 @@ class GoogleSearcher:
                     
                     if url and self._is_valid_college_url(url, title):
                         results.append((title, url))
-                        logger.debug(f"Found: {title} - {url}")
+                        logger.debug("Found: %s - %s", title, url, extra={'url': url, 'stage': 'search'})
                 
                 except Exception as e:
-                    logger.debug(f"Error parsing result: {e}")
+                    logger.debug("Error parsing result: %s", e, extra={'stage': 'search'})
                     continue
             
-            logger.info(f"Found {len(results)} potential college websites")
+            METRICS.observe('search.parse', time.perf_counter() - parse_start)
+            logger.info("Found %d potential college websites", len(results), extra={'stage': 'search'})
             
         except Exception as e:
-            logger.error(f"DuckDuckGo search error: {e}")
+            logger.error("DuckDuckGo search error: %s", e, extra={'stage': 'search'})
         
         return results
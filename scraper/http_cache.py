@@ -0,0 +1,289 @@
+"""
+Persistent on-disk HTTP response cache shared by the search and scrape sessions
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+import requests
+from scraper.rate_limiter import HostRateLimiter
+from scraper.retry import FetchGuard, GuardedAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from utils.logger import setup_logger
+
+logger = setup_logger('http_cache')
+
+# Cache hits whose access times are buffered before being written together
+TOUCH_BATCH = 256
+
+
+class CacheMissError(requests.ConnectionError):
+    """Raised in replay mode when a URL is not in the cache"""
+
+
+@dataclass
+class CachedEntry:
+    """A cached HTTP response"""
+    url: str
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    fetched_at: float
+
+    @property
+    def etag(self) -> Optional[str]:
+        return CaseInsensitiveDict(self.headers).get('ETag')
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return CaseInsensitiveDict(self.headers).get('Last-Modified')
+
+    @property
+    def text(self) -> str:
+        """Body decoded with the charset from the stored headers"""
+        encoding = get_encoding_from_headers(CaseInsensitiveDict(self.headers)) or 'utf-8'
+        return self.body.decode(encoding, errors='replace')
+
+
+class ResponseCache:
+    """SQLite-backed response cache with TTL, LRU size bound and revalidation"""
+
+    def __init__(self, path: str = os.path.join('cache', 'http_cache.sqlite'),
+                 ttl: float = 24 * 3600, max_bytes: int = 500 * 1024 * 1024,
+                 replay: bool = False):
+        """
+        Args:
+            path: SQLite file holding the cache
+            ttl: Seconds a response is served without revalidation
+            max_bytes: Total body size kept before least recently used entries are evicted
+            replay: Serve only from cache and never touch the network
+        """
+        cache_dir = os.path.dirname(path)
+        if cache_dir and not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.replay = replay
+        self._lock = threading.Lock()
+        # LRU timestamps of cache hits, written in batches instead of one commit per read
+        self._touched: Dict[str, float] = {}
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            ' url TEXT PRIMARY KEY, status INTEGER, headers TEXT, body BLOB,'
+            ' fetched_at REAL, accessed_at REAL, size INTEGER)'
+        )
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)'
+        )
+        self._conn.commit()
+        self._total_bytes = self._conn.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM responses'
+        ).fetchone()[0]
+
+    def get(self, url: str) -> Optional[CachedEntry]:
+        """
+        Look up a cached response and mark it as recently used
+
+        Args:
+            url: Request URL
+
+        Returns:
+            CachedEntry or None if the URL is not cached
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT status, headers, body, fetched_at FROM responses WHERE url = ?',
+                (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._touched[url] = time.time()
+            if len(self._touched) >= TOUCH_BATCH:
+                self._write_touches()
+                self._conn.commit()
+
+        status, headers, body, fetched_at = row
+        return CachedEntry(url, status, json.loads(headers), body, fetched_at)
+
+    def is_fresh(self, entry: CachedEntry) -> bool:
+        """Check whether an entry is still within its TTL"""
+        return time.time() - entry.fetched_at < self.ttl
+
+    def store(self, url: str, status: int, headers: Dict[str, str], body: bytes):
+        """
+        Store a response, evicting least recently used entries if over the size bound
+
+        Args:
+            url: Request URL
+            status: HTTP status code
+            headers: Response headers
+            body: Raw response body
+        """
+        now = time.time()
+        size = len(body)
+        with self._lock:
+            # Eviction below orders by accessed_at, so pending hits must be written first
+            self._write_touches()
+            old = self._conn.execute(
+                'SELECT size FROM responses WHERE url = ?', (url,)
+            ).fetchone()
+            if old:
+                self._total_bytes -= old[0]
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (url, status, json.dumps(dict(headers)), sqlite3.Binary(body), now, now, size)
+            )
+            self._total_bytes += size
+            self._evict()
+            self._conn.commit()
+
+    def refresh(self, url: str, headers: Dict[str, str] = None):
+        """
+        Mark an entry as revalidated (after a 304 Not Modified)
+
+        Args:
+            url: Request URL
+            headers: Headers from the 304 response to merge into the entry
+        """
+        entry = self.get(url)
+        if entry is None:
+            return
+        merged = CaseInsensitiveDict(entry.headers)
+        for key in ('ETag', 'Last-Modified', 'Cache-Control', 'Expires'):
+            if headers and key in headers:
+                merged[key] = headers[key]
+        with self._lock:
+            self._write_touches()
+            self._conn.execute(
+                'UPDATE responses SET headers = ?, fetched_at = ? WHERE url = ?',
+                (json.dumps(dict(merged)), time.time(), url)
+            )
+            self._conn.commit()
+
+    def flush(self):
+        """Write pending LRU timestamps of cache hits"""
+        with self._lock:
+            if self._touched:
+                self._write_touches()
+                self._conn.commit()
+
+    def _write_touches(self):
+        """Apply pending access times in one statement (lock held; caller commits)"""
+        if self._touched:
+            self._conn.executemany(
+                'UPDATE responses SET accessed_at = ? WHERE url = ?',
+                [(accessed, url) for url, accessed in self._touched.items()]
+            )
+            self._touched = {}
+
+    def _evict(self):
+        """Drop least recently used entries until under max_bytes (lock held)"""
+        while self._total_bytes > self.max_bytes:
+            row = self._conn.execute(
+                'SELECT url, size FROM responses ORDER BY accessed_at LIMIT 1'
+            ).fetchone()
+            if row is None:
+                self._total_bytes = 0
+                break
+            self._conn.execute('DELETE FROM responses WHERE url = ?', (row[0],))
+            self._total_bytes -= row[1]
+            logger.debug("Evicted from cache: %s", row[0], extra={'url': row[0], 'stage': 'cache'})
+
+    def clear(self):
+        """Remove every cached response"""
+        with self._lock:
+            self._touched = {}
+            self._conn.execute('DELETE FROM responses')
+            self._conn.commit()
+            self._total_bytes = 0
+
+    def count(self) -> int:
+        """Get number of cached responses"""
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+    def install(self, session: requests.Session, limiter: Optional[HostRateLimiter] = None,
+                guard: Optional[FetchGuard] = None):
+        """
+        Route a session's HTTP(S) traffic through this cache
+
+        Args:
+            session: requests session to mount the cache adapter on
+            limiter: Rate limiter applied to requests that reach the network (optional)
+            guard: Retry and circuit breaking for requests that reach the network (optional)
+        """
+        adapter = CacheAdapter(self, limiter, guard)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+
+class CacheAdapter(GuardedAdapter):
+    """Transport adapter that serves GET requests from a ResponseCache"""
+
+    def __init__(self, cache: ResponseCache, limiter: Optional[HostRateLimiter] = None,
+                 guard: Optional[FetchGuard] = None, **kwargs):
+        super().__init__(limiter, guard, **kwargs)
+        self.cache = cache
+
+    def send(self, request, **kwargs):
+        if request.method != 'GET':
+            return super().send(request, **kwargs)
+
+        url = request.url
+        entry = self.cache.get(url)
+
+        if self.cache.replay:
+            if entry is None:
+                raise CacheMissError(f"Not in cache (replay mode): {url}", request=request)
+            return self._build_response(request, entry)
+
+        if entry is not None:
+            if self.cache.is_fresh(entry):
+                return self._build_response(request, entry)
+            if entry.etag:
+                request.headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                request.headers['If-Modified-Since'] = entry.last_modified
+
+        response = super().send(request, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            logger.debug("Revalidated: %s", url, extra={'url': url, 'stage': 'cache', 'status': 304})
+            self.cache.refresh(url, response.headers)
+            response.close()
+            return self._build_response(request, entry)
+
+        cache_control = response.headers.get('Cache-Control', '').lower()
+        if response.status_code == 200 and 'no-store' not in cache_control:
+            if kwargs.get('stream'):
+                # The body has not been read yet; the reader stores it if it reads it all
+                status, headers = response.status_code, response.headers
+                response.store_in_cache = lambda body: self.cache.store(url, status, headers, body)
+            else:
+                self.cache.store(url, response.status_code, response.headers, response.content)
+
+        return response
+
+    def _build_response(self, request, entry: CachedEntry) -> requests.Response:
+        """Rebuild a requests.Response from a cache entry"""
+        response = requests.Response()
+        response.status_code = entry.status
+        response.headers = CaseInsensitiveDict(entry.headers)
+        response.headers.pop('Content-Encoding', None)
+        response._content = entry.body
+        response._content_consumed = True
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = entry.url
+        response.reason = 'OK'
+        response.request = request
+        response.connection = self
+        response.from_cache = True
+        return response
@@ -0,0 +1,430 @@
+"""
+Shared, pooled HTTP client used by the search and scrape components
+"""
+
+import io
+import ipaddress
+import socket
+import threading
+import time
+from typing import Dict, Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NameResolutionError
+from urllib3.util.request import ACCEPT_ENCODING
+from scraper.crawl_control import CrawlCancelled, CrawlControl
+from scraper.download import DownloadLimits, read_html
+from scraper.http_cache import CacheAdapter, ResponseCache
+from scraper.rate_limiter import HostRateLimiter
+from scraper.retry import FetchGuard, GuardedAdapter
+from utils.logger import setup_logger
+from utils.metrics import METRICS
+
+try:
+    import httpx
+except ImportError:  # HTTP/2 is optional
+    httpx = None
+
+logger = setup_logger('http_client')
+
+DEFAULT_USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                      '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
+# (connect, read) seconds for robots.txt, which holds up the host's first request
+ROBOTS_TIMEOUT = (3, 5)
+
+# TCP keep-alive on pooled sockets so idle connections to slow sites survive
+KEEPALIVE_SOCKET_OPTIONS = HTTPConnection.default_socket_options + [
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+]
+
+
+class ConnectionStats:
+    """Thread-safe counters for requests, new connections and DNS lookups"""
+    
+    def __init__(self):
+        self.requests = 0
+        self.pooled_requests = 0  # sent through the urllib3 pools (connections are counted there)
+        self.connections = 0
+        self.dns_lookups = 0
+        self.dns_hits = 0
+        self.http2_requests = 0
+        self.bytes_read = 0  # page bytes read by get_html
+        self._lock = threading.Lock()
+    
+    def add(self, name: str, amount: int = 1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+    
+    def snapshot(self) -> Dict[str, float]:
+        """Copy of all counters plus the share of pooled requests sent on a reused connection"""
+        with self._lock:
+            data = {
+                'requests': self.requests,
+                'pooled_requests': self.pooled_requests,
+                'connections': self.connections,
+                'dns_lookups': self.dns_lookups,
+                'dns_hits': self.dns_hits,
+                'http2_requests': self.http2_requests,
+                'bytes_read': self.bytes_read,
+            }
+        pooled = data['pooled_requests']
+        data['reuse_ratio'] = max(0.0, 1 - data['connections'] / pooled) if pooled else 0.0
+        return data
+    
+    def summary(self) -> str:
+        """One-line description for the log"""
+        data = self.snapshot()
+        text = f"{data['requests']} requests"
+        if data['pooled_requests']:
+            text += (f", {data['pooled_requests']} over {data['connections']} pooled connections "
+                     f"({data['reuse_ratio']:.0%} reused), DNS {data['dns_hits']} cached / "
+                     f"{data['dns_lookups']} looked up")
+        if data['http2_requests']:
+            text += f", {data['http2_requests']} over HTTP/2"
+        return text
+
+
+class DnsCache:
+    """Cache resolved addresses for a fixed time so new connections skip the lookup"""
+    
+    def __init__(self, ttl: float = 300.0, stats: Optional[ConnectionStats] = None):
+        """
+        Args:
+            ttl: Seconds a resolved address is reused
+            stats: Counters to update (optional)
+        """
+        self.ttl = ttl
+        self.stats = stats
+        self._entries: Dict[Tuple[str, int], Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+    
+    def resolve(self, host: str, port: int) -> str:
+        """
+        Resolve a host name to one address
+        
+        Args:
+            host: Host name or IP literal
+            port: Port to connect to
+        
+        Returns:
+            IP address as a string
+        
+        Raises:
+            socket.gaierror: The name could not be resolved
+        """
+        try:
+            ipaddress.ip_address(host)
+            return host
+        except ValueError:
+            pass
+        
+        key = (host.lower(), port)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and entry[1] > now:
+            if self.stats:
+                self.stats.add('dns_hits')
+            return entry[0]
+        
+        with METRICS.timer('net.dns'):
+            infos = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+        address = infos[0][4][0]
+        if self.stats:
+            self.stats.add('dns_lookups')
+        with self._lock:
+            self._entries[key] = (address, now + self.ttl)
+        return address
+    
+    def forget(self, host: str, port: int):
+        """Drop a cached address, e.g. after connecting to it failed"""
+        with self._lock:
+            self._entries.pop((host.lower(), port), None)
+
+
+class _PooledConnectionMixin:
+    """Resolve through the client's DnsCache and count each new socket"""
+    
+    dns_cache: Optional[DnsCache] = None
+    stats: Optional[ConnectionStats] = None
+    default_socket_options = KEEPALIVE_SOCKET_OPTIONS
+    
+    def _new_conn(self):
+        if self.dns_cache is None or getattr(self, 'proxy', None):
+            with METRICS.timer('net.connect'):
+                sock = super()._new_conn()
+        else:
+            host, port = self._dns_host, self.port
+            try:
+                self._dns_host = self.dns_cache.resolve(host, port)
+            except socket.gaierror as e:
+                raise NameResolutionError(self.host, self, e) from e
+            try:
+                with METRICS.timer('net.connect'):
+                    sock = super()._new_conn()
+            except Exception:
+                # The address may have moved; look it up again next time
+                self.dns_cache.forget(host, port)
+                raise
+            finally:
+                self._dns_host = host
+        if self.stats:
+            self.stats.add('connections')
+        return sock
+
+
+class _CountingPoolMixin:
+    """Count requests sent through a urllib3 pool and time them to the response headers"""
+    
+    stats: Optional[ConnectionStats] = None
+    
+    def _make_request(self, conn, method, url, *args, **kwargs):
+        if self.stats:
+            self.stats.add('requests')
+            self.stats.add('pooled_requests')
+        # Includes the TLS handshake when the connection is new; the body is read later
+        with METRICS.timer('net.ttfb'):
+            return super()._make_request(conn, method, url, *args, **kwargs)
+
+
+class Http2Mixin(HTTPAdapter):
+    """Send requests over HTTP/2 through an httpx client instead of urllib3"""
+    
+    http2_client = None
+    stats: Optional[ConnectionStats] = None
+    
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            timeout = httpx.Timeout(read, connect=connect)
+        try:
+            response = self.http2_client.request(
+                request.method, request.url, headers=dict(request.headers),
+                content=request.body, timeout=timeout
+            )
+        except httpx.TimeoutException as e:
+            raise requests.Timeout(str(e), request=request) from e
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(str(e), request=request) from e
+        
+        if self.stats:
+            self.stats.add('requests')
+            if response.http_version == 'HTTP/2':
+                self.stats.add('http2_requests')
+        
+        result = requests.Response()
+        result.status_code = response.status_code
+        result.headers = CaseInsensitiveDict(response.headers)
+        # httpx has already decoded the body
+        result.headers.pop('Content-Encoding', None)
+        # HTTP/2 bodies are read in full; download limits only cap what is kept
+        result._content = response.content
+        result._content_consumed = True
+        result.raw = io.BytesIO(result._content)
+        result.encoding = get_encoding_from_headers(result.headers)
+        result.url = str(response.url)
+        result.reason = response.reason_phrase
+        result.elapsed = response.elapsed
+        result.request = request
+        result.connection = self
+        return result
+
+
+class Http2GuardedAdapter(GuardedAdapter, Http2Mixin):
+    """GuardedAdapter whose network sends go over HTTP/2"""
+
+
+class Http2CacheAdapter(CacheAdapter, Http2Mixin):
+    """CacheAdapter whose network sends go over HTTP/2"""
+
+
+class HttpClient:
+    """
+    One pooled session shared by GoogleSearcher and CollegeScraper
+    
+    Connections are kept alive and reused across both components, new
+    connections resolve through a DNS cache, responses are compressed, and
+    the cache, rate limiter and retry guard sit in front of the pool.
+    """
+    
+    def __init__(self, cache: Optional[ResponseCache] = None, limiter: Optional[HostRateLimiter] = None,
+                 guard: Optional[FetchGuard] = None, max_hosts: int = 100,
+                 max_connections_per_host: int = 10, dns_ttl: float = 300.0, http2: bool = False,
+                 control: Optional[CrawlControl] = None):
+        """
+        Args:
+            cache: Response cache (optional)
+            limiter: Per-host rate limiter (optional)
+            guard: Retry and circuit breaking (optional)
+            max_hosts: Hosts whose connection pools are kept open at once
+            max_connections_per_host: Connections kept open to each host
+            dns_ttl: Seconds resolved addresses are reused (0 disables the DNS cache)
+            http2: Use HTTP/2 via httpx when it is installed
+            control: Cancel and pause flags checked before every request (optional)
+        """
+        self.cache = cache
+        self.limiter = limiter
+        self.guard = guard
+        self.max_hosts = max(1, max_hosts)
+        self.max_connections_per_host = max(1, max_connections_per_host)
+        self.stats = ConnectionStats()
+        self.dns_cache = DnsCache(dns_ttl, self.stats) if dns_ttl > 0 else None
+        self._http2_client = self._create_http2_client() if http2 else None
+        
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = DEFAULT_USER_AGENT
+        self.session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+        self.session.headers['Connection'] = 'keep-alive'
+        self.adapter = self._create_adapter()
+        self.adapter.control = control
+        self.session.mount('http://', self.adapter)
+        self.session.mount('https://', self.adapter)
+        if limiter is not None and limiter.robots_fetcher is None:
+            # robots.txt then shares the cache (and replay mode), DNS cache and cancellation
+            limiter.robots_fetcher = self.fetch_robots
+    
+    def _create_http2_client(self):
+        """httpx client for HTTP/2, or None if httpx/h2 are not installed"""
+        if httpx is None:
+            logger.warning("HTTP/2 requested but httpx is not installed; using HTTP/1.1")
+            return None
+        try:
+            return httpx.Client(
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=self.max_hosts * self.max_connections_per_host),
+                follow_redirects=False
+            )
+        except ImportError:
+            logger.warning("HTTP/2 requested but the h2 package is not installed; using HTTP/1.1")
+            return None
+    
+    def _create_adapter(self) -> HTTPAdapter:
+        """Build the transport adapter and swap in the counting, DNS-caching pool classes"""
+        pool_kwargs = {
+            'pool_connections': self.max_hosts,
+            'pool_maxsize': self.max_connections_per_host,
+        }
+        if self._http2_client is not None:
+            if self.cache:
+                adapter = Http2CacheAdapter(self.cache, self.limiter, self.guard, **pool_kwargs)
+            else:
+                adapter = Http2GuardedAdapter(self.limiter, self.guard, **pool_kwargs)
+            adapter.http2_client = self._http2_client
+            adapter.stats = self.stats
+            return adapter
+        
+        if self.cache:
+            adapter = CacheAdapter(self.cache, self.limiter, self.guard, **pool_kwargs)
+        else:
+            adapter = GuardedAdapter(self.limiter, self.guard, **pool_kwargs)
+        
+        attrs = {'dns_cache': self.dns_cache, 'stats': self.stats}
+        http_conn = type('PooledHTTPConnection', (_PooledConnectionMixin, HTTPConnection), attrs)
+        https_conn = type('PooledHTTPSConnection', (_PooledConnectionMixin, HTTPSConnection), attrs)
+        adapter.poolmanager.pool_classes_by_scheme = {
+            'http': type('PooledHTTPConnectionPool', (_CountingPoolMixin, HTTPConnectionPool),
+                         {'ConnectionCls': http_conn, 'stats': self.stats}),
+            'https': type('PooledHTTPSConnectionPool', (_CountingPoolMixin, HTTPSConnectionPool),
+                          {'ConnectionCls': https_conn, 'stats': self.stats}),
+        }
+        return adapter
+    
+    @property
+    def control(self) -> Optional[CrawlControl]:
+        """Cancel and pause flags checked before every request"""
+        return self.adapter.control
+    
+    @control.setter
+    def control(self, control: Optional[CrawlControl]):
+        self.adapter.control = control
+    
+    @property
+    def http2(self) -> bool:
+        """Whether requests go over HTTP/2"""
+        return self._http2_client is not None
+    
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET through the shared session"""
+        return self.session.get(url, **kwargs)
+    
+    def fetch_robots(self, robots_url: str) -> Optional[str]:
+        """robots.txt text for HostRateLimiter, or None if the host has none"""
+        response = self.session.get(robots_url, timeout=ROBOTS_TIMEOUT)
+        try:
+            if response.status_code != 200:
+                return None
+            return response.text
+        finally:
+            response.close()
+    
+    def get_html(self, url: str, limits: Optional[DownloadLimits] = None,
+                 check_status: bool = True, **kwargs) -> str:
+        """
+        Stream an HTML page, stopping at the download limits
+        
+        Args:
+            url: Page URL
+            limits: Byte cap and optional </head> budget (defaults to DownloadLimits())
+            check_status: Raise for 4xx/5xx responses
+            **kwargs: Passed to requests (headers, timeout, ...)
+        
+        Returns:
+            Page text (possibly truncated)
+        
+        Raises:
+            UnsupportedContentError: The URL does not serve HTML
+            requests.RequestException: The request failed
+            CrawlCancelled: The crawl was cancelled during the download
+        """
+        start = time.perf_counter()
+        response = self.session.get(url, stream=True, **kwargs)
+        if check_status:
+            try:
+                response.raise_for_status()
+            except requests.HTTPError:
+                response.close()
+                raise
+        
+        size = 0
+        
+        def on_bytes(count: int):
+            nonlocal size
+            size = count
+            self.stats.add('bytes_read', count)
+            METRICS.inc('bytes_downloaded', count)
+        
+        control = self.control
+        if control is None:
+            with METRICS.timer('net.download'):
+                text, _ = read_html(response, limits or DownloadLimits(), on_bytes=on_bytes)
+        else:
+            # Cancelling closes the response, which aborts the read below
+            control.track(response)
+            try:
+                with METRICS.timer('net.download'):
+                    text, _ = read_html(response, limits or DownloadLimits(), on_bytes=on_bytes)
+            except Exception as e:
+                if control.cancelled:
+                    raise CrawlCancelled("Crawl cancelled") from e
+                raise
+            finally:
+                control.untrack(response)
+            control.checkpoint()
+        
+        logger.debug("Fetched %s", url, extra={
+            'url': url, 'stage': 'fetch', 'status': response.status_code,
+            'bytes': size, 'duration': time.perf_counter() - start,
+        })
+        return text
+    
+    def close(self):
+        """Close pooled connections and write out pending cache bookkeeping"""
+        self.session.close()
+        if self.cache is not None:
+            self.cache.flush()
+        if self._http2_client is not None:
+            self._http2_client.close()
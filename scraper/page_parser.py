@@ -0,0 +1,149 @@
+"""
+Single-pass HTML parsing for college pages
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Tuple
+from bs4 import BeautifulSoup
+
+try:
+    from lxml import etree
+except ImportError:  # pragma: no cover - lxml is in requirements.txt
+    etree = None
+
+# Elements whose contents are not page text
+SKIPPED_TAGS = {'script', 'style', 'template'}
+
+
+@dataclass
+class ParsedPage:
+    """Everything the scraper needs from a page, collected in one parse"""
+    text: str = ""
+    title: str = ""
+    h1: str = ""
+    address: str = ""
+    links: List[Tuple[str, str]] = field(default_factory=list)  # (href, link text)
+
+    @classmethod
+    def from_soup(cls, soup: BeautifulSoup) -> 'ParsedPage':
+        """Build a ParsedPage from an existing BeautifulSoup tree"""
+        title = soup.find('title')
+        h1 = soup.find('h1')
+        address = soup.find('address')
+        return cls(
+            text=soup.get_text(separator=' ', strip=True),
+            title=title.get_text().strip() if title else "",
+            h1=h1.get_text().strip() if h1 else "",
+            address=address.get_text(strip=True) if address else "",
+            links=[(link['href'], link.get_text()) for link in soup.find_all('a', href=True)]
+        )
+
+
+class _PageTarget:
+    """lxml parser target that collects page fields as parse events arrive"""
+
+    def __init__(self):
+        self.strings = []
+        self.pending = []
+        self.skip_depth = 0
+        self.captures = {}  # tag -> text runs seen while the element is open
+        self.depths = {}
+        self.seen = set()
+        self.href = None
+        self.title = ""
+        self.h1 = ""
+        self.address = ""
+        self.links = []
+
+    def _flush(self):
+        """Finish the current text run"""
+        if self.pending:
+            run = ''.join(self.pending)
+            self.pending = []
+            for parts in self.captures.values():
+                parts.append(run)
+            stripped = run.strip()
+            if stripped:
+                self.strings.append(stripped)
+
+    def start(self, tag, attrib):
+        self._flush()
+        tag = tag.lower() if isinstance(tag, str) else ''
+        if tag in SKIPPED_TAGS:
+            self.skip_depth += 1
+            return
+
+        if tag == 'a' and 'a' not in self.captures:
+            self.href = attrib.get('href')
+            if self.href is not None:
+                self.captures['a'] = []
+                self.depths['a'] = 0
+        elif tag in ('title', 'h1', 'address') and tag not in self.seen and tag not in self.captures:
+            self.captures[tag] = []
+            self.depths[tag] = 0
+
+        if tag in self.depths:
+            self.depths[tag] += 1
+
+    def end(self, tag):
+        self._flush()
+        tag = tag.lower() if isinstance(tag, str) else ''
+        if tag in SKIPPED_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+            return
+
+        if tag not in self.depths:
+            return
+        self.depths[tag] -= 1
+        if self.depths[tag] > 0:
+            return
+
+        del self.depths[tag]
+        parts = self.captures.pop(tag)
+        if tag == 'a':
+            self.links.append((self.href, ''.join(parts)))
+            self.href = None
+        elif tag == 'address':
+            self.address = ''.join(part.strip() for part in parts)
+            self.seen.add(tag)
+        else:
+            setattr(self, tag, ''.join(parts).strip())
+            self.seen.add(tag)
+
+    def data(self, data):
+        if self.skip_depth:
+            return
+        self.pending.append(data)
+
+    def close(self):
+        self._flush()
+        return ParsedPage(
+            text=' '.join(self.strings),
+            title=self.title,
+            h1=self.h1,
+            address=self.address,
+            links=self.links
+        )
+
+
+def parse_page(html: str, fast: bool = True) -> ParsedPage:
+    """
+    Parse a page into text, title, first h1, first address and links
+
+    Args:
+        html: Page HTML
+        fast: Use the single-pass lxml parser when available
+
+    Returns:
+        ParsedPage with the extracted fields
+    """
+    if fast and etree is not None and html and html.strip():
+        target = _PageTarget()
+        parser = etree.HTMLParser(target=target)
+        try:
+            parser.feed(html)
+            return parser.close()
+        except etree.LxmlError:
+            pass
+
+    return ParsedPage.from_soup(BeautifulSoup(html or "", 'html.parser'))
@@ -0,0 +1,211 @@
+"""
+Search-and-scrape pipeline shared by the GUI and the headless batch runner
+"""
+
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Set, Tuple
+from data.college_data import CollegeDataManager
+from data.crawl_journal import CrawlJournal
+from scraper.concurrent_engine import ScrapeEngine
+from scraper.crawl_control import CrawlCancelled, CrawlControl
+from scraper.google_search import GoogleSearcher
+from scraper.progress import CrawlProgress
+from utils.logger import setup_logger
+
+logger = setup_logger('pipeline')
+
+
+class CrawlListener:
+    """Receives pipeline output; method names match MainWindow so it can be passed directly"""
+    
+    def append_result(self, text: str):
+        pass
+    
+    def update_progress(self, message: str):
+        pass
+    
+    def update_status(self, message: str):
+        pass
+
+
+@dataclass
+class JobResult:
+    """Outcome of one (state, branch, type) job"""
+    job_id: str = ""
+    found: int = 0
+    scraped: int = 0
+    added: int = 0
+    resumed: bool = False
+    cancelled: bool = False
+
+
+class CrawlPipeline:
+    """Search for college websites and scrape them into a CollegeDataManager"""
+    
+    def __init__(self, searcher: GoogleSearcher, engine: ScrapeEngine,
+                 data_manager: CollegeDataManager, journal: Optional[CrawlJournal] = None):
+        self.searcher = searcher
+        self.engine = engine
+        self.data_manager = data_manager
+        self.journal = journal
+    
+    def run_job(self, state: str, branch: str, college_type: str, max_results: int,
+                listener: CrawlListener = None, progress: Optional[CrawlProgress] = None,
+                control: Optional[CrawlControl] = None) -> JobResult:
+        """
+        Search for one (state, branch, type) combination and scrape the results
+        
+        Args:
+            state: State to search
+            branch: Branch to search
+            college_type: College type to search
+            max_results: Maximum number of search results
+            listener: Receives result lines, progress and status messages
+            progress: Counts of queued, in-flight, done and failed websites (optional)
+            control: Pause and cancel flags; a cancelled job keeps what it scraped
+                and stays unfinished in the journal so it can be resumed (optional)
+        
+        Returns:
+            JobResult with counts for the job
+        """
+        listener = listener or CrawlListener()
+        result = JobResult()
+        if control is not None and control.cancelled:
+            result.cancelled = True
+            return result
+        
+        # Step 1: Search for college websites
+        listener.append_result(f"{'='*80}")
+        listener.append_result(f"Searching for {branch} colleges in {state}")
+        listener.append_result(f"College Type: {college_type}")
+        listener.append_result(f"{'='*80}\n")
+        
+        # Resume an interrupted run with the same parameters if there is one
+        search_results = []
+        completed = set()
+        if self.journal:
+            result.job_id, result.resumed = self.journal.start_job(state, branch, college_type, max_results)
+            if result.resumed:
+                # Skip websites finished by the earlier, interrupted run
+                completed = self.journal.completed_urls(result.job_id)
+                if completed:
+                    for college_info in self.journal.load_records(result.job_id):
+                        if self.data_manager.add_college(college_info):
+                            result.added += 1
+                    listener.append_result(
+                        f"↻ Resuming previous run: {len(completed)} websites already done, "
+                        f"{result.added} colleges restored\n"
+                    )
+                # A search cut short is run again; the memo serves pages already fetched
+                if self.journal.search_complete(result.job_id):
+                    search_results = self.journal.load_search_results(result.job_id)
+        
+        if search_results:
+            listener.append_result(f"✓ Found {len(search_results)} potential college websites\n")
+            pending = [(name, url) for name, url in search_results if url not in completed]
+            if progress:
+                progress.add_queued(len(pending))
+        else:
+            # Scraping starts as soon as the first search results arrive
+            pending = self._stream_search(result.job_id, state, branch, college_type,
+                                          max_results, search_results, listener, progress, control,
+                                          skip=completed)
+        
+        # Step 2: Scrape college websites concurrently
+        listener.update_progress("Scraping college websites...")
+        
+        scraped_results = self.engine.scrape_all(pending, state, progress=progress, control=control)
+        for done, scraped in enumerate(scraped_results, len(completed) + 1):
+            if isinstance(scraped.error, CrawlCancelled):
+                # Aborted by the cancel, not failed: the site is retried on resume
+                continue
+            result.scraped += 1
+            total = len(search_results)
+            listener.update_progress(f"Scraped {done}/{total}: {scraped.college_name}")
+            listener.append_result(f"[{done}/{total}] Scraped: {scraped.college_name}")
+            
+            if scraped.error:
+                if self.journal:
+                    self.journal.mark_failed(result.job_id, scraped.url, str(scraped.error))
+                listener.append_result(f"  ❌ Error: {str(scraped.error)}\n")
+                continue
+            
+            college_info = scraped.college
+            if self.journal:
+                if college_info is None:
+                    # scrape_college returns None when the site could not be fetched
+                    self.journal.mark_failed(result.job_id, scraped.url, "scrape failed")
+                else:
+                    self.journal.mark_done(result.job_id, scraped.url, college_info)
+            
+            if college_info and self.data_manager.add_college(college_info):
+                result.added += 1
+                listener.append_result(f"  ✓ Name: {college_info.name}")
+                listener.append_result(f"  ✓ Email: {college_info.email or 'Not found'}")
+                listener.append_result(f"  ✓ Contact: {college_info.admin_contact or 'Not found'}")
+                listener.append_result(f"  ✓ Location: {college_info.location}")
+                listener.append_result(f"  ✓ Type: {college_info.college_type}")
+                if college_info.branches:
+                    listener.append_result(f"  ✓ Branches: {', '.join(college_info.branches[:3])}")
+                listener.append_result("")
+            elif college_info and college_info.is_valid():
+                listener.append_result(f"  ↺ Duplicate of an existing college, details merged\n")
+            else:
+                listener.append_result(f"  ⚠ Could not extract sufficient information\n")
+        
+        result.found = len(search_results)
+        if control is not None and control.cancelled:
+            result.cancelled = True
+            listener.append_result(f"\n⏹ Stopped: kept {result.added} colleges from "
+                                   f"{result.scraped} of {result.found} websites")
+            logger.info("Job cancelled: %s, %s, %s - %d scraped, %d added",
+                        state, branch, college_type, result.scraped, result.added)
+            return result
+        
+        if self.journal:
+            if not self.journal.search_complete(result.job_id):
+                # The search failed part way; resume searches again next run
+                logger.warning("Search did not finish for %s, %s, %s; job left to resume",
+                               state, branch, college_type, extra={'stage': 'search'})
+                return result
+            self.journal.finish_job(result.job_id)
+        
+        if not search_results:
+            listener.append_result("❌ No college websites found. Try different search parameters.")
+            return result
+        
+        logger.info("Job finished: %s, %s, %s - %d scraped, %d added",
+                    state, branch, college_type, result.scraped, result.added)
+        return result
+    
+    def _stream_search(self, job_id: str, state: str, branch: str, college_type: str,
+                       max_results: int, found: List[Tuple[str, str]],
+                       listener: CrawlListener,
+                       progress: Optional[CrawlProgress] = None,
+                       control: Optional[CrawlControl] = None,
+                       skip: Set[str] = frozenset()) -> Iterator[Tuple[str, str]]:
+        """
+        Yield search results as they arrive, recording them in ``found`` and the journal
+        
+        Results whose URL is in ``skip`` are recorded but not yielded. The
+        journal marks the search complete only once the stream is exhausted.
+        """
+        if self.journal:
+            self.journal.save_search_results(job_id, [])
+        
+        for name, url in self.searcher.iter_results(state, branch, college_type, max_results):
+            if control is not None and control.cancelled:
+                return
+            if self.journal:
+                self.journal.add_search_result(job_id, len(found), name, url)
+            found.append((name, url))
+            if url in skip:
+                continue
+            if progress:
+                progress.add_queued()
+            yield name, url
+        
+        if self.journal:
+            self.journal.finish_search(job_id)
+        if found:
+            listener.append_result(f"✓ Found {len(found)} potential college websites\n")
@@ -0,0 +1,109 @@
+"""
+Live crawl progress: queued, in-flight, done and failed pages, rates and ETA
+"""
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+from data.college_data import website_domain
+
+
+@dataclass
+class ProgressSnapshot:
+    """Point-in-time view of a crawl for display"""
+    queued: int = 0
+    in_flight: int = 0
+    done: int = 0
+    failed: int = 0
+    pages_per_sec: float = 0.0
+    bytes_per_sec: float = 0.0
+    eta_seconds: Optional[float] = None
+    slowest: List[Tuple[str, float]] = field(default_factory=list)  # (host, seconds in flight)
+
+    @property
+    def finished(self) -> int:
+        return self.done + self.failed
+
+    @property
+    def fraction(self) -> float:
+        """Share of queued pages that have finished (0 when nothing is queued)"""
+        return self.finished / self.queued if self.queued else 0.0
+
+
+class CrawlProgress:
+    """
+    Thread-safe counters fed by the pipeline and the scrape engine
+
+    Rates are measured over a sliding window of snapshots, so they follow the
+    current speed of the crawl rather than its average since the start.
+    """
+
+    def __init__(self, byte_counter: Optional[Callable[[], int]] = None,
+                 window: float = 10.0, slowest: int = 3):
+        """
+        Args:
+            byte_counter: Returns total bytes downloaded so far (e.g. from ConnectionStats)
+            window: Seconds of history used for the rates
+            slowest: In-flight hosts reported as slowest
+        """
+        self.byte_counter = byte_counter
+        self.window = window
+        self.slowest = slowest
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._done = 0
+        self._failed = 0
+        self._in_flight: Dict[str, float] = {}  # url -> start time
+        start_bytes = byte_counter() if byte_counter else 0
+        self._samples = deque([(time.monotonic(), 0, start_bytes)])
+
+    def add_queued(self, count: int = 1):
+        """Record URLs added to the crawl"""
+        with self._lock:
+            self._queued += count
+
+    def started(self, url: str):
+        """Record a URL being fetched"""
+        with self._lock:
+            self._in_flight[url] = time.monotonic()
+
+    def finished(self, url: str, ok: bool = True):
+        """Record a URL that finished, successfully or not"""
+        with self._lock:
+            self._in_flight.pop(url, None)
+            if ok:
+                self._done += 1
+            else:
+                self._failed += 1
+
+    def snapshot(self) -> ProgressSnapshot:
+        """Current counts, rates over the window, ETA and slowest in-flight hosts"""
+        now = time.monotonic()
+        total_bytes = self.byte_counter() if self.byte_counter else 0
+        with self._lock:
+            finished = self._done + self._failed
+            self._samples.append((now, finished, total_bytes))
+            while len(self._samples) > 2 and now - self._samples[1][0] >= self.window:
+                self._samples.popleft()
+            since, finished_then, bytes_then = self._samples[0]
+
+            elapsed = now - since
+            pages_per_sec = (finished - finished_then) / elapsed if elapsed > 0 else 0.0
+            bytes_per_sec = (total_bytes - bytes_then) / elapsed if elapsed > 0 else 0.0
+
+            remaining = self._queued - finished
+            eta = remaining / pages_per_sec if pages_per_sec > 0 else None
+
+            slowest = sorted(self._in_flight.items(), key=lambda item: item[1])[:self.slowest]
+            return ProgressSnapshot(
+                queued=self._queued,
+                in_flight=len(self._in_flight),
+                done=self._done,
+                failed=self._failed,
+                pages_per_sec=pages_per_sec,
+                bytes_per_sec=max(0.0, bytes_per_sec),
+                eta_seconds=eta,
+                slowest=[(website_domain(url), now - start) for url, start in slowest]
+            )
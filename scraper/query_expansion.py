@@ -0,0 +1,92 @@
+"""
+Expand one (state, branch, type) search into several narrower queries
+"""
+
+import re
+from itertools import zip_longest
+from typing import List
+from config.states import BRANCH_SYNONYMS, COLLEGE_TYPE_VARIANTS, STATE_CITIES
+
+
+def build_query(state: str, branch: str = "", college_type: str = "", place: str = "") -> str:
+    """
+    Build a search query for engineering colleges
+
+    Args:
+        state: State name
+        branch: Branch term ("All Branches" or empty for none)
+        college_type: Type term ("All Types" or empty for none)
+        place: City or district inside the state
+
+    Returns:
+        Query string
+    """
+    query_parts = []
+
+    # Add college type if specified
+    if college_type and college_type != "All Types":
+        query_parts.append(college_type.lower())
+
+    query_parts.append("engineering college")
+
+    # Add branch if not "All Branches"
+    if branch and branch != "All Branches":
+        query_parts.append(branch)
+
+    if place and place != state:
+        query_parts.append(place)
+    query_parts.append(state)
+    query_parts.append("contact")
+
+    return " ".join(query_parts)
+
+
+def normalize_query(query: str) -> str:
+    """Order-insensitive form of a query, so reworded duplicates share one key"""
+    return ' '.join(sorted(set(re.findall(r'\w+', query.lower()))))
+
+
+class QueryExpander:
+    """
+    Widen a search across the state's cities, branch synonyms and type variants
+
+    The plain query comes first; the variants are then interleaved so that a
+    small ``max_queries`` still covers a few of each kind.
+    """
+
+    def __init__(self, max_queries: int = 6):
+        """
+        Args:
+            max_queries: Queries per search, including the plain one (1 disables expansion)
+        """
+        self.max_queries = max(1, max_queries)
+
+    def expand(self, state: str, branch: str, college_type: str = "All Types") -> List[str]:
+        """
+        Queries for one search, most general first
+
+        Args:
+            state: State name
+            branch: Engineering branch
+            college_type: Type of college
+
+        Returns:
+            Up to max_queries distinct queries
+        """
+        cities = [build_query(state, branch, college_type, city)
+                  for city in STATE_CITIES.get(state, [])]
+        branches = [build_query(state, synonym, college_type)
+                    for synonym in BRANCH_SYNONYMS.get(branch, [])]
+        types = [build_query(state, branch, variant)
+                 for variant in COLLEGE_TYPE_VARIANTS.get(college_type, [])]
+
+        queries = [build_query(state, branch, college_type)]
+        seen = {normalize_query(queries[0])}
+        for group in zip_longest(cities, branches, types):
+            for query in group:
+                if len(queries) >= self.max_queries:
+                    return queries
+                if query and normalize_query(query) not in seen:
+                    seen.add(normalize_query(query))
+                    queries.append(query)
+        return queries
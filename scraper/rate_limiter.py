@@ -0,0 +1,339 @@
+"""
+Per-host token-bucket rate limiting shared by the search and scrape sessions
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Mapping, Optional
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from scraper.crawl_control import CrawlCancelled
+from utils.logger import setup_logger
+
+logger = setup_logger('rate_limiter')
+
+# Responses that mean "slow down"
+THROTTLE_STATUSES = {429, 503}
+
+ROBOTS_PATH = '/robots.txt'
+
+
+def host_of(url: str) -> str:
+    """Lower-cased host (with port) a URL points at"""
+    return urlparse(url).netloc.lower()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header
+    
+    Args:
+        value: Header value, either delta-seconds or an HTTP date
+    
+    Returns:
+        Seconds to wait, or None if the header is missing or unreadable
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+def parse_crawl_delay(robots_txt: str, user_agent: str = '*') -> Optional[float]:
+    """
+    Read the Crawl-delay that applies to a user agent from robots.txt
+    
+    urllib.robotparser only accepts whole seconds, while delays such as
+    "Crawl-delay: 0.5" are common, so the groups are parsed here.
+    
+    Args:
+        robots_txt: robots.txt contents
+        user_agent: User agent to match; groups for "*" apply otherwise
+    
+    Returns:
+        Delay in seconds, or None if no group sets one
+    """
+    groups = []  # (agents, delay)
+    agents, delay, in_rules = [], None, False
+    for line in robots_txt.splitlines():
+        line = line.split('#', 1)[0].strip()
+        if ':' not in line:
+            continue
+        key, value = (part.strip() for part in line.split(':', 1))
+        key = key.lower()
+        if key == 'user-agent':
+            if in_rules:
+                groups.append((agents, delay))
+                agents, delay, in_rules = [], None, False
+            agents.append(value.lower())
+        elif agents:
+            in_rules = True
+            if key == 'crawl-delay':
+                try:
+                    delay = float(value)
+                except ValueError:
+                    pass
+    if agents:
+        groups.append((agents, delay))
+    
+    agent = user_agent.lower()
+    specific = [d for names, d in groups if any(n != '*' and n in agent for n in names)]
+    default = [d for names, d in groups if '*' in names]
+    for value in specific + default:
+        if value is not None:
+            return max(0.0, value)
+    return None
+
+
+@dataclass
+class _HostBucket:
+    """Token bucket and backoff state for one host"""
+    interval: float
+    tokens: float
+    updated: float
+    blocked_until: float = 0.0
+    crawl_delay: float = 0.0
+    throttled: int = 0
+
+
+class HostRateLimiter:
+    """
+    Token bucket per host that adapts to the server's responses
+    
+    Each host gets ``burst`` requests immediately and then one request every
+    ``min_interval`` seconds, so many hosts can be fetched in parallel while
+    each one sees a steady, polite rate. The interval for a host:
+    
+    * is at least the Crawl-delay from its robots.txt,
+    * doubles on 429/503, and the host is paused for Retry-After seconds,
+    * shrinks back towards the configured interval as requests succeed.
+    """
+    
+    def __init__(self, min_interval: float = 1.0, burst: int = 1, max_interval: float = 60.0,
+                 max_retry_after: float = 600.0, respect_robots: bool = True,
+                 user_agent: str = '*',
+                 robots_fetcher: Optional[Callable[[str], Optional[str]]] = None):
+        """
+        Args:
+            min_interval: Seconds between requests to one host (0 disables throttling)
+            burst: Requests allowed back to back before the interval applies
+            max_interval: Upper bound for the backed-off interval and Crawl-delay
+            max_retry_after: Upper bound for a Retry-After pause
+            respect_robots: Read Crawl-delay from each host's robots.txt
+            user_agent: User agent matched against robots.txt rules
+            robots_fetcher: Callable returning robots.txt text for a URL (or None);
+                HttpClient installs one using its session when none is given
+        """
+        self.min_interval = max(0.0, min_interval)
+        self.burst = max(1, burst)
+        self.max_interval = max(self.min_interval, max_interval)
+        self.max_retry_after = max_retry_after
+        self.respect_robots = respect_robots
+        self.user_agent = user_agent
+        self.robots_fetcher = robots_fetcher
+        self._buckets: Dict[str, _HostBucket] = {}
+        self._robots_locks: Dict[str, threading.Lock] = {}
+        self._robots_done = set()
+        self._lock = threading.Lock()
+    
+    def _bucket(self, host: str, now: float) -> _HostBucket:
+        """Get or create a host's bucket (lock held)"""
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = _HostBucket(
+                interval=self.min_interval, tokens=float(self.burst), updated=now
+            )
+        return bucket
+    
+    def load_robots(self, url: str):
+        """
+        Read Crawl-delay from the robots.txt of a URL's host, once per host
+        
+        Blocks while the file is fetched; requests to other hosts are not held up.
+        
+        Args:
+            url: Any URL on the host
+        """
+        if not self.respect_robots:
+            return
+        host = host_of(url)
+        if host in self._robots_done:
+            return
+        
+        with self._lock:
+            host_lock = self._robots_locks.setdefault(host, threading.Lock())
+        with host_lock:
+            if host in self._robots_done:
+                return
+            
+            parsed = urlparse(url)
+            robots_url = f"{parsed.scheme or 'http'}://{parsed.netloc}{ROBOTS_PATH}"
+            delay = 0.0
+            try:
+                text = (self.robots_fetcher or self._fetch_robots)(robots_url)
+                if text:
+                    delay = parse_crawl_delay(text, self.user_agent) or 0.0
+            except CrawlCancelled:
+                raise  # the host is not marked done, so the next run reads it
+            except Exception as e:
+                logger.debug("Could not read %s: %s", robots_url, e,
+                             extra={'url': robots_url, 'stage': 'robots'})
+            
+            if delay > self.max_interval:
+                logger.warning("Crawl-delay %ss for %s capped at %ss", delay, host, self.max_interval,
+                               extra={'host': host, 'stage': 'robots'})
+                delay = self.max_interval
+            if delay:
+                logger.info("Honoring Crawl-delay %ss for %s", delay, host,
+                            extra={'host': host, 'stage': 'robots', 'duration': delay})
+                with self._lock:
+                    bucket = self._bucket(host, time.monotonic())
+                    bucket.crawl_delay = delay
+                    bucket.interval = max(bucket.interval, delay)
+            self._robots_done.add(host)
+    
+    def _fetch_robots(self, robots_url: str) -> Optional[str]:
+        """Fallback fetcher when no session is shared; missing or unreadable files impose no delay"""
+        response = requests.get(robots_url, timeout=5)
+        if response.status_code != 200:
+            return None
+        return response.text
+    
+    def reserve(self, url: str) -> float:
+        """
+        Take a token for the URL's host without blocking
+        
+        Args:
+            url: URL about to be fetched
+        
+        Returns:
+            Seconds to wait before the request may be sent
+        """
+        host = host_of(url)
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._bucket(host, now)
+            interval = bucket.interval
+            if interval > 0:
+                # Tokens go negative when requests queue up; each one waits its turn
+                refill = (now - bucket.updated) / interval
+                bucket.tokens = min(float(self.burst), bucket.tokens + refill)
+                bucket.updated = now
+                bucket.tokens -= 1
+                delay = -bucket.tokens * interval if bucket.tokens < 0 else 0.0
+            else:
+                delay = 0.0
+            return max(delay, bucket.blocked_until - now)
+    
+    def wait(self, url: str, sleep: Callable[[float], None] = time.sleep):
+        """
+        Block until a request to the URL's host is allowed
+        
+        Args:
+            url: URL about to be fetched
+            sleep: Sleep function (CrawlControl.sleep makes the wait cancellable)
+        """
+        if urlparse(url).path == ROBOTS_PATH:
+            return  # sent by load_robots itself, ahead of the host's first request
+        self.load_robots(url)
+        delay = self.reserve(url)
+        if delay > 0:
+            logger.debug("Waiting %.2fs before requesting %s", delay, url,
+                         extra={'url': url, 'stage': 'rate_limit', 'duration': delay})
+            sleep(delay)
+    
+    def feedback(self, url: str, status: int, headers: Optional[Mapping[str, str]] = None):
+        """
+        Adjust a host's rate from a response
+        
+        Args:
+            url: URL that was fetched
+            status: HTTP status code
+            headers: Response headers (for Retry-After)
+        """
+        host = host_of(url)
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._bucket(host, now)
+            floor = max(self.min_interval, bucket.crawl_delay)
+            
+            if status in THROTTLE_STATUSES:
+                bucket.throttled += 1
+                bucket.interval = min(self.max_interval, max(bucket.interval * 2, 1.0))
+                retry_after = parse_retry_after((headers or {}).get('Retry-After'))
+                pause = min(retry_after, self.max_retry_after) if retry_after is not None else bucket.interval
+                bucket.blocked_until = max(bucket.blocked_until, now + pause)
+                # Refill restarts when the pause ends, releasing queued requests one at a time
+                bucket.tokens = 1.0
+                bucket.updated = bucket.blocked_until
+                logger.warning("%s returned %s; pausing %.1fs, interval now %.1fs",
+                               host, status, pause, bucket.interval,
+                               extra={'url': url, 'host': host, 'stage': 'rate_limit',
+                                      'status': status, 'duration': pause})
+            elif status < 400 and bucket.interval > floor:
+                # Recover gradually towards the configured rate
+                bucket.interval = max(floor, bucket.interval * 0.75)
+    
+    def interval_for(self, url: str) -> float:
+        """Current seconds between requests to the URL's host"""
+        with self._lock:
+            bucket = self._buckets.get(host_of(url))
+            return bucket.interval if bucket else self.min_interval
+    
+    def throttled_hosts(self) -> Dict[str, int]:
+        """Number of 429/503 responses seen per host"""
+        with self._lock:
+            return {host: b.throttled for host, b in self._buckets.items() if b.throttled}
+    
+    def install(self, session: requests.Session):
+        """
+        Throttle a session's HTTP(S) requests with this limiter
+        
+        Args:
+            session: requests session to mount the rate-limited adapter on
+        """
+        adapter = RateLimitedAdapter(self)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """
+    Transport adapter that waits for the host's rate limiter before each request
+    
+    With a CrawlControl set, every request first passes its checkpoint, so a
+    paused crawl holds here and a cancelled one stops sending.
+    """
+    
+    def __init__(self, limiter: Optional[HostRateLimiter] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.limiter = limiter
+        self.control = None
+    
+    def _sleep(self, seconds: float):
+        """Sleep that a CrawlControl can interrupt"""
+        if self.control is not None:
+            self.control.sleep(seconds)
+        else:
+            time.sleep(seconds)
+    
+    def send(self, request, **kwargs):
+        if self.control is not None:
+            self.control.checkpoint()
+        if self.limiter is None:
+            return super().send(request, **kwargs)
+        
+        self.limiter.wait(request.url, sleep=self._sleep)
+        response = super().send(request, **kwargs)
+        self.limiter.feedback(request.url, response.status_code, response.headers)
+        return response
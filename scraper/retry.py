@@ -0,0 +1,400 @@
+"""
+Retry with jittered backoff and per-host circuit breakers for page fetches
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import Counter
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+import requests
+from scraper.crawl_control import CrawlCancelled
+from scraper.rate_limiter import HostRateLimiter, RateLimitedAdapter, host_of
+from utils.logger import setup_logger
+
+logger = setup_logger('retry')
+
+T = TypeVar('T')
+
+# Failure kinds
+TIMEOUT = 'timeout'
+CONNECTION = 'connection'
+DNS = 'dns'
+THROTTLED = 'throttled'
+SERVER_ERROR = 'server_error'
+CLIENT_ERROR = 'client_error'
+CIRCUIT_OPEN = 'circuit_open'
+OTHER = 'other'
+
+# Worth another attempt after a pause
+TRANSIENT_FAILURES = {TIMEOUT, CONNECTION, THROTTLED, SERVER_ERROR}
+# Count against the host's circuit breaker
+HOST_FAILURES = {TIMEOUT, CONNECTION, DNS, SERVER_ERROR}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+DNS_MARKERS = ('NameResolutionError', 'Name or service not known', 'getaddrinfo failed',
+               'nodename nor servname', 'No address associated')
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised without touching the network when a host's circuit breaker is open"""
+
+
+def classify_failure(error: Optional[BaseException] = None, status: Optional[int] = None) -> Optional[str]:
+    """
+    Classify a failed fetch
+    
+    Args:
+        error: Exception raised by the fetch (requests or aiohttp)
+        status: HTTP status code, if a response was received
+    
+    Returns:
+        Failure kind, or None if neither describes a failure
+    """
+    if isinstance(error, CircuitOpenError):
+        return CIRCUIT_OPEN
+    if status is None and error is not None:
+        response = getattr(error, 'response', None)
+        status = getattr(response, 'status_code', None) or getattr(error, 'status', None)
+    if status:
+        if status == 429:
+            return THROTTLED
+        if status >= 500:
+            return SERVER_ERROR
+        if status >= 400:
+            return CLIENT_ERROR
+    if error is None:
+        return None
+    if isinstance(error, (requests.Timeout, asyncio.TimeoutError, TimeoutError)):
+        return TIMEOUT
+    if isinstance(error, requests.RequestException) and not isinstance(error, requests.ConnectionError):
+        # e.g. invalid URLs or non-HTML content; requests errors are OSErrors too
+        return OTHER
+    if isinstance(error, OSError):
+        # requests.ConnectionError and aiohttp's connection errors are OSErrors
+        message = str(error)
+        if any(marker in message for marker in DNS_MARKERS):
+            return DNS
+        return CONNECTION
+    return OTHER
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter"""
+    
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.5, max_delay: float = 10.0):
+        """
+        Args:
+            max_attempts: Attempts per request, including the first
+            base_delay: Backoff ceiling after the first failure, doubled after each retry
+            max_delay: Upper bound for a single backoff
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = max(0.0, base_delay)
+        self.max_delay = max(self.base_delay, max_delay)
+    
+    def backoff(self, attempt: int) -> float:
+        """
+        Seconds to wait after a failed attempt
+        
+        Args:
+            attempt: Number of the attempt that failed (1-based)
+        
+        Returns:
+            Random delay between 0 and the exponential ceiling
+        """
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """
+    Stop sending requests to a host after repeated failures
+    
+    Closed: requests flow. After ``failure_threshold`` consecutive host
+    failures the breaker opens and requests fail immediately. Once
+    ``reset_timeout`` has passed a single trial request is let through
+    (half-open); success closes the breaker, failure opens it again.
+    """
+    
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+    
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+    
+    def allow(self) -> bool:
+        """Check whether a request may be sent now"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+    
+    def record_success(self):
+        """The host answered"""
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+    
+    def record_failure(self) -> bool:
+        """
+        The host failed
+        
+        Returns:
+            True if this failure opened the breaker
+        """
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or (
+                    self.state == self.CLOSED and self.failures >= self.failure_threshold):
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                return True
+            return False
+    
+    def release(self):
+        """An attempt ended without an answer either way (e.g. cancelled); free a half-open trial"""
+        with self._lock:
+            self._trial_in_flight = False
+
+
+class FailureStats:
+    """Thread-safe counters for fetch attempts, retries and failures by kind"""
+    
+    def __init__(self):
+        self.attempts = 0
+        self.retries = 0
+        self.gave_up = 0
+        self.breaker_trips = 0
+        self.failures: Counter = Counter()
+        self._lock = threading.Lock()
+    
+    def record_attempt(self):
+        with self._lock:
+            self.attempts += 1
+    
+    def record_failure(self, kind: str, retrying: bool):
+        with self._lock:
+            self.failures[kind] += 1
+            if retrying:
+                self.retries += 1
+            else:
+                self.gave_up += 1
+    
+    def record_trip(self):
+        with self._lock:
+            self.breaker_trips += 1
+    
+    def snapshot(self) -> Dict[str, int]:
+        """Copy of all counters"""
+        with self._lock:
+            data = {
+                'attempts': self.attempts,
+                'retries': self.retries,
+                'gave_up': self.gave_up,
+                'breaker_trips': self.breaker_trips,
+            }
+            data.update({f"failed_{kind}": count for kind, count in self.failures.items()})
+            return data
+    
+    def summary(self) -> str:
+        """One-line description for the log"""
+        data = self.snapshot()
+        kinds = ', '.join(f"{key[len('failed_'):]}={value}" for key, value in sorted(data.items())
+                          if key.startswith('failed_'))
+        return (f"{data['attempts']} fetch attempts, {data['retries']} retries, "
+                f"{data['gave_up']} gave up, {data['breaker_trips']} circuit breaker trips"
+                + (f" ({kinds})" if kinds else ""))
+
+
+class FetchGuard:
+    """
+    Apply a RetryPolicy and per-host circuit breakers around fetches
+    
+    Shared by every session of a run so breakers and counters cover all
+    requests to a host.
+    """
+    
+    def __init__(self, policy: Optional[RetryPolicy] = None, failure_threshold: int = 5,
+                 reset_timeout: float = 60.0):
+        """
+        Args:
+            policy: Retry policy (defaults to RetryPolicy())
+            failure_threshold: Consecutive host failures that open its breaker
+            reset_timeout: Seconds a breaker stays open before a trial request
+        """
+        self.policy = policy or RetryPolicy()
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.stats = FailureStats()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+    
+    def breaker_for(self, url: str) -> CircuitBreaker:
+        """Circuit breaker for the URL's host"""
+        host = host_of(url)
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return breaker
+    
+    def open_circuits(self):
+        """Hosts whose breaker is currently open"""
+        with self._lock:
+            return [host for host, b in self._breakers.items() if b.state != CircuitBreaker.CLOSED]
+    
+    def _begin(self, url: str, breaker: CircuitBreaker):
+        """Fail fast if the host's breaker is open"""
+        if not breaker.allow():
+            self.stats.record_failure(CIRCUIT_OPEN, retrying=False)
+            raise CircuitOpenError(f"Circuit open for {host_of(url)}, skipping {url}")
+        self.stats.record_attempt()
+    
+    def _outcome(self, url: str, breaker: CircuitBreaker, kind: Optional[str], attempt: int,
+                 retryable: bool = True) -> bool:
+        """
+        Record an attempt's outcome
+        
+        Args:
+            url: Request URL
+            breaker: The host's circuit breaker
+            kind: Failure kind, or None for success
+            attempt: Attempt number (1-based)
+            retryable: Whether this outcome may be retried at all
+        
+        Returns:
+            True if the request should be retried
+        """
+        opened = False
+        if kind in HOST_FAILURES:
+            opened = breaker.record_failure()
+            if opened:
+                self.stats.record_trip()
+                logger.warning("Circuit opened for %s after repeated failures", host_of(url),
+                               extra={'url': url, 'stage': 'retry'})
+        else:
+            breaker.record_success()
+        
+        if kind is None or kind == CLIENT_ERROR:
+            return False
+        # No point retrying once this failure has opened the host's breaker
+        retrying = (retryable and not opened and kind in TRANSIENT_FAILURES
+                    and attempt < self.policy.max_attempts)
+        self.stats.record_failure(kind, retrying)
+        return retrying
+    
+    def call(self, url: str, send: Callable[[], requests.Response],
+             sleep: Callable[[float], None] = time.sleep) -> requests.Response:
+        """
+        Send a request, retrying transient failures
+        
+        Args:
+            url: Request URL (selects the circuit breaker)
+            send: Performs one attempt and returns the response
+            sleep: Sleep function for the backoff (CrawlControl.sleep makes it cancellable)
+        
+        Returns:
+            The first successful response, or the last one if retries ran out
+        
+        Raises:
+            CircuitOpenError: The host's breaker is open
+            requests.RequestException: The last attempt's error
+        """
+        breaker = self.breaker_for(url)
+        for attempt in range(1, self.policy.max_attempts + 1):
+            self._begin(url, breaker)
+            try:
+                response = send()
+            except (requests.RequestException, OSError) as e:
+                kind = classify_failure(e)
+                if not self._outcome(url, breaker, kind, attempt):
+                    raise
+                delay = self.policy.backoff(attempt)
+                logger.info("Retrying %s in %.1fs after %s: %s", url, delay, kind, e,
+                            extra={'url': url, 'stage': 'retry', 'duration': delay})
+                sleep(delay)
+                continue
+            except BaseException:
+                # CrawlCancelled and the like say nothing about the host
+                breaker.release()
+                raise
+            
+            kind = classify_failure(status=response.status_code)
+            if not self._outcome(url, breaker, kind, attempt, response.status_code in RETRY_STATUSES):
+                return response
+            delay = self.policy.backoff(attempt)
+            logger.info("Retrying %s in %.1fs after HTTP %s", url, delay, response.status_code,
+                        extra={'url': url, 'stage': 'retry', 'status': response.status_code,
+                               'duration': delay})
+            response.close()
+            sleep(delay)
+    
+    async def call_async(self, url: str, send: Callable[[], Awaitable[T]]) -> T:
+        """
+        Async variant of call(); ``send`` raises on a bad HTTP status
+        
+        Args:
+            url: Request URL (selects the circuit breaker)
+            send: Coroutine function performing one attempt
+        
+        Returns:
+            Result of the first successful attempt
+        """
+        breaker = self.breaker_for(url)
+        for attempt in range(1, self.policy.max_attempts + 1):
+            self._begin(url, breaker)
+            try:
+                result = await send()
+            except (CircuitOpenError, CrawlCancelled):
+                # Neither says anything about the host
+                breaker.release()
+                raise
+            except Exception as e:
+                kind = classify_failure(e)
+                if not self._outcome(url, breaker, kind, attempt):
+                    raise
+                delay = self.policy.backoff(attempt)
+                logger.info("Retrying %s in %.1fs after %s: %s", url, delay, kind, e,
+                            extra={'url': url, 'stage': 'retry', 'duration': delay})
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                # Task cancellation says nothing about the host
+                breaker.release()
+                raise
+            self._outcome(url, breaker, None, attempt)
+            return result
+
+
+class GuardedAdapter(RateLimitedAdapter):
+    """Transport adapter that rate limits each attempt and retries through a FetchGuard"""
+    
+    def __init__(self, limiter: Optional[HostRateLimiter] = None, guard: Optional[FetchGuard] = None,
+                 **kwargs):
+        super().__init__(limiter, **kwargs)
+        self.guard = guard
+    
+    def send(self, request, **kwargs):
+        if self.guard is None:
+            return super().send(request, **kwargs)
+        return self.guard.call(request.url, lambda: super(GuardedAdapter, self).send(request, **kwargs),
+                               sleep=self._sleep)
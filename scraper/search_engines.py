@@ -0,0 +1,284 @@
+"""
+Search several engines and result pages in parallel and fuse the results
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, quote_plus, urljoin, urlparse
+from bs4 import BeautifulSoup
+from data.college_data import website_domain
+from scraper.crawl_control import CrawlCancelled
+from scraper.google_search import GoogleSearcher
+from scraper.http_client import HttpClient
+from scraper.query_expansion import QueryExpander
+from scraper.search_memo import SearchMemo
+from utils.logger import setup_logger
+from utils.metrics import METRICS
+
+logger = setup_logger('search_engines')
+
+# Reciprocal rank fusion constant; larger values flatten the rank differences
+RRF_K = 60
+
+
+def unwrap_redirect(url: str) -> str:
+    """Return the target of a search engine redirect link (/l/?uddg=..., /url?q=...)"""
+    parsed = urlparse(url)
+    params = parse_qs(parsed.query)
+    for key in ('uddg', 'q', 'url', 'u'):
+        if parsed.path.rstrip('/').endswith(('/l', '/url')) and params.get(key):
+            return params[key][0]
+    return url
+
+
+class SearchBackend:
+    """One search engine: how to request a results page and read links from it"""
+
+    name = ''
+    page_size = 10
+
+    def page_url(self, query: str, page: int) -> str:
+        """URL of results page ``page`` (0-based) for a query"""
+        raise NotImplementedError
+
+    def parse(self, html: str) -> List[Tuple[str, str]]:
+        """(title, url) pairs in result order"""
+        raise NotImplementedError
+
+    def search_page(self, session, headers: dict, query: str, page: int) -> List[Tuple[str, str]]:
+        """
+        Fetch and parse one results page
+
+        Args:
+            session: requests-compatible session
+            headers: Request headers
+            query: Search query
+            page: 0-based results page
+
+        Returns:
+            List of tuples (title, url)
+        """
+        with METRICS.timer('search.fetch'):
+            response = session.get(self.page_url(query, page), headers=headers, timeout=(5, 10))
+            response.raise_for_status()
+            html = response.text
+        with METRICS.timer('search.parse'):
+            return self.parse(html)
+
+
+class DuckDuckGoBackend(SearchBackend):
+    """DuckDuckGo HTML endpoint"""
+
+    name = 'duckduckgo'
+    page_size = 30
+
+    def page_url(self, query: str, page: int) -> str:
+        url = f"https://html.duckduckgo.com/html/?q={quote_plus(query)}"
+        if page:
+            offset = page * self.page_size
+            url += f"&s={offset}&dc={offset + 1}"
+        return url
+
+    def parse(self, html: str) -> List[Tuple[str, str]]:
+        soup = BeautifulSoup(html, 'html.parser')
+        return [
+            (link.get_text(strip=True), unwrap_redirect(urljoin('https://duckduckgo.com', link['href'])))
+            for link in soup.find_all('a', class_='result__a', href=True)
+        ]
+
+
+class GoogleBackend(SearchBackend):
+    """Google web search"""
+
+    name = 'google'
+
+    def page_url(self, query: str, page: int) -> str:
+        return (f"https://www.google.com/search?q={quote_plus(query)}"
+                f"&num={self.page_size}&start={page * self.page_size}")
+
+    def parse(self, html: str) -> List[Tuple[str, str]]:
+        soup = BeautifulSoup(html, 'html.parser')
+        results = []
+        for result in soup.find_all('div', class_='g'):
+            link_tag = result.find('a', href=True)
+            if not link_tag:
+                continue
+            title_tag = result.find('h3')
+            title = title_tag.get_text() if title_tag else "Unknown"
+            results.append((title, unwrap_redirect(urljoin('https://www.google.com', link_tag['href']))))
+        return results
+
+
+class BingBackend(SearchBackend):
+    """Bing web search"""
+
+    name = 'bing'
+
+    def page_url(self, query: str, page: int) -> str:
+        return f"https://www.bing.com/search?q={quote_plus(query)}&first={page * self.page_size + 1}"
+
+    def parse(self, html: str) -> List[Tuple[str, str]]:
+        soup = BeautifulSoup(html, 'html.parser')
+        results = []
+        for result in soup.find_all('li', class_='b_algo'):
+            link_tag = result.select_one('h2 a[href]')
+            if link_tag:
+                results.append((link_tag.get_text(strip=True), link_tag['href']))
+        return results
+
+
+BACKENDS = {
+    backend.name: backend
+    for backend in (DuckDuckGoBackend, GoogleBackend, BingBackend)
+}
+
+
+class MultiEngineSearcher(GoogleSearcher):
+    """
+    Query several search engines and result pages at once
+
+    Each search is widened into several queries by the expander, and results
+    pages already in the memo are not fetched again. Results are
+    deduplicated by normalized domain. ``iter_results`` yields
+    each new college site as soon as its results page arrives; ``search``
+    waits for every page and orders sites by reciprocal rank fusion.
+    """
+
+    def __init__(self, client: Optional[HttpClient] = None,
+                 backends: Optional[Sequence[SearchBackend]] = None,
+                 pages: int = 2, max_workers: int = 6,
+                 expander: Optional[QueryExpander] = None, memo: Optional[SearchMemo] = None):
+        """
+        Args:
+            client: Shared HTTP client
+            backends: Search engines to query (default: DuckDuckGo, Google and Bing)
+            pages: Results pages requested from each engine per query
+            max_workers: Results pages fetched at the same time
+            expander: Turns one search into several queries (default: no expansion)
+            memo: Remembers results pages between searches and runs
+        """
+        super().__init__(client)
+        self.backends = list(backends) if backends else [cls() for cls in BACKENDS.values()]
+        self.pages = max(1, pages)
+        self.max_workers = max(1, max_workers)
+        self.expander = expander or QueryExpander(max_queries=1)
+        self.memo = memo
+
+    @classmethod
+    def from_names(cls, names: Sequence[str], client: Optional[HttpClient] = None,
+                   **kwargs) -> 'MultiEngineSearcher':
+        """
+        Build a searcher from engine names
+
+        Args:
+            names: Names from BACKENDS
+            client: Shared HTTP client
+
+        Returns:
+            MultiEngineSearcher using those engines
+        """
+        unknown = [name for name in names if name not in BACKENDS]
+        if unknown:
+            raise ValueError(f"Unknown search engine(s): {', '.join(unknown)}")
+        return cls(client, [BACKENDS[name]() for name in names], **kwargs)
+
+    def _search_page(self, backend: SearchBackend, query: str, page: int) -> List[Tuple[str, str]]:
+        """One results page, keeping only likely college sites; errors give no results"""
+        results = self.memo.get(backend.name, query, page) if self.memo else None
+        if results is None:
+            try:
+                results = backend.search_page(self.session, self.headers, query, page)
+            except CrawlCancelled:
+                raise
+            except Exception as e:
+                logger.error("%s search error (page %d): %s", backend.name, page + 1, e,
+                             extra={'url': backend.page_url(query, page), 'stage': 'search'})
+                return []
+            # Empty pages are usually blocks or captchas, so they are not remembered
+            if self.memo and results:
+                self.memo.store(backend.name, query, page, results)
+        return [(title, url) for title, url in results if self._is_valid_college_url(url, title)]
+
+    def _page_results(self, state: str, branch: str,
+                      college_type: str) -> Iterator[Tuple[SearchBackend, int, List[Tuple[str, str]]]]:
+        """Fetch every (query, engine, page) in parallel, yielding pages in completion order"""
+        queries = self.expander.expand(state, branch, college_type)
+        logger.info("Searching %s with %d queries, starting with: %s",
+                    ', '.join(b.name for b in self.backends), len(queries), queries[0],
+                    extra={'stage': 'search'})
+
+        # Broad queries and first pages are queued before narrower queries and later pages
+        pages = [
+            (query, backend, page)
+            for query in queries for page in range(self.pages) for backend in self.backends
+        ]
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='search')
+        futures = {}
+        try:
+            for query, backend, page in pages:
+                futures[executor.submit(self._search_page, backend, query, page)] = (backend, page)
+            for future in as_completed(futures):
+                backend, page = futures[future]
+                yield backend, page, future.result()
+        finally:
+            # Pages not yet requested are dropped when the caller stops early
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def iter_results(self, state: str, branch: str, college_type: str = "All Types",
+                     max_results: int = 20) -> Iterator[Tuple[str, str]]:
+        """
+        Stream college websites as results pages arrive
+
+        Args:
+            state: State name
+            branch: Engineering branch
+            college_type: Type of college
+            max_results: Maximum number of websites
+
+        Returns:
+            Iterator of tuples (college_name, url), one per domain
+        """
+        seen = set()
+        for backend, page, results in self._page_results(state, branch, college_type):
+            logger.debug("%s page %d: %d results", backend.name, page + 1, len(results),
+                         extra={'stage': 'search'})
+            for title, url in results:
+                domain = website_domain(url)
+                if domain and domain not in seen:
+                    seen.add(domain)
+                    yield title, url
+                    if len(seen) >= max_results:
+                        return
+
+    def search(self, state: str, branch: str, college_type: str = "All Types",
+               max_results: int = 20) -> List[Tuple[str, str]]:
+        """
+        Search every engine and fuse the rankings
+
+        Args:
+            state: State name
+            branch: Engineering branch
+            college_type: Type of college
+            max_results: Maximum number of websites
+
+        Returns:
+            List of tuples (college_name, url), best first
+        """
+        scores: Dict[str, float] = {}
+        first: Dict[str, Tuple[str, str]] = {}
+        for backend, page, results in self._page_results(state, branch, college_type):
+            counted = set()  # a domain scores once per results page
+            for rank, (title, url) in enumerate(results, page * backend.page_size + 1):
+                domain = website_domain(url)
+                if not domain or domain in counted:
+                    continue
+                counted.add(domain)
+                scores[domain] = scores.get(domain, 0.0) + 1.0 / (RRF_K + rank)
+                first.setdefault(domain, (title, url))
+
+        ranked = sorted(scores, key=lambda domain: -scores[domain])
+        results = [first[domain] for domain in ranked[:max_results]]
+        logger.info("Found %d potential college websites", len(results), extra={'stage': 'search'})
+        return results
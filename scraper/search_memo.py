@@ -0,0 +1,85 @@
+"""
+Persistent memo of search results keyed by engine, normalized query and page
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Optional, Tuple
+from scraper.query_expansion import normalize_query
+from utils.logger import setup_logger
+
+logger = setup_logger('search_memo')
+
+
+class SearchMemo:
+    """SQLite-backed search results with a TTL, shared by repeated and overlapping sweeps"""
+
+    def __init__(self, path: str = os.path.join('cache', 'search_memo.sqlite'),
+                 ttl: float = 7 * 24 * 3600):
+        """
+        Args:
+            path: SQLite file holding the memo
+            ttl: Seconds a results page is reused before searching again
+        """
+        memo_dir = os.path.dirname(path)
+        if memo_dir and not os.path.exists(memo_dir):
+            os.makedirs(memo_dir)
+
+        self.path = path
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS search_results ('
+            ' engine TEXT, query TEXT, page INTEGER, results TEXT, fetched_at REAL,'
+            ' PRIMARY KEY (engine, query, page))'
+        )
+        # Expired pages are never served again, so drop them on open
+        self._conn.execute('DELETE FROM search_results WHERE fetched_at < ?', (time.time() - ttl,))
+        self._conn.commit()
+
+    def get(self, engine: str, query: str, page: int) -> Optional[List[Tuple[str, str]]]:
+        """
+        Look up a results page that is still within the TTL
+
+        Args:
+            engine: Search engine name
+            query: Search query (normalized here)
+            page: 0-based results page
+
+        Returns:
+            List of tuples (title, url), or None if not memoized or expired
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT results, fetched_at FROM search_results'
+                ' WHERE engine = ? AND query = ? AND page = ?',
+                (engine, normalize_query(query), page)
+            ).fetchone()
+            if row is None or time.time() - row[1] >= self.ttl:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return [tuple(result) for result in json.loads(row[0])]
+
+    def store(self, engine: str, query: str, page: int, results: List[Tuple[str, str]]):
+        """
+        Remember a results page
+
+        Args:
+            engine: Search engine name
+            query: Search query (normalized here)
+            page: 0-based results page
+            results: List of tuples (title, url)
+        """
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO search_results VALUES (?, ?, ?, ?, ?)',
+                (engine, normalize_query(query), page, json.dumps(results), time.time())
+            )
+            self._conn.commit()
@@ -0,0 +1,60 @@
+"""
+AsyncScrapeEngine against the local stand-in server
+"""
+
+import logging
+import os
+import pytest
+from benchmarks.corpus import Corpus
+from benchmarks.stand_in import LoopbackResolver, StandInServer
+from scraper.async_college_scraper import AsyncScrapeEngine
+from scraper.download import DownloadLimits
+from scraper.http_cache import ResponseCache
+
+logging.disable(logging.INFO)
+
+
+@pytest.fixture(scope='module')
+def corpus():
+    return Corpus.generate(colleges=6, duplicates=0.0)
+
+
+def scrape(server, corpus, **kwargs):
+    engine = AsyncScrapeEngine(max_concurrency=8, per_host_delay=0.0,
+                               resolver=LoopbackResolver(), **kwargs)
+    targets = [(name, server.url(url)) for name, url in corpus.homepages]
+    return list(engine.scrape_all(targets, corpus.state))
+
+
+def test_scrapes_every_site(corpus):
+    with StandInServer(corpus) as server:
+        results = scrape(server, corpus)
+
+    assert len(results) == len(corpus.homepages)
+    colleges = [result.college for result in results]
+    assert all(colleges)
+    assert all(college.email.startswith('principal@') for college in colleges)
+    assert all(college.hod_contact for college in colleges)
+
+
+def test_replay_serves_cached_pages(corpus, tmp_path):
+    path = os.path.join(tmp_path, 'cache.sqlite')
+    with StandInServer(corpus) as server:
+        scrape(server, corpus, cache=ResponseCache(path))
+        # Replay never touches the network, so the same URLs must come from the cache
+        results = scrape(server, corpus, cache=ResponseCache(path, replay=True))
+
+    assert all(result.college and result.college.email for result in results)
+
+
+def test_cache_hits_apply_content_type_and_limits(corpus, tmp_path):
+    cache = ResponseCache(os.path.join(tmp_path, 'cache.sqlite'), replay=True)
+    with StandInServer(corpus) as server:
+        name, url = corpus.homepages[0]
+        url = server.url(url)
+        cache.store(url, 200, {'Content-Type': 'application/pdf'}, b'<html><title>x</title></html>')
+        engine = AsyncScrapeEngine(resolver=LoopbackResolver(), cache=cache,
+                                   limits=DownloadLimits(max_bytes=64))
+        (result,) = engine.scrape_all([(name, url)], corpus.state)
+
+    assert result.college is None
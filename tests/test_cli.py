@@ -0,0 +1,14 @@
+from cli import parse_choices
+from config.states import COLLEGE_TYPES, ENGINEERING_BRANCHES
+
+
+def test_all_expands_to_specific_choices_only():
+    branches = parse_choices('all', ENGINEERING_BRANCHES, '--branches')
+    types = parse_choices('all', COLLEGE_TYPES, '--types')
+    assert 'All Branches' not in branches and 'All Types' not in types
+    assert len(branches) == len(ENGINEERING_BRANCHES) - 1
+    assert len(types) == len(COLLEGE_TYPES) - 1
+
+
+def test_catch_all_stays_selectable_by_name():
+    assert parse_choices('all types', COLLEGE_TYPES, '--types') == ['All Types']
@@ -0,0 +1,55 @@
+"""
+CollegeDataManager dedupe and secondary indexes
+"""
+
+import time
+
+import pytest
+
+from data.college_data import BRANCH_BITS, CollegeDataManager, CollegeInfo
+
+
+def make_college(i: int, **fields) -> CollegeInfo:
+    college = CollegeInfo(name=f"College of Engineering {i}", location=f"Town {i}",
+                          website=f"http://college{i}.ac.in/", state="Kerala")
+    for name, value in fields.items():
+        setattr(college, name, value)
+    return college
+
+
+def test_merges_into_a_large_bucket_stay_fast_and_indexed():
+    manager = CollegeDataManager(fuzzy=False)
+    size = 20000
+    for i in range(size):
+        manager.add_college(make_college(i))
+
+    start = time.perf_counter()
+    for i in range(0, size, 10):
+        assert not manager.add_college(make_college(i, email=f"office@college{i}.ac.in"))
+    elapsed = time.perf_counter() - start
+
+    in_state = manager.get_by_state("Kerala")
+    assert len(in_state) == size
+    assert len({id(college) for college in in_state}) == size
+    assert manager.get("College of Engineering 10", "Town 10").email == "office@college10.ac.in"
+    assert manager.get_by_domain("college10.ac.in")[0].email == "office@college10.ac.in"
+    assert manager.merged_count == size // 10
+    # Removing from a bucket used to scan it, making each merge O(bucket size)
+    assert elapsed < 2.0
+
+
+def test_list_fields_cannot_be_changed_in_place():
+    college = CollegeInfo(name='College', branches=['Civil Engineering'], other_contacts=['0471 2345678'])
+    with pytest.raises(AttributeError):
+        college.branches.append('Mechanical Engineering')
+    college.add_branch('Mechanical Engineering')
+    college.add_contact('0471 2345679')
+    college.add_contact('0471 2345678')
+    assert college.branches == ('Mechanical Engineering', 'Civil Engineering')
+    assert college.other_contacts == ('0471 2345678', '0471 2345679')
+
+
+def test_branch_bitset_holds_real_branches_only():
+    assert 'All Branches' not in BRANCH_BITS
+    assert 1 in BRANCH_BITS.values()
+    assert CollegeInfo(name='College', branches=['All Branches']).branches == ()
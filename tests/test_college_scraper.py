@@ -0,0 +1,26 @@
+import pytest
+
+from data.college_data import CollegeInfo
+from scraper.college_scraper import CollegeScraper
+from scraper.crawl_control import CrawlCancelled
+from scraper.page_parser import parse_page
+
+HOMEPAGE = '<html><body><a href="/contact-us">Contact Us</a></body></html>'
+
+
+class CancelledClient:
+    """Client whose every fetch runs into a Stop"""
+    session = None
+
+    def get_html(self, url, *args, **kwargs):
+        raise CrawlCancelled('Crawl cancelled')
+
+
+def test_cancel_during_contact_page_fetch_propagates():
+    scraper = CollegeScraper(CancelledClient())
+    try:
+        with pytest.raises(CrawlCancelled):
+            scraper._scrape_contact_page(parse_page(HOMEPAGE), 'https://college.example/',
+                                         CollegeInfo(name='College', website='https://college.example/'))
+    finally:
+        scraper.close()
@@ -0,0 +1,44 @@
+import threading
+import time
+
+from scraper.concurrent_engine import ThreadedScrapeEngine
+
+
+class RecordingScraper:
+    """Stands in for CollegeScraper, tracking how many scrapes overlap"""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def scrape_college(self, url, college_name, state):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.01)
+        with self.lock:
+            self.active -= 1
+        return None
+
+
+def test_concurrent_jobs_share_one_pool():
+    scraper = RecordingScraper()
+    engine = ThreadedScrapeEngine(scraper, max_workers=3)
+    counts = []
+
+    def job(n):
+        targets = [(f"College {n}-{i}", f"http://c{n}-{i}.example/") for i in range(10)]
+        counts.append(len(list(engine.scrape_all(targets))))
+
+    try:
+        jobs = [threading.Thread(target=job, args=(n,)) for n in range(4)]
+        for thread in jobs:
+            thread.start()
+        for thread in jobs:
+            thread.join()
+    finally:
+        engine.close()
+
+    assert counts == [10, 10, 10, 10]
+    assert scraper.peak <= 3
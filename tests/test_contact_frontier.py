@@ -0,0 +1,52 @@
+from data.college_data import CollegeInfo
+from scraper.contact_frontier import ContactFrontier, missing_contact_fields
+
+BASE = 'https://college.example/'
+
+
+def test_keywords_inside_other_words_do_not_score():
+    assert ContactFrontier.score('/research-methodology', 'Research Methodology') == 0
+    assert ContactFrontier.score('/library/shodhganga', 'Shodhganga') == 0
+    assert ContactFrontier.score('/updates', 'Depth of Study') == 0
+
+
+def test_whole_words_plurals_and_compact_paths_score():
+    assert ContactFrontier.score('/departments', 'Departments') > 0
+    assert ContactFrontier.score('/contactus.html', 'Reach') > 0
+    assert ContactFrontier.score('/hod.php', 'HOD Desk') > 0
+
+
+def test_contact_and_department_links_outrank_near_misses():
+    links = [
+        ('/research-methodology', 'Research Methodology'),
+        ('/library/shodhganga', 'Shodhganga'),
+        ('/address', 'Post Office Box 12'),
+        ('/departments/civil', 'Department of Civil Engineering'),
+        ('/contact-us', 'Contact Us'),
+        ('mailto:office@college.example', 'Email'),
+        ('https://elsewhere.example/contact', 'Contact'),
+    ]
+    ranked = ContactFrontier(BASE, max_pages=2).rank(links)
+    assert ranked == ['https://college.example/contact-us',
+                      'https://college.example/departments/civil']
+
+
+def test_rank_resolves_links_and_keeps_same_site_html_pages():
+    links = [
+        ('https://www.college.example/faculty', 'Faculty'),
+        ('admissions', 'Admissions'),
+        ('/brochure.pdf', 'Contact brochure'),
+        ('#contact', 'Contact'),
+        ('/home/admissions', 'Apply'),
+        ('/about', 'About'),
+    ]
+    ranked = ContactFrontier('https://college.example/home/', max_pages=3).rank(links)
+    # Relative links resolve against the page; the same URL is ranked once
+    assert ranked == ['https://college.example/home/admissions',
+                      'https://www.college.example/faculty',
+                      'https://college.example/about']
+
+
+def test_missing_contact_fields_lists_empty_ones():
+    college = CollegeInfo(name='College', email='office@college.example')
+    assert missing_contact_fields(college) == ['admin_contact', 'hod_contact']
@@ -0,0 +1,27 @@
+import pytest
+
+from scraper.crawl_control import CrawlCancelled, CrawlControl
+
+
+class Response:
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_track_after_cancel_closes_and_forgets_the_response():
+    control = CrawlControl()
+    control.cancel()
+    response = Response()
+    with pytest.raises(CrawlCancelled):
+        control.track(response)
+    assert response.closed
+    assert not control._responses
+
+
+def test_reset_forgets_responses_of_the_previous_crawl():
+    control = CrawlControl()
+    control.track(Response())
+    control.reset()
+    assert not control._responses
@@ -0,0 +1,25 @@
+"""
+DataExtractor.scan
+"""
+
+from scraper.data_extractor import DataExtractor
+
+
+def test_contacts_after_affiliation_are_extracted():
+    result = DataExtractor.scan(
+        "Affiliated to Visvesvaraya Technological University Email: principal@abc.ac.in "
+        "Phone: 9876543210. Departments: Computer Science"
+    )
+
+    assert result.emails == ['principal@abc.ac.in']
+    assert result.phones == ['9876543210']
+    assert result.university == 'Visvesvaraya Technological University'
+    assert result.branches == ['Computer Science Engineering']
+
+
+def test_affiliation_without_contacts():
+    result = DataExtractor.scan("A govt college affiliated with Anna University, Chennai.")
+
+    assert result.university == 'Anna University'
+    assert result.college_type == 'Government'
+    assert result.emails == [] and result.phones == []
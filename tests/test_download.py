@@ -0,0 +1,29 @@
+from scraper.download import BoundedReader, DownloadLimits, decode_html, sniff_content
+
+
+def read(body: bytes, limits: DownloadLimits, chunk: int = 10) -> BoundedReader:
+    reader = BoundedReader(limits)
+    for start in range(0, len(body), chunk):
+        if reader.feed(body[start:start + chunk]):
+            break
+    return reader
+
+
+def test_body_of_exactly_max_bytes_is_complete():
+    body = b'<html>' + b'x' * 87 + b'</html>'
+    reader = read(body, DownloadLimits(max_bytes=len(body)))
+    assert not reader.truncated
+    assert reader.body() == body
+
+
+def test_body_past_max_bytes_is_truncated():
+    body = b'<html>' + b'x' * 200
+    reader = read(body, DownloadLimits(max_bytes=100))
+    assert reader.truncated
+    assert len(reader.body()) == 100
+
+
+def test_wide_unicode_pages_are_not_sniffed_as_binary():
+    for encoding in ('utf-16', 'utf-16-be', 'utf-32-be'):
+        sniff_content('<html><body>Contact</body></html>'.encode(encoding)[:16])
+    assert 'Contact' in decode_html('<html>Contact</html>'.encode('utf-16'), None)
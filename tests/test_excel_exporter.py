@@ -0,0 +1,31 @@
+from openpyxl import load_workbook
+
+from data.college_data import EXPORT_COLUMNS, CollegeInfo
+from data.excel_exporter import ExcelExporter
+
+
+def test_write_only_export_has_summary_header_rows_and_widths(tmp_path):
+    colleges = [
+        CollegeInfo(name='Government Engineering College Thrissur', email='principal@gectcr.ac.in',
+                    branches=['Civil Engineering', 'Mechanical Engineering'],
+                    website='https://gectcr.ac.in/'),
+        CollegeInfo(name='College of Engineering', website='https://cet.ac.in/'),
+    ]
+    path = ExcelExporter.export_colleges(colleges, filepath=str(tmp_path / 'colleges.xlsx'),
+                                         summary={'State': 'Kerala', 'Branch': 'All Branches'})
+
+    wb = load_workbook(path)
+    assert wb.sheetnames == ['Summary', 'Colleges']
+    ws = wb['Colleges']
+    rows = list(ws.iter_rows(values_only=True))
+    assert rows[0] == EXPORT_COLUMNS
+    assert rows[1][0] == 'Government Engineering College Thrissur'
+    assert rows[1][4] == 'Mechanical Engineering, Civil Engineering'
+    assert len(rows) == 3
+    assert ws.freeze_panes == 'A2'
+    assert ws['A1'].font.bold
+    assert ws.column_dimensions['A'].width == len('Government Engineering College Thrissur') + 2
+
+    summary = {row[0]: row[1] for row in wb['Summary'].iter_rows(values_only=True) if row[0]}
+    assert summary['State'] == 'Kerala'
+    assert summary['Total Colleges Found'] == 2
@@ -0,0 +1,63 @@
+import itertools
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from scraper import http_cache
+from scraper.http_cache import ResponseCache
+
+URL = 'http://college.example/'
+
+
+def make_cache(tmp_path, **kwargs) -> ResponseCache:
+    return ResponseCache(str(tmp_path / 'cache.sqlite'), **kwargs)
+
+
+def test_entries_are_fresh_only_within_the_ttl(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(http_cache.time, 'time', lambda: now[0])
+    cache = make_cache(tmp_path, ttl=60)
+    cache.store(URL, 200, {'Content-Type': 'text/html'}, b'<html></html>')
+    assert cache.is_fresh(cache.get(URL))
+    now[0] += 61
+    assert not cache.is_fresh(cache.get(URL))
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path, monkeypatch):
+    clock = itertools.count(1000)
+    monkeypatch.setattr(http_cache.time, 'time', lambda: float(next(clock)))
+    cache = make_cache(tmp_path, max_bytes=250)
+    cache.store('http://a.example/', 200, {}, b'a' * 100)
+    cache.store('http://b.example/', 200, {}, b'b' * 100)
+    assert cache.get('http://a.example/') is not None
+    cache.store('http://c.example/', 200, {}, b'c' * 100)
+
+    assert cache.get('http://b.example/') is None
+    assert cache.get('http://a.example/') is not None
+    assert cache.get('http://c.example/') is not None
+
+
+def test_stale_entry_is_revalidated_with_its_etag(tmp_path, monkeypatch):
+    cache = make_cache(tmp_path, ttl=0)
+    cache.store(URL, 200, {'Content-Type': 'text/html', 'ETag': '"v1"'}, b'<html>cached</html>')
+    sent = []
+
+    def not_modified(adapter, request, **kwargs):
+        sent.append(request.headers.get('If-None-Match'))
+        response = requests.Response()
+        response.status_code = 304
+        response.headers['ETag'] = '"v1"'
+        response.url = request.url
+        response._content = b''
+        response._content_consumed = True
+        return response
+
+    monkeypatch.setattr(HTTPAdapter, 'send', not_modified)
+    session = requests.Session()
+    cache.install(session)
+    response = session.get(URL)
+
+    assert sent == ['"v1"']
+    assert response.status_code == 200
+    assert response.text == '<html>cached</html>'
+    assert response.from_cache
@@ -0,0 +1,54 @@
+import pytest
+from openpyxl import load_workbook
+
+from data.college_data import CollegeInfo
+from data.incremental_sink import IncrementalSink
+
+
+@pytest.mark.parametrize('extension', ['jsonl', 'csv'])
+def test_round_trip_keeps_the_latest_version_of_each_college(tmp_path, extension):
+    path = str(tmp_path / f'colleges.{extension}')
+    sink = IncrementalSink.for_path(path, batch_size=2)
+    first = CollegeInfo(name='College of Engineering', website='https://cet.ac.in/',
+                        branches=['Civil Engineering'], other_contacts=['0471 2515000'])
+    second = CollegeInfo(name='Model Engineering College', website='https://mec.ac.in/')
+    sink.append(first)
+    sink.append(second)
+    # A merge updates the college; the sink appends a new version under the same id
+    first.email = 'principal@cet.ac.in'
+    first.add_branch('Mechanical Engineering')
+    sink.append(first)
+    sink.close()
+
+    # A new sink on the same file reads what the first one wrote
+    colleges = {c.name: c for c in IncrementalSink.for_path(path).read_colleges()}
+    assert len(colleges) == 2
+    cet = colleges['College of Engineering']
+    assert cet.email == 'principal@cet.ac.in'
+    assert cet.branches == ('Mechanical Engineering', 'Civil Engineering')
+    assert cet.other_contacts == ('0471 2515000',)
+
+
+def test_finalize_to_excel_writes_one_row_per_college(tmp_path):
+    sink = IncrementalSink.for_path(str(tmp_path / 'colleges.jsonl'))
+    college = CollegeInfo(name='College of Engineering', website='https://cet.ac.in/')
+    sink.append(college)
+    college.email = 'principal@cet.ac.in'
+    sink.append(college)
+
+    path = sink.finalize_to_excel()
+    rows = list(load_workbook(path)['Colleges'].iter_rows(values_only=True))
+    assert len(rows) == 2
+    assert rows[1][0] == 'College of Engineering'
+    assert rows[1][5] == 'principal@cet.ac.in'
+
+
+def test_appending_continues_record_ids_after_a_restart(tmp_path):
+    path = str(tmp_path / 'colleges.jsonl')
+    sink = IncrementalSink.for_path(path)
+    sink.append(CollegeInfo(name='College of Engineering'))
+    sink.close()
+
+    resumed = IncrementalSink.for_path(path)
+    resumed.append(CollegeInfo(name='Model Engineering College'))
+    assert len(resumed.read_colleges()) == 2
@@ -0,0 +1,46 @@
+from utils.metrics import Histogram, MetricsRegistry
+
+
+def test_histogram_buckets_by_upper_bound():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value)
+    assert histogram.counts == [2, 1, 1]  # <=0.1, <=1.0, +Inf
+    assert histogram.count == 4
+    assert histogram.max == 2.0
+    assert abs(histogram.total - 2.65) < 1e-9
+    assert 0 < histogram.quantile(0.5) <= 0.1
+
+
+def test_prometheus_text_format():
+    registry = MetricsRegistry(buckets=(0.1, 1.0))
+    registry.observe('scrape.fetch', 0.05)
+    registry.observe('scrape.fetch', 0.5)
+    registry.inc('bytes_downloaded', 2048)
+    registry.add_collector('connections', lambda: {'open': 3, 'label': 'ignored'})
+
+    lines = registry.prometheus().splitlines()
+    assert '# TYPE college_scraper_stage_seconds histogram' in lines
+    assert 'college_scraper_stage_seconds_bucket{stage="scrape.fetch",le="0.1"} 1' in lines
+    assert 'college_scraper_stage_seconds_bucket{stage="scrape.fetch",le="1"} 2' in lines
+    assert 'college_scraper_stage_seconds_bucket{stage="scrape.fetch",le="+Inf"} 2' in lines
+    assert 'college_scraper_stage_seconds_sum{stage="scrape.fetch"} 0.550000' in lines
+    assert 'college_scraper_stage_seconds_count{stage="scrape.fetch"} 2' in lines
+    assert '# TYPE college_scraper_bytes_downloaded_total counter' in lines
+    assert 'college_scraper_bytes_downloaded_total 2048' in lines
+    assert 'college_scraper_connections_open 3' in lines
+    assert not any('label' in line for line in lines)
+
+
+def test_timed_records_even_when_the_call_raises():
+    registry = MetricsRegistry()
+
+    @registry.timed('parse')
+    def parse():
+        raise ValueError('bad page')
+
+    try:
+        parse()
+    except ValueError:
+        pass
+    assert 'parse' in registry.report()
@@ -0,0 +1,57 @@
+from data.college_data import CollegeDataManager, CollegeInfo
+from data.crawl_journal import CrawlJournal
+from scraper.concurrent_engine import ThreadedScrapeEngine
+from scraper.pipeline import CrawlPipeline
+
+RESULTS = [(f"College {n}", f"http://college{n}.example/") for n in range(4)]
+
+
+class Searcher:
+    """Yields RESULTS, optionally failing after the first few like a crashed run"""
+
+    def __init__(self, fail_after=None):
+        self.fail_after = fail_after
+
+    def iter_results(self, state, branch, college_type, max_results):
+        for count, result in enumerate(RESULTS):
+            if count == self.fail_after:
+                raise RuntimeError('search engine went away')
+            yield result
+
+
+class Scraper:
+    def __init__(self):
+        self.urls = []
+
+    def scrape_college(self, url, college_name, state):
+        self.urls.append(url)
+        return CollegeInfo(name=college_name, website=url, state=state)
+
+
+def run(journal, searcher, scraper):
+    engine = ThreadedScrapeEngine(scraper, max_workers=2)
+    try:
+        pipeline = CrawlPipeline(searcher, engine, CollegeDataManager(), journal)
+        return pipeline.run_job('Kerala', 'Civil', 'All Types', 20)
+    finally:
+        engine.close()
+
+
+def test_search_cut_short_is_run_again_on_resume(tmp_path):
+    journal = CrawlJournal(str(tmp_path / 'journal.sqlite'))
+    job_id = CrawlJournal.job_id_for('Kerala', 'Civil', 'All Types', 20)
+
+    first = Scraper()
+    run(journal, Searcher(fail_after=2), first)
+    assert sorted(first.urls) == [url for _, url in RESULTS[:2]]
+    assert not journal.search_complete(job_id)
+
+    second = Scraper()
+    job = run(journal, Searcher(), second)
+    assert job.resumed
+    assert job.found == len(RESULTS)
+    assert job.added == len(RESULTS)
+    # Only the sites the partial run never reached are scraped
+    assert sorted(second.urls) == [url for _, url in RESULTS[2:]]
+    assert journal.search_complete(job_id)
+    assert journal.load_search_results(job_id) == RESULTS
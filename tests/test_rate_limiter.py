@@ -0,0 +1,35 @@
+import pytest
+
+from scraper.crawl_control import CrawlCancelled, CrawlControl
+from scraper.http_cache import ResponseCache
+from scraper.http_client import HttpClient
+from scraper.rate_limiter import HostRateLimiter
+
+PAGE = 'http://college.example/admissions'
+
+
+def test_robots_txt_comes_through_the_client_in_replay_mode(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache.sqlite'), replay=True)
+    cache.store('http://college.example/robots.txt', 200, {'Content-Type': 'text/plain'},
+                b'User-agent: *\nCrawl-delay: 2.5\n')
+    limiter = HostRateLimiter(min_interval=0.1)
+    client = HttpClient(cache, limiter)
+    try:
+        limiter.load_robots(PAGE)
+    finally:
+        client.close()
+    assert limiter.interval_for(PAGE) == 2.5
+
+
+def test_robots_txt_fetch_stops_on_cancel():
+    control = CrawlControl()
+    control.cancel()
+    limiter = HostRateLimiter(min_interval=0.1)
+    client = HttpClient(limiter=limiter, control=control)
+    try:
+        with pytest.raises(CrawlCancelled):
+            limiter.load_robots(PAGE)
+    finally:
+        client.close()
+    # Not recorded as read, so a later crawl still honours the host's robots.txt
+    assert 'college.example' not in limiter._robots_done
@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+import requests
+
+from scraper.crawl_control import CrawlCancelled
+from scraper.retry import CircuitBreaker, FetchGuard, RetryPolicy
+
+URL = 'http://flaky.example/'
+
+
+def half_open_guard() -> FetchGuard:
+    """Guard whose breaker for URL has tripped and is due a trial request"""
+    guard = FetchGuard(RetryPolicy(max_attempts=1), failure_threshold=1, reset_timeout=0)
+
+    def refuse():
+        raise requests.ConnectionError('refused')
+
+    with pytest.raises(requests.ConnectionError):
+        guard.call(URL, refuse)
+    assert guard.breaker_for(URL).state == CircuitBreaker.OPEN
+    return guard
+
+
+def ok_response() -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    return response
+
+
+def test_cancel_during_half_open_trial_releases_it():
+    guard = half_open_guard()
+
+    def cancelled():
+        raise CrawlCancelled('Crawl cancelled')
+
+    with pytest.raises(CrawlCancelled):
+        guard.call(URL, cancelled)
+
+    # The host gets another trial rather than staying blocked
+    assert guard.call(URL, ok_response).status_code == 200
+    assert guard.breaker_for(URL).state == CircuitBreaker.CLOSED
+
+
+def test_async_cancel_during_half_open_trial_releases_it():
+    guard = half_open_guard()
+
+    async def cancelled():
+        raise asyncio.CancelledError()
+
+    async def ok():
+        return 'page'
+
+    async def run():
+        with pytest.raises(asyncio.CancelledError):
+            await guard.call_async(URL, cancelled)
+        return await guard.call_async(URL, ok)
+
+    assert asyncio.run(run()) == 'page'
+    assert guard.breaker_for(URL).state == CircuitBreaker.CLOSED
+
+
+def test_async_crawl_cancel_is_neither_failure_nor_success():
+    guard = half_open_guard()
+    failures_before = guard.stats.snapshot()
+
+    async def cancelled():
+        raise CrawlCancelled('Crawl cancelled')
+
+    async def run():
+        with pytest.raises(CrawlCancelled):
+            await guard.call_async(URL, cancelled)
+
+    asyncio.run(run())
+    # The trial is released without closing the breaker or counting a failure
+    assert guard.breaker_for(URL).state == CircuitBreaker.HALF_OPEN
+    assert guard.stats.snapshot()['gave_up'] == failures_before['gave_up']
+    assert 'failed_other' not in guard.stats.snapshot()
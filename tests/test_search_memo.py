@@ -0,0 +1,31 @@
+from scraper import search_memo
+from scraper.search_memo import SearchMemo
+
+RESULTS = [('College of Engineering', 'https://cet.ac.in/')]
+
+
+def test_reworded_queries_share_one_entry_per_engine_and_page(tmp_path):
+    memo = SearchMemo(str(tmp_path / 'memo.sqlite'))
+    memo.store('duckduckgo', 'Engineering colleges in Kerala', 0, RESULTS)
+
+    assert memo.get('duckduckgo', 'kerala  ENGINEERING colleges, in', 0) == RESULTS
+    assert memo.get('duckduckgo', 'Engineering colleges in Kerala', 1) is None
+    assert memo.get('bing', 'Engineering colleges in Kerala', 0) is None
+    assert (memo.hits, memo.misses) == (1, 2)
+
+
+def test_pages_expire_after_the_ttl(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(search_memo.time, 'time', lambda: now[0])
+    path = str(tmp_path / 'memo.sqlite')
+    memo = SearchMemo(path, ttl=60)
+    memo.store('duckduckgo', 'colleges kerala', 0, RESULTS)
+    now[0] += 59
+    assert memo.get('duckduckgo', 'colleges kerala', 0) == RESULTS
+    now[0] += 2
+    assert memo.get('duckduckgo', 'colleges kerala', 0) is None
+
+    # Expired pages are dropped when the memo is reopened
+    SearchMemo(path, ttl=60)
+    now[0] -= 61
+    assert SearchMemo(path, ttl=60).get('duckduckgo', 'colleges kerala', 0) is None
@@ -1,58 +1,143 @@
 """
 Logging configuration for the college scraper application
+
+Every logger returned by setup_logger shares one non-blocking pipeline:
+callers only put records on a queue, and a background listener thread
+formats them and writes them to the console and to a single rotating log
+file per run. The file holds one JSON object per line; the structured
+fields url, host, stage, duration, bytes and status are copied from the
+record when passed via ``extra``:
+
+    logger.info("Fetched %s", url, extra={'url': url, 'stage': 'fetch', 'status': 200})
+
+Set SCRAPER_LOG_LEVEL=DEBUG to record debug messages (default: INFO).
 """
 
+import atexit
+import json
 import logging
+import logging.handlers
 import os
-from datetime import datetime
+import queue
+import threading
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+LOG_DIR = 'logs'
+MAX_LOG_BYTES = 10 * 1024 * 1024
+LOG_BACKUPS = 5
+
+# Record attributes copied into the JSON output when present
+STRUCTURED_FIELDS = ('url', 'host', 'stage', 'duration', 'bytes', 'status')
+
+_lock = threading.Lock()
+_queue_handler = None
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with the structured fields at the top level"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage(),
+        }
+        for name in STRUCTURED_FIELDS:
+            value = getattr(record, name, None)
+            if value is not None:
+                entry[name] = value
+        # Derived here, on the listener thread, rather than at the call site
+        if 'url' in entry and 'host' not in entry:
+            entry['host'] = urlsplit(str(entry['url'])).hostname
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread
+
+    The stock handler merges the message and arguments in the calling
+    thread; records here never leave the process, so they are queued as is.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _log_level() -> int:
+    level = logging.getLevelName(os.environ.get('SCRAPER_LOG_LEVEL', 'INFO').upper())
+    return level if isinstance(level, int) else logging.INFO
+
+
+def _start_pipeline() -> logging.Handler:
+    """Create the shared queue handler and start its listener (once per process)"""
+    global _queue_handler, _listener
+
+    with _lock:
+        if _queue_handler is not None:
+            return _queue_handler
+
+        # Create logs directory if it doesn't exist
+        os.makedirs(LOG_DIR, exist_ok=True)
+
+        # One file per run, rotated if a long crawl makes it large
+        log_filename = os.path.join(
+            LOG_DIR,
+            f'scraper_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log'
+        )
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_filename, maxBytes=MAX_LOG_BYTES, backupCount=LOG_BACKUPS,
+            encoding='utf-8', delay=True
+        )
+        file_handler.setFormatter(JsonFormatter())
+
+        # Console handler
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(logging.INFO)
+        console_handler.setFormatter(logging.Formatter('%(levelname)s: %(message)s'))
+
+        log_queue = queue.SimpleQueue()
+        _listener = logging.handlers.QueueListener(
+            log_queue, file_handler, console_handler, respect_handler_level=True
+        )
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+        _queue_handler = DeferredQueueHandler(log_queue)
+        return _queue_handler
+
+
+def shutdown_logging():
+    """Write out queued records and stop the listener thread"""
+    global _listener
+    with _lock:
+        listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+
 
 def setup_logger(name='college_scraper'):
     """
-    Set up logger with file and console handlers
-    
+    Set up logger feeding the shared console and JSON file pipeline
+
     Args:
         name: Logger name
-        
+
     Returns:
         Configured logger instance
     """
-    # Create logs directory if it doesn't exist
-    log_dir = 'logs'
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
-    
-    # Create logger
     logger = logging.getLogger(name)
-    logger.setLevel(logging.DEBUG)
-    
+
     # Avoid adding handlers multiple times
     if logger.handlers:
         return logger
-    
-    # Create formatters
-    file_formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    console_formatter = logging.Formatter(
-        '%(levelname)s: %(message)s'
-    )
-    
-    # File handler
-    log_filename = os.path.join(
-        log_dir, 
-        f'scraper_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log'
-    )
-    file_handler = logging.FileHandler(log_filename, encoding='utf-8')
-    file_handler.setLevel(logging.DEBUG)
-    file_handler.setFormatter(file_formatter)
-    
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    console_handler.setFormatter(console_formatter)
-    
-    # Add handlers to logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
-    
+
+    logger.setLevel(_log_level())
+    logger.addHandler(_start_pipeline())
     return logger
@@ -0,0 +1,258 @@
+"""
+Lightweight timers, counters and histograms for the crawl pipeline
+
+Stages record into the process-wide METRICS registry:
+
+    with METRICS.timer('scrape.fetch'):
+        html = client.get_html(url)
+
+    @METRICS.timed('dedupe')
+    def add_college(self, college): ...
+
+    METRICS.inc('bytes_downloaded', len(body))
+
+At the end of a run ``METRICS.report()`` gives a per-stage table, and
+MetricsServer serves ``METRICS.prometheus()`` over HTTP for long batch jobs.
+"""
+
+import bisect
+import functools
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Mapping, Optional, Sequence, Tuple
+
+# Upper bounds in seconds: sub-millisecond parsing up to slow downloads
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25,
+                   0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+PROMETHEUS_PREFIX = 'college_scraper'
+
+
+class Histogram:
+    """Durations of one stage in fixed buckets, plus count, sum and maximum"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by interpolating within its bucket"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= target:
+                lower = self.buckets[i - 1] if i else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                return min(self.max, lower + (upper - lower) * (target - seen) / count)
+            seen += count
+        return self.max
+
+
+class _Timer:
+    """Context manager that records its duration into a registry stage"""
+
+    __slots__ = ('registry', 'stage', 'start')
+
+    def __init__(self, registry: 'MetricsRegistry', stage: str):
+        self.registry = registry
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.registry.observe(self.stage, time.perf_counter() - self.start)
+
+
+class MetricsRegistry:
+    """Thread-safe stage histograms, counters and gauge collectors"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._stages: Dict[str, Histogram] = {}
+        self._counters: Dict[str, float] = {}
+        self._collectors: Dict[str, Callable[[], Mapping[str, float]]] = {}
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float):
+        """Record one duration for a stage"""
+        with self._lock:
+            histogram = self._stages.get(stage)
+            if histogram is None:
+                histogram = self._stages[stage] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def timer(self, stage: str) -> _Timer:
+        """Context manager timing its body as one observation of the stage"""
+        return _Timer(self, stage)
+
+    def timed(self, stage: str):
+        """Decorator timing every call of the function as the stage"""
+        def decorate(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(stage, time.perf_counter() - start)
+            return wrapper
+        return decorate
+
+    def inc(self, name: str, amount: float = 1):
+        """Add to a counter"""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def add_collector(self, prefix: str, collect: Callable[[], Mapping[str, float]]):
+        """
+        Expose numbers read at scrape time as gauges
+
+        Args:
+            prefix: Gauge name prefix, e.g. 'connections'
+            collect: Returns current values by name (e.g. ConnectionStats.snapshot)
+        """
+        with self._lock:
+            self._collectors[prefix] = collect
+
+    def reset(self):
+        """Forget every observation and counter (collectors are kept)"""
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+            self._started = time.monotonic()
+
+    def _copy(self) -> Tuple[Dict[str, Histogram], Dict[str, float], Dict[str, Callable]]:
+        with self._lock:
+            stages = {}
+            for name, histogram in self._stages.items():
+                copy = Histogram(histogram.buckets)
+                copy.counts = list(histogram.counts)
+                copy.count, copy.total, copy.max = histogram.count, histogram.total, histogram.max
+                stages[name] = copy
+            return stages, dict(self._counters), dict(self._collectors)
+
+    def _gauges(self, collectors: Dict[str, Callable]) -> Dict[str, float]:
+        gauges = {}
+        for prefix, collect in collectors.items():
+            try:
+                values = collect()
+            except Exception:
+                continue  # a closed client must not break the report
+            for name, value in values.items():
+                if isinstance(value, (int, float)):
+                    gauges[f"{prefix}_{name}"] = value
+        return gauges
+
+    def report(self) -> str:
+        """Per-stage table (sorted by total time) followed by the counters and gauges"""
+        stages, counters, collectors = self._copy()
+        elapsed = time.monotonic() - self._started
+        lines = [f"Metrics over {elapsed:.1f}s",
+                 f"{'Stage':<22}{'Count':>8}{'Total s':>10}{'Mean ms':>10}"
+                 f"{'p50 ms':>10}{'p95 ms':>10}{'Max ms':>10}"]
+        for name, h in sorted(stages.items(), key=lambda item: -item[1].total):
+            lines.append(f"{name:<22}{h.count:>8}{h.total:>10.2f}{h.total / h.count * 1000:>10.1f}"
+                         f"{h.quantile(0.5) * 1000:>10.1f}{h.quantile(0.95) * 1000:>10.1f}"
+                         f"{h.max * 1000:>10.1f}")
+        for name, value in sorted(counters.items()):
+            lines.append(f"{name}: {value:g}")
+        for name, value in sorted(self._gauges(collectors).items()):
+            lines.append(f"{name}: {value:g}")
+        return '\n'.join(lines)
+
+    def prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        stages, counters, collectors = self._copy()
+        metric = f"{PROMETHEUS_PREFIX}_stage_seconds"
+        lines = [f"# HELP {metric} Time spent per pipeline stage",
+                 f"# TYPE {metric} histogram"]
+        for name, h in sorted(stages.items()):
+            cumulative = 0
+            for bound, count in zip(h.buckets, h.counts):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{stage="{name}",le="{bound:g}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{stage="{name}",le="+Inf"}} {h.count}')
+            lines.append(f'{metric}_sum{{stage="{name}"}} {h.total:.6f}')
+            lines.append(f'{metric}_count{{stage="{name}"}} {h.count}')
+        for name, value in sorted(counters.items()):
+            counter = f"{PROMETHEUS_PREFIX}_{_metric_name(name)}_total"
+            lines.append(f"# TYPE {counter} counter")
+            lines.append(f"{counter} {value:g}")
+        for name, value in sorted(self._gauges(collectors).items()):
+            gauge = f"{PROMETHEUS_PREFIX}_{_metric_name(name)}"
+            lines.append(f"# TYPE {gauge} gauge")
+            lines.append(f"{gauge} {value:g}")
+        return '\n'.join(lines) + '\n'
+
+
+def _metric_name(name: str) -> str:
+    """Prometheus-safe metric name"""
+    return ''.join(c if c.isalnum() or c == '_' else '_' for c in name)
+
+
+METRICS = MetricsRegistry()
+
+
+class MetricsServer(ThreadingHTTPServer):
+    """Serve a registry at /metrics on a background thread"""
+
+    daemon_threads = True
+
+    def __init__(self, registry: MetricsRegistry = METRICS, host: str = '127.0.0.1', port: int = 9108):
+        """
+        Args:
+            registry: Metrics to expose
+            host: Interface to listen on (loopback by default)
+            port: Port to listen on (0 picks a free one)
+        """
+        self.registry = registry
+        super().__init__((host, port), _MetricsHandler)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self) -> 'MetricsServer':
+        self._thread = threading.Thread(target=self.serve_forever, name='metrics-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        if self._thread is not None:
+            self.shutdown()
+            self._thread = None
+        self.server_close()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = self.server.registry.prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # scrapes every few seconds would flood the console